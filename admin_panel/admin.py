@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Student, Employee, Expense, Transaction, RecentActivity, TrashBinEntry, StudentProfile, EnrollmentDetail, AttendanceParticipation, PerformanceGrades, ActivitiesAchievements, FeedbackEvaluation, StatusRecommendations
+from .models import Student, Employee, Expense, Transaction, RecentActivity, TrashBinEntry, StudentProfile, EnrollmentDetail, AttendanceParticipation, PerformanceGrades, ActivitiesAchievements, FeedbackEvaluation, StatusRecommendations, DashboardSnapshot, ActivityActorSummary, LedgerDailyRollup, LedgerMonthlyRollup, IdentifierSequence, BackgroundJob, OutboxMessage, OutboxDelivery
 
 @admin.register(Student)
 class StudentAdmin(admin.ModelAdmin):
@@ -126,3 +126,44 @@ class StatusRecommendationsAdmin(admin.ModelAdmin):
     list_display = ('student', 'current_status', 'graduation_eligibility')
     list_filter = ('current_status', 'graduation_eligibility')
     search_fields = ('student__name',)
+
+@admin.register(DashboardSnapshot)
+class DashboardSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('total_students', 'total_employees', 'total_salaries', 'transport_expenses', 'other_expenses', 'updated_at')
+
+@admin.register(ActivityActorSummary)
+class ActivityActorSummaryAdmin(admin.ModelAdmin):
+    list_display = ('user', 'activity_count', 'last_active_at')
+    search_fields = ('user__username',)
+
+@admin.register(LedgerDailyRollup)
+class LedgerDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ('bucket', 'source', 'type', 'count', 'total')
+    list_filter = ('source', 'type')
+    date_hierarchy = 'bucket'
+
+@admin.register(LedgerMonthlyRollup)
+class LedgerMonthlyRollupAdmin(admin.ModelAdmin):
+    list_display = ('bucket', 'source', 'type', 'count', 'total')
+    list_filter = ('source', 'type')
+
+@admin.register(IdentifierSequence)
+class IdentifierSequenceAdmin(admin.ModelAdmin):
+    list_display = ('name', 'next_value')
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'user', 'status', 'attempts', 'created_at', 'finished_at')
+    list_filter = ('status', 'kind')
+    readonly_fields = ('created_at', 'started_at', 'heartbeat_at', 'finished_at')
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'user', 'created_at')
+    search_fields = ('subject',)
+
+@admin.register(OutboxDelivery)
+class OutboxDeliveryAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'message', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('recipient', 'message__subject')
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class AdminPanelConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'admin_panel'
+
+    def ready(self):
+        # Connect the cache invalidation, search indexing and ledger rollup signal handlers
+        from . import cache  # noqa: F401
+        from . import search  # noqa: F401
+        from . import ledger  # noqa: F401
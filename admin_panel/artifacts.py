@@ -0,0 +1,154 @@
+"""
+On-disk cache of rendered report files.
+
+A rendered PDF or XLSX is stored under MEDIA_ROOT/report_artifacts, named by
+the entity, the format and a SHA-256 of the source values it was rendered
+from (plus ``reports.RENDER_VERSION``). Changing the record changes the
+hash, so a file that exists is always fresh, and unchanged reports are served
+straight from disk. Each hit touches the file's mtime. When the directory
+grows past ARTIFACT_CACHE_MAX_BYTES, the least recently used files are
+deleted.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from . import reports
+from .cache import model_versions
+from .models import Expense, Transaction
+
+PDF = 'pdf'
+XLSX = 'xlsx'
+
+ARTIFACT_DIR = 'report_artifacts'
+ARTIFACT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Evict down to this fraction of the cap so a full cache doesn't scan on every write
+ARTIFACT_CACHE_LOW_WATER = 0.8
+LEDGER_CHUNK_SIZE = 2000
+
+
+def artifact_root():
+    return os.path.join(settings.MEDIA_ROOT, ARTIFACT_DIR)
+
+
+def instance_source(instance):
+    """The concrete field values of a model instance, as hashed into the artifact key."""
+    return {field.attname: field.value_to_string(instance) for field in instance._meta.concrete_fields}
+
+
+def artifact_key(entity, fmt, source):
+    payload = json.dumps([reports.RENDER_VERSION, entity, fmt, source], sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def artifact_path(entity, fmt, key):
+    return os.path.join(artifact_root(), entity, f"{key}.{fmt}")
+
+
+def get_or_render(entity, fmt, source, render):
+    """
+    Return an open binary file holding the ``fmt`` artifact of ``entity`` for
+    ``source``, calling ``render()`` for its bytes only when it isn't cached.
+    """
+    path = artifact_path(entity, fmt, artifact_key(entity, fmt, source))
+    try:
+        file = open(path, 'rb')
+    except FileNotFoundError:
+        pass
+    else:
+        _touch(path)
+        return file
+
+    content = render()
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Write to a temporary name and rename so readers never see a partial file
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as temp:
+            temp.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    # Open before evicting; on POSIX the open handle survives even if the file goes
+    file = open(path, 'rb')
+    evict()
+    return file
+
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+
+def _artifacts():
+    for directory, _, names in os.walk(artifact_root()):
+        for name in names:
+            if name.endswith('.tmp'):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            yield stat.st_mtime, stat.st_size, path
+
+
+def evict(max_bytes=ARTIFACT_CACHE_MAX_BYTES):
+    """Delete least recently used artifacts while the cache exceeds ``max_bytes``. Returns the number deleted."""
+    entries = list(_artifacts())
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return 0
+    target = max_bytes * ARTIFACT_CACHE_LOW_WATER
+    deleted = 0
+    for _, size, path in sorted(entries):
+        if total <= target:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        deleted += 1
+    return deleted
+
+
+def student_report(student, fmt):
+    def render():
+        if fmt == PDF:
+            return reports.render_student_report(reports.student_report_data(student))
+        return reports.render_student_report_xlsx(student)
+    return get_or_render('student', fmt, instance_source(student), render)
+
+
+def employee_report(employee, fmt):
+    render = reports.render_employee_report if fmt == PDF else reports.render_employee_report_xlsx
+    return get_or_render('employee', fmt, instance_source(employee), lambda: render(employee))
+
+
+def _ledger_rows(model):
+    labels = dict(model._meta.get_field('type').choices)
+    rows = model.objects.order_by('-date', '-id').values_list('date', 'type', 'description', 'amount')
+    for day, type_, description, amount in rows.iterator(chunk_size=LEDGER_CHUNK_SIZE):
+        yield day.strftime('%Y-%m-%d'), labels.get(type_, type_), description, f"${amount}"
+
+
+def financial_report(financial, fmt):
+    def render():
+        if fmt == PDF:
+            return reports.render_financial_report(financial, _ledger_rows(Transaction), _ledger_rows(Expense))
+        return reports.render_financial_report_xlsx(financial)
+    source = financial.as_dict()
+    if fmt == PDF:
+        # The PDF lists every ledger row, so it also depends on the ledger versions
+        source['ledgers'] = model_versions(('Transaction', 'Expense'))
+    return get_or_render('financial', fmt, source, render)
@@ -0,0 +1,169 @@
+"""
+Versioned read-through cache for the dashboard and report views.
+
+Every cached entry is keyed by the current version counter of each model it
+was built from. The counters are bumped after commit whenever one of those
+models is saved or deleted, so a write makes every dependent entry
+unreachable at once and stale data is never served. Old entries simply age
+out of the cache backend.
+
+Version counters and hit/miss counters are stored without a timeout. A bump
+writes a new clock-based version with a plain ``set()`` instead of
+``incr()``: the file-based backend implements ``incr()`` as a get followed by
+a ``set()`` with the default TIMEOUT, which would expire the counter, and two
+concurrent increments there can collapse into one. Hit/miss counters do use
+``incr()`` and are re-armed with ``touch()``; they are approximate under
+concurrent requests.
+"""
+import hashlib
+import time
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Student, Employee, Expense, Transaction, RecentActivity
+from .softdelete import rows_restored, rows_trashed
+
+CACHE_ALIAS = 'default'
+CACHED_VIEWS = ('dashboard', 'student_report', 'employment_report', 'financial_report')
+
+_MISSING = object()
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def _version_key(model_name):
+    return f'version:{model_name}'
+
+
+def _stats_key(namespace, outcome):
+    return f'stats:{namespace}:{outcome}'
+
+
+def _seed_version():
+    # Seed from the clock so a counter that was evicted never reuses an old value
+    return time.time_ns()
+
+
+def model_versions(model_names):
+    cache = get_cache()
+    keys = [_version_key(name) for name in model_names]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            version = _seed_version()
+            if not cache.add(key, version, timeout=None):
+                version = cache.get(key, version)
+        versions.append(version)
+    return versions
+
+
+def bump_version(model_name):
+    cache = get_cache()
+    key = _version_key(model_name)
+    # The clock moves the counter past its old value even if a concurrent bump read the same one
+    cache.set(key, max(_seed_version(), (cache.get(key) or 0) + 1), timeout=None)
+
+
+def _increment(key):
+    cache = get_cache()
+    if cache.add(key, 1, timeout=None):
+        return
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.add(key, 1, timeout=None)
+        return
+    # incr() may have re-stored the counter with the backend's default TIMEOUT
+    cache.touch(key, None)
+
+
+def cached(namespace, key_parts, depends_on, compute, timeout=None):
+    """
+    Return the cached result of ``compute()`` for ``namespace``/``key_parts``,
+    computing and storing it on a miss. ``depends_on`` lists the model names
+    whose versions are folded into the key. ``timeout`` defaults to the
+    backend's TIMEOUT setting.
+    """
+    cache = get_cache()
+    versions = model_versions(depends_on)
+    digest = hashlib.md5(repr((list(key_parts), versions)).encode()).hexdigest()
+    key = f'view:{namespace}:{digest}'
+
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        _increment(_stats_key(namespace, 'hits'))
+        return value
+
+    _increment(_stats_key(namespace, 'misses'))
+    value = compute()
+    if timeout is None:
+        cache.set(key, value)
+    else:
+        cache.set(key, value, timeout)
+    return value
+
+
+def version_etag(model_names, ajax_only=False):
+    """
+    Build an ``etag_func`` for ``django.views.decorators.http.condition`` from
+    the version counters of ``model_names`` and the request's query string, so
+    unchanged polls are answered with 304 before the view runs any query.
+    With ``ajax_only`` non-AJAX requests get no ETag and are served normally.
+    """
+    def etag_func(request, *args, **kwargs):
+        if ajax_only and request.headers.get('x-requested-with') != 'XMLHttpRequest':
+            return None
+        versions = model_versions(model_names)
+        return hashlib.md5(repr((request.get_full_path(), versions)).encode()).hexdigest()
+    return etag_func
+
+
+def cache_stats():
+    """Hit/miss counters per cached view, for sizing the cache."""
+    cache = get_cache()
+    keys = [_stats_key(namespace, outcome) for namespace in CACHED_VIEWS for outcome in ('hits', 'misses')]
+    counters = cache.get_many(keys)
+    stats = {}
+    for namespace in CACHED_VIEWS:
+        hits = counters.get(_stats_key(namespace, 'hits'), 0)
+        misses = counters.get(_stats_key(namespace, 'misses'), 0)
+        lookups = hits + misses
+        stats[namespace] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / lookups, 4) if lookups else None,
+        }
+    return stats
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+@receiver(post_save, sender=Expense)
+@receiver(post_delete, sender=Expense)
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+@receiver(post_save, sender=RecentActivity)
+@receiver(post_delete, sender=RecentActivity)
+@receiver(rows_trashed, sender=Student)
+@receiver(rows_restored, sender=Student)
+@receiver(rows_trashed, sender=Employee)
+@receiver(rows_restored, sender=Employee)
+@receiver(rows_trashed, sender=Expense)
+@receiver(rows_restored, sender=Expense)
+@receiver(rows_trashed, sender=Transaction)
+@receiver(rows_restored, sender=Transaction)
+@receiver(rows_trashed, sender=RecentActivity)
+@receiver(rows_restored, sender=RecentActivity)
+def bump_version_on_change(sender, **kwargs):
+    # Bump after commit so a reader can never cache pre-commit data under the new version
+    transaction.on_commit(lambda: bump_version(sender.__name__))
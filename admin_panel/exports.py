@@ -0,0 +1,224 @@
+"""
+Full-table XLSX exports of the student roster, the employee list and the
+ledgers.
+
+Rows are read with a ``values_list`` projection of just the exported columns
+through ``iterator(chunk_size=...)`` and appended to an openpyxl write-only
+worksheet, which spools them to disk instead of keeping cells in memory. The
+finished workbook is written to a temporary file that the view streams back,
+so memory use does not grow with the number of rows.
+
+Batches of student report PDFs are rendered in a process pool and written
+into a ZIP archive that is streamed out entry by entry as the renders finish.
+Only a few renders per worker are in flight at a time, which bounds memory
+however many students are selected. All downloads share one pool of at most
+REPORT_WORKERS processes, started with ``spawn`` because forking a threaded
+server process can deadlock the child; concurrent downloads queue for the
+same workers instead of each starting their own.
+"""
+import multiprocessing
+import os
+import tempfile
+import threading
+import zipfile
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import openpyxl
+
+from .models import Student, Employee, Expense, Transaction
+from .reports import render_student_report_entry, student_report_data
+
+EXPORT_CHUNK_SIZE = 2000
+REPORT_WORKERS = min(os.cpu_count() or 1, 4)
+REPORTS_IN_FLIGHT_PER_WORKER = 4
+
+Column = namedtuple('Column', ['header', 'field', 'labels'], defaults=[None])
+TableExport = namedtuple('TableExport', ['model', 'title', 'columns', 'filters'])
+
+
+def _labels(model, field):
+    return dict(model._meta.get_field(field).choices)
+
+
+TABLE_EXPORTS = {
+    'students': TableExport(Student, 'Students', [
+        Column('Student ID', 'student_id'),
+        Column('Name', 'name'),
+        Column('Email', 'email'),
+        Column('Phone', 'phone'),
+        Column('Address', 'address'),
+        Column('Enrollment Date', 'enrollment_date'),
+        Column('Type', 'type', _labels(Student, 'type')),
+        Column('Category', 'category'),
+        Column('Program', 'program', _labels(Student, 'program')),
+        Column('Level', 'level'),
+        Column('Total Sessions', 'total_sessions'),
+        Column('Attended Sessions', 'attended_sessions'),
+        Column('Absences', 'absences'),
+        Column('Participation Score', 'participation_score'),
+        Column('Average Scores', 'avg_scores'),
+        Column('Project Completion Rate', 'project_completion_rate'),
+        Column('Current Status', 'current_status', _labels(Student, 'current_status')),
+        Column('Graduation Eligibility', 'graduation_eligibility'),
+    ], {'program': 'program', 'type': 'type', 'status': 'current_status'}),
+    'employees': TableExport(Employee, 'Employees', [
+        Column('Employee ID', 'employee_id'),
+        Column('First Name', 'first_name'),
+        Column('Middle Name', 'middle_name'),
+        Column('Last Name', 'last_name'),
+        Column('Email', 'email'),
+        Column('Phone', 'phone'),
+        Column('Department', 'department'),
+        Column('Position', 'position'),
+        Column('Employment Status', 'employment_status', _labels(Employee, 'employment_status')),
+        Column('Employee Type', 'employee_type', _labels(Employee, 'employee_type')),
+        Column('Hire Date', 'hire_date'),
+        Column('Salary', 'salary'),
+        Column('Current Status', 'current_status', _labels(Employee, 'current_status')),
+    ], {'department': 'department', 'status': 'current_status'}),
+    'transactions': TableExport(Transaction, 'Transactions', [
+        Column('Date', 'date'),
+        Column('Type', 'type', _labels(Transaction, 'type')),
+        Column('Description', 'description'),
+        Column('Amount', 'amount'),
+    ], {'type': 'type', 'start': 'date__gte', 'end': 'date__lte'}),
+    'expenses': TableExport(Expense, 'Expenses', [
+        Column('Date', 'date'),
+        Column('Type', 'type', _labels(Expense, 'type')),
+        Column('Description', 'description'),
+        Column('Amount', 'amount'),
+    ], {'type': 'type', 'start': 'date__gte', 'end': 'date__lte'}),
+}
+
+
+def export_queryset(table, params):
+    """The rows of ``table`` selected by the filter names in ``params`` (e.g. request.GET)."""
+    export = TABLE_EXPORTS[table]
+    filters = {lookup: params[name] for name, lookup in export.filters.items() if params.get(name)}
+    return export.model.objects.filter(**filters).order_by('pk')
+
+
+def write_xlsx(export, queryset, file, chunk_size=EXPORT_CHUNK_SIZE):
+    """Write ``queryset`` as one worksheet to ``file``. Returns the number of data rows."""
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet(export.title)
+    worksheet.append([column.header for column in export.columns])
+    rows = queryset.values_list(*[column.field for column in export.columns]).iterator(chunk_size=chunk_size)
+    count = 0
+    for values in rows:
+        worksheet.append([
+            column.labels.get(value, value) if column.labels else value
+            for column, value in zip(export.columns, values)
+        ])
+        count += 1
+    workbook.save(file)
+    return count
+
+
+def export_table(table, params, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Export ``table`` to a temporary file and return it rewound, ready to be
+    streamed. The file is deleted when closed.
+    """
+    export = TABLE_EXPORTS[table]
+    file = tempfile.TemporaryFile(suffix='.xlsx')
+    try:
+        write_xlsx(export, export_queryset(table, params), file, chunk_size)
+    except Exception:
+        file.close()
+        raise
+    file.seek(0)
+    return file
+
+
+def student_report_queryset(params):
+    """
+    Students selected by the ``program``, ``type`` and ``status`` filters and an
+    optional comma separated ``ids`` list. Raises ValueError for a malformed id.
+    """
+    queryset = export_queryset('students', params)
+    ids = params.get('ids')
+    if ids:
+        queryset = queryset.filter(pk__in=[int(pk) for pk in ids.split(',') if pk.strip()])
+    return queryset
+
+
+_report_pool = None
+_report_pool_lock = threading.Lock()
+
+
+def _get_report_pool():
+    global _report_pool
+    with _report_pool_lock:
+        if _report_pool is None:
+            _report_pool = ProcessPoolExecutor(
+                max_workers=REPORT_WORKERS, mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _report_pool
+
+
+def _discard_report_pool(pool):
+    # A worker died; the next download starts a fresh pool
+    global _report_pool
+    with _report_pool_lock:
+        if _report_pool is pool:
+            _report_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+class _ZipStream:
+    """Write-only sink for ZipFile; the archive generator drains it after every entry."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_student_report_archive(queryset, workers=REPORT_WORKERS):
+    """
+    Yield a ZIP archive of the report PDFs of ``queryset`` in chunks. Entries
+    are written in the order the renders complete. At most ``workers`` times
+    REPORTS_IN_FLIGHT_PER_WORKER renders of this archive are queued on the
+    shared pool at a time.
+    """
+    stream = _ZipStream()
+    archive = zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED)
+    students = queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    pool = _get_report_pool()
+    pending = set()
+    try:
+        for student in students:
+            pending.add(pool.submit(render_student_report_entry, student_report_data(student)))
+            if len(pending) < workers * REPORTS_IN_FLIGHT_PER_WORKER:
+                continue
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                archive.writestr(*future.result())
+            yield stream.drain()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                archive.writestr(*future.result())
+            yield stream.drain()
+        archive.close()
+        yield stream.drain()
+    except BrokenProcessPool:
+        _discard_report_pool(pool)
+        raise
+    finally:
+        # Also reached when the client disconnects mid-download; the pool stays up for other downloads
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,43 @@
+"""
+Financial totals shown on the dashboard, the financial report and its exports.
+
+The totals are read from the DashboardSnapshot row, whose signal handlers
+already keep salaries and the per-type expense totals current on every
+write, so there is one source of truth for these figures and reading them is
+a single primary-key lookup. The result is memoized on the request, so a page
+that needs the totals more than once still costs at most one query.
+"""
+from collections import namedtuple
+
+from .models import DashboardSnapshot
+
+_REQUEST_ATTR = '_financial_summary'
+
+
+class FinancialSummary(namedtuple('FinancialSummary', ['total_salaries', 'transport_expenses', 'other_expenses'])):
+    __slots__ = ()
+
+    @property
+    def total_expenses(self):
+        return self.total_salaries + self.transport_expenses + self.other_expenses
+
+    def as_dict(self):
+        return dict(self._asdict(), total_expenses=self.total_expenses)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        return cls(snapshot.total_salaries, snapshot.transport_expenses, snapshot.other_expenses)
+
+
+def get_financial_summary(request=None, snapshot=None):
+    """
+    Return the current FinancialSummary. Passing the request memoizes it for
+    the rest of that request, so read it after any writes the view makes.
+    Pass a DashboardSnapshot the view has already loaded to skip reading it again.
+    """
+    summary = getattr(request, _REQUEST_ATTR, None)
+    if summary is None:
+        summary = FinancialSummary.from_snapshot(snapshot or DashboardSnapshot.load())
+        if request is not None:
+            setattr(request, _REQUEST_ATTR, summary)
+    return summary
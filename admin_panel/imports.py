@@ -0,0 +1,390 @@
+"""
+Streaming bulk imports of ledger rows and student rosters.
+
+Files are read line by line and processed in chunks: each chunk is validated,
+checked for duplicates and written with bulk_create inside its own
+transaction, so memory stays flat however large the file is. Rows written
+this way bypass the model signals, so every chunk also applies its share of
+the dashboard snapshot, ledger rollup and search index updates itself. Bad
+rows are reported with their line number and never abort the import.
+
+Rosters are streamed and validated the same way but written in a single
+transaction, together with the satellite rows every Student carries.
+"""
+import codecs
+import csv
+import datetime
+import hashlib
+import json
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+
+import openpyxl
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from . import ledger
+from . import search as search_index
+from .cache import bump_version
+from .models import (
+    Transaction, Expense, RecentActivity, DashboardSnapshot, SearchDocument, Student, allocate_student_ids,
+    reserve_student_ids, student_satellites,
+)
+
+CSV = 'csv'
+NDJSON = 'ndjson'
+XLSX = 'xlsx'
+IMPORT_FORMATS = (CSV, NDJSON)
+ROSTER_FORMATS = (CSV, XLSX)
+DEFAULT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+LEDGER_MODELS = {
+    'transactions': Transaction,
+    'expenses': Expense,
+}
+LEDGER_FIELDS = ('date', 'type', 'description', 'amount')
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.duplicates = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'error': message})
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'duplicates': self.duplicates,
+            'error_count': self.error_count,
+            'errors': self.errors,
+        }
+
+
+class RowError(ValueError):
+    pass
+
+
+def format_for_filename(filename):
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension in ('ndjson', 'jsonl'):
+        return NDJSON
+    if extension in ('xlsx', 'xlsm'):
+        return XLSX
+    return CSV
+
+
+def read_records(lines, fmt):
+    """
+    Yield ``(line_number, record)`` from an iterable of byte lines, where
+    record is a dict, or a RowError for a line that could not be parsed.
+    """
+    text = codecs.iterdecode(lines, 'utf-8-sig')
+    if fmt == CSV:
+        reader = csv.DictReader(text)
+        if reader.fieldnames:
+            reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+        for record in reader:
+            yield reader.line_num, record
+    elif fmt == NDJSON:
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_number, RowError(f"Invalid JSON: {e}")
+                continue
+            if not isinstance(record, dict):
+                yield line_number, RowError("Each line must be a JSON object")
+                continue
+            yield line_number, record
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def read_xlsx_records(file):
+    """
+    Yield ``(row_number, record)`` from the first sheet of a workbook, opened in
+    read-only mode so rows are streamed instead of loading the whole sheet.
+    """
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        fields = [str(name).strip().lower() if name is not None else '' for name in header]
+        for row_number, values in enumerate(rows, start=2):
+            if all(value is None or str(value).strip() == '' for value in values):
+                continue
+            yield row_number, dict(zip(fields, values))
+    finally:
+        workbook.close()
+
+
+def chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _ledger_type(model, value):
+    value = str(value or '').strip().lower()
+    for choice, label in model.TYPE_CHOICES:
+        if value in (choice, label.lower()):
+            return choice
+    raise RowError(f"Unknown type {value!r}")
+
+
+def clean_ledger_row(model, record):
+    """Validate one record and return the (date, type, description, amount) tuple to store."""
+    missing = [field for field in LEDGER_FIELDS if not str(record.get(field) or '').strip()]
+    if missing:
+        raise RowError(f"Missing {', '.join(missing)}")
+    try:
+        day = parse_date(str(record['date']).strip())
+    except ValueError:
+        day = None
+    if day is None:
+        raise RowError(f"Invalid date {record['date']!r}, expected YYYY-MM-DD")
+    try:
+        amount = Decimal(str(record['amount']).strip().replace(',', '')).quantize(Decimal('0.01'))
+    except InvalidOperation:
+        raise RowError(f"Invalid amount {record['amount']!r}")
+    max_digits = model._meta.get_field('amount').max_digits
+    if not amount.is_finite() or len(amount.as_tuple().digits) > max_digits:
+        raise RowError(f"Amount {record['amount']!r} is out of range")
+    return day, _ledger_type(model, record['type']), str(record['description']).strip(), amount
+
+
+def _content_hash(row, occurrence):
+    # The occurrence number keeps genuinely repeated rows within a file apart
+    day, type_, description, amount = row
+    raw = '\x1f'.join([day.isoformat(), type_, description, str(amount), str(occurrence)])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _write_ledger_chunk(model, rows):
+    """Insert one validated chunk and apply the side effects its signals would have."""
+    objects = model.objects.bulk_create([
+        model(date=day, type=type_, description=description, amount=amount, import_hash=content_hash)
+        for (day, type_, description, amount), content_hash in rows
+    ])
+    ledger.record(model, [(obj.date, obj.type, obj.amount) for obj in objects])
+    if model is Expense:
+        DashboardSnapshot.apply_delta(
+            transport_expenses=sum(obj.amount for obj in objects if obj.type == Expense.TRANSPORT),
+            other_expenses=sum(obj.amount for obj in objects if obj.type == Expense.OTHER),
+        )
+        documents = []
+        for obj in objects:
+            entity_type, title, content = search_index.build_document(obj)
+            documents.append(SearchDocument(entity_type=entity_type, entity_id=obj.pk, title=title, content=content))
+        SearchDocument.objects.bulk_create(documents)
+    transaction.on_commit(lambda: bump_version(model.__name__))
+    return len(objects)
+
+
+def import_ledger(lines, model, fmt, user, source_name='upload', chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Import Transaction or Expense rows from ``lines`` (an iterable of byte
+    lines in ``fmt``) and log one RecentActivity for ``user``. Rows whose
+    content hash was already imported are skipped, and reported as errors when
+    that row is in the trash. Returns an ImportResult.
+    """
+    result = ImportResult()
+    occurrences = Counter()
+    for chunk in chunked(read_records(lines, fmt), chunk_size):
+        rows = {}
+        line_numbers = {}
+        for line_number, record in chunk:
+            try:
+                if isinstance(record, RowError):
+                    raise record
+                row = clean_ledger_row(model, record)
+            except RowError as e:
+                result.add_error(line_number, str(e))
+                continue
+            occurrences[row] += 1
+            content_hash = _content_hash(row, occurrences[row])
+            rows[content_hash] = row
+            line_numbers[content_hash] = line_number
+
+        # all_objects: a trashed row still holds its import_hash
+        existing = dict(model.all_objects.filter(import_hash__in=list(rows)).values_list('import_hash', 'deleted_at'))
+        for content_hash, deleted_at in existing.items():
+            if deleted_at is None:
+                result.duplicates += 1
+            else:
+                result.add_error(line_numbers[content_hash], "Already imported; the row is in the trash")
+        new_rows = [(row, content_hash) for content_hash, row in rows.items() if content_hash not in existing]
+        if new_rows:
+            with transaction.atomic():
+                result.created += _write_ledger_chunk(model, new_rows)
+
+    label = model._meta.verbose_name_plural
+    RecentActivity.objects.create(
+        user=user,
+        action=(
+            f"Imported {result.created} {label} from {source_name} "
+            f"({result.duplicates} duplicates skipped, {result.error_count} rows rejected)"
+        ),
+        icon_class="fas fa-file-import text-blue-500",
+    )
+    return result
+
+
+ROSTER_REQUIRED_FIELDS = ('name', 'type', 'program', 'level')
+
+
+def _choice(choices, value, field):
+    value = str(value or '').strip().lower()
+    for choice, label in choices:
+        if value in (choice, label.lower()):
+            return choice
+    raise RowError(f"Unknown {field} {value!r}")
+
+
+def _text(record, field, max_length=None):
+    value = record.get(field)
+    value = '' if value is None else str(value).strip()
+    if max_length and len(value) > max_length:
+        raise RowError(f"{field} is longer than {max_length} characters")
+    return value
+
+
+def clean_roster_row(record):
+    """Validate one roster record and return the Student field values it describes."""
+    missing = [field for field in ROSTER_REQUIRED_FIELDS if not _text(record, field)]
+    if missing:
+        raise RowError(f"Missing {', '.join(missing)}")
+    fields = {
+        'name': _text(record, 'name', Student._meta.get_field('name').max_length),
+        'type': _choice(Student.TYPE_CHOICES, record['type'], 'type'),
+        'program': _choice(Student.PROGRAM_CHOICES, record['program'], 'program'),
+        'level': _text(record, 'level', Student._meta.get_field('level').max_length),
+        'category': _text(record, 'category', Student._meta.get_field('category').max_length),
+        'email': _text(record, 'email', Student._meta.get_field('email').max_length),
+        'phone': _text(record, 'phone', Student._meta.get_field('phone').max_length),
+        'address': _text(record, 'address'),
+        'student_id': _text(record, 'student_id', Student._meta.get_field('student_id').max_length),
+    }
+    if fields['email']:
+        try:
+            validate_email(fields['email'])
+        except ValidationError:
+            raise RowError(f"Invalid email {fields['email']!r}")
+    if _text(record, 'current_status'):
+        fields['current_status'] = _choice(Student.STATUS_CHOICES, record['current_status'], 'current_status')
+    enrollment_date = record.get('enrollment_date')
+    if isinstance(enrollment_date, datetime.datetime):
+        fields['enrollment_date'] = enrollment_date.date()
+    elif isinstance(enrollment_date, datetime.date):
+        fields['enrollment_date'] = enrollment_date
+    elif _text(record, 'enrollment_date'):
+        try:
+            day = parse_date(_text(record, 'enrollment_date'))
+        except ValueError:
+            day = None
+        if day is None:
+            raise RowError(f"Invalid enrollment_date {record['enrollment_date']!r}, expected YYYY-MM-DD")
+        fields['enrollment_date'] = day
+    return fields
+
+
+def _write_roster(rows, batch_size):
+    """Insert validated students with their satellite rows and apply the side effects their signals would have."""
+    # IDs given in the file may fall in the allocated range; never allocate them again
+    reserve_student_ids([fields['student_id'] for fields in rows if fields['student_id']])
+    needs_id = [fields for fields in rows if not fields['student_id']]
+    for fields, student_id in zip(needs_id, allocate_student_ids(len(needs_id))):
+        fields['student_id'] = student_id
+    students = Student.objects.bulk_create([Student(**fields) for fields in rows], batch_size=batch_size)
+
+    satellites = {}
+    for student in students:
+        for satellite in student_satellites(student):
+            satellites.setdefault(type(satellite), []).append(satellite)
+    for model, objects in satellites.items():
+        model.objects.bulk_create(objects, batch_size=batch_size)
+
+    documents = []
+    for student in students:
+        entity_type, title, content = search_index.build_document(student)
+        documents.append(SearchDocument(entity_type=entity_type, entity_id=student.pk, title=title, content=content))
+    SearchDocument.objects.bulk_create(documents, batch_size=batch_size)
+    DashboardSnapshot.apply_delta(
+        total_students=len(students),
+        iot_students=sum(1 for student in students if student.program == Student.IOT),
+        sod_students=sum(1 for student in students if student.program == Student.SOD),
+    )
+    transaction.on_commit(lambda: bump_version('Student'))
+    return len(students)
+
+
+def import_roster(records, user, source_name='upload', chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Import students from ``records`` (``(row_number, record)`` pairs from
+    read_records or read_xlsx_records). Every row is validated first and
+    invalid rows are reported without stopping the import; the valid ones are
+    then written, with their satellite models, in a single transaction.
+    Returns an ImportResult, with rows whose student_id already exists counted
+    as duplicates, or reported as errors when that student is in the trash.
+    """
+    result = ImportResult()
+    rows = []
+    seen_ids = set()
+    for chunk in chunked(records, chunk_size):
+        cleaned = []
+        for row_number, record in chunk:
+            try:
+                if isinstance(record, RowError):
+                    raise record
+                fields = clean_roster_row(record)
+            except RowError as e:
+                result.add_error(row_number, str(e))
+                continue
+            if fields['student_id'] and fields['student_id'] in seen_ids:
+                result.add_error(row_number, f"Duplicate student_id {fields['student_id']!r} in file")
+                continue
+            seen_ids.add(fields['student_id'])
+            cleaned.append((row_number, fields))
+
+        given_ids = [fields['student_id'] for _, fields in cleaned if fields['student_id']]
+        # all_objects: a trashed student still holds its student_id
+        existing = dict(Student.all_objects.filter(student_id__in=given_ids).values_list('student_id', 'deleted_at'))
+        for row_number, fields in cleaned:
+            if fields['student_id'] not in existing:
+                rows.append(fields)
+            elif existing[fields['student_id']] is None:
+                result.duplicates += 1
+            else:
+                result.add_error(row_number, f"student_id {fields['student_id']!r} belongs to a student in the trash")
+
+    if rows:
+        with transaction.atomic():
+            result.created = _write_roster(rows, chunk_size)
+
+    RecentActivity.objects.create(
+        user=user,
+        action=(
+            f"Enrolled {result.created} students from {source_name} "
+            f"({result.duplicates} already enrolled, {result.error_count} rows rejected)"
+        ),
+        icon_class="fas fa-user-graduate text-green-500",
+    )
+    return result
@@ -0,0 +1,207 @@
+"""
+Background jobs for report exports.
+
+Views call ``enqueue()`` to add a BackgroundJob row and return its id right
+away. The ``run_jobs`` management command claims pending rows one at a time
+with a conditional UPDATE, so several workers can share the table without a
+broker, and runs them through the handlers registered below. Handlers that
+produce a file return a JobOutput, which is stored in the job's ``result``
+under JOB_RESULTS_ROOT, outside the public MEDIA_ROOT, under a random name;
+only the job_download view serves it, to the job's owner. Finished jobs and
+their files are purged after JOB_RESULT_TTL. Emails go through
+admin_panel.outbox instead; the worker drains it between jobs.
+
+While a job runs, its heartbeat_at is refreshed every JOB_HEARTBEAT_INTERVAL.
+Only RUNNING jobs whose heartbeat has been quiet for JOB_STALE_AFTER are put
+back in the queue, so a long export is never started a second time while its
+worker is alive.
+"""
+import datetime
+import tempfile
+import threading
+from collections import namedtuple
+
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from . import artifacts, exports, reports
+from .financial import get_financial_summary
+from .models import BackgroundJob, Employee, Student
+
+# run_job refreshes heartbeat_at this often while the handler runs
+JOB_HEARTBEAT_INTERVAL = datetime.timedelta(seconds=30)
+# A RUNNING job whose heartbeat is older than this has lost its worker, however long it has been running
+JOB_STALE_AFTER = datetime.timedelta(minutes=5)
+JOB_MAX_ATTEMPTS = 3
+# Finished jobs and their result files are deleted this long after they finish
+JOB_RESULT_TTL = datetime.timedelta(days=7)
+
+JobOutput = namedtuple('JobOutput', ['filename', 'content_type', 'content'])
+
+JOB_HANDLERS = {}
+
+
+class UnknownJob(ValueError):
+    pass
+
+
+def handler(kind):
+    """Register the decorated function as the handler of jobs of ``kind``."""
+    def register(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return register
+
+
+def enqueue(kind, user, **params):
+    if kind not in JOB_HANDLERS:
+        raise UnknownJob(kind)
+    return BackgroundJob.objects.create(kind=kind, user=user, params=params)
+
+
+def claim_next():
+    """Mark the oldest pending job as running and return it, or None when the queue is empty."""
+    while True:
+        pk = BackgroundJob.objects.filter(status=BackgroundJob.PENDING).order_by('id').values_list('id', flat=True).first()
+        if pk is None:
+            return None
+        now = timezone.now()
+        claimed = BackgroundJob.objects.filter(pk=pk, status=BackgroundJob.PENDING).update(
+            status=BackgroundJob.RUNNING, started_at=now, heartbeat_at=now, attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return BackgroundJob.objects.get(pk=pk)
+        # Another worker got it first
+
+
+def requeue_stale(now=None):
+    """
+    Return RUNNING jobs abandoned by a dead worker to the queue, or fail them
+    once they have used up their attempts. Returns (requeued, failed).
+    Staleness is measured from the last heartbeat, so a long export whose
+    worker is still alive is never run twice.
+    """
+    cutoff = (now or timezone.now()) - JOB_STALE_AFTER
+    stale = BackgroundJob.objects.filter(status=BackgroundJob.RUNNING, heartbeat_at__lt=cutoff)
+    failed = stale.filter(attempts__gte=JOB_MAX_ATTEMPTS).update(
+        status=BackgroundJob.FAILED, error='Worker stopped responding', finished_at=timezone.now(),
+    )
+    requeued = stale.update(status=BackgroundJob.PENDING)
+    return requeued, failed
+
+
+def purge_finished(now=None):
+    """
+    Delete done and failed jobs that finished more than JOB_RESULT_TTL ago,
+    with their result files. Returns the number of jobs deleted.
+    """
+    cutoff = (now or timezone.now()) - JOB_RESULT_TTL
+    expired = BackgroundJob.objects.filter(
+        status__in=[BackgroundJob.DONE, BackgroundJob.FAILED], finished_at__lt=cutoff,
+    )
+    for job in expired.exclude(result='').only('id', 'result').iterator():
+        job.result.delete(save=False)
+    return expired.delete()[0]
+
+
+def _beat(job_id, stop):
+    try:
+        while not stop.wait(JOB_HEARTBEAT_INTERVAL.total_seconds()):
+            BackgroundJob.objects.filter(pk=job_id, status=BackgroundJob.RUNNING).update(heartbeat_at=timezone.now())
+    finally:
+        # The heartbeat thread has its own connection
+        connection.close()
+
+
+def run_job(job):
+    """
+    Run a claimed job and record its outcome, refreshing its heartbeat from a
+    side thread meanwhile. Never raises for handler errors.
+    """
+    output = None
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_beat, args=(job.pk, stop), daemon=True)
+    heartbeat.start()
+    try:
+        output = JOB_HANDLERS[job.kind](**job.params)
+        if output is not None:
+            content = output.content
+            content = File(content) if hasattr(content, 'read') else ContentFile(content)
+            job.result.save(output.filename, content, save=False)
+            job.result_name = output.filename
+            job.content_type = output.content_type
+        job.status = BackgroundJob.DONE
+        job.error = ''
+    except Exception as e:
+        job.status = BackgroundJob.FAILED
+        job.error = f"{type(e).__name__}: {e}"
+    finally:
+        stop.set()
+        heartbeat.join()
+        if output is not None and hasattr(output.content, 'close'):
+            output.content.close()
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'result', 'result_name', 'content_type', 'finished_at'])
+    return job
+
+
+@handler('student_report_pdf')
+def student_report_pdf(student_id):
+    student = Student.objects.get(id=student_id)
+    file = artifacts.student_report(student, artifacts.PDF)
+    return JobOutput(f"{student.name}_report.pdf", reports.PDF_CONTENT_TYPE, file)
+
+
+@handler('student_report_excel')
+def student_report_excel(student_id):
+    student = Student.objects.get(id=student_id)
+    file = artifacts.student_report(student, artifacts.XLSX)
+    return JobOutput(f"{student.name}_report.xlsx", reports.XLSX_CONTENT_TYPE, file)
+
+
+@handler('employment_report_pdf')
+def employment_report_pdf(employee_id):
+    employee = Employee.objects.get(id=employee_id)
+    file = artifacts.employee_report(employee, artifacts.PDF)
+    return JobOutput(f"{employee.name}_report.pdf", reports.PDF_CONTENT_TYPE, file)
+
+
+@handler('employment_report_excel')
+def employment_report_excel(employee_id):
+    employee = Employee.objects.get(id=employee_id)
+    file = artifacts.employee_report(employee, artifacts.XLSX)
+    return JobOutput(f"{employee.name}_report.xlsx", reports.XLSX_CONTENT_TYPE, file)
+
+
+@handler('financial_report_pdf')
+def financial_report_pdf():
+    return JobOutput("financial_report.pdf", reports.PDF_CONTENT_TYPE,
+                     artifacts.financial_report(get_financial_summary(), artifacts.PDF))
+
+
+@handler('financial_report_excel')
+def financial_report_excel():
+    return JobOutput("financial_report.xlsx", reports.XLSX_CONTENT_TYPE,
+                     artifacts.financial_report(get_financial_summary(), artifacts.XLSX))
+
+
+@handler('table_export')
+def table_export(table, filters):
+    file = exports.export_table(table, filters)
+    return JobOutput(f"{table}_{timezone.localdate():%Y%m%d}.xlsx", reports.XLSX_CONTENT_TYPE, file)
+
+
+@handler('student_report_archive')
+def student_report_archive(filters):
+    file = tempfile.TemporaryFile(suffix='.zip')
+    try:
+        for chunk in exports.iter_student_report_archive(exports.student_report_queryset(filters)):
+            file.write(chunk)
+    except Exception:
+        file.close()
+        raise
+    file.seek(0)
+    return JobOutput(f"student_reports_{timezone.localdate():%Y%m%d}.zip", 'application/zip', file)
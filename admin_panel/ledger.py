@@ -0,0 +1,229 @@
+"""
+Daily and monthly rollups of the Transaction and Expense ledgers.
+
+LedgerDailyRollup and LedgerMonthlyRollup hold the row count and amount total
+per (bucket, source, type). The signal handlers below apply the difference of
+every save and delete to both tables, and ``record()`` does the same for bulk
+writes that bypass signals, so period reports and charts read one row per
+bucket instead of scanning the ledgers. ``rebuild_rollups()`` regenerates both
+tables from scratch.
+"""
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import connections, router, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Transaction, Expense, LedgerRollup, LedgerDailyRollup, LedgerMonthlyRollup
+from .softdelete import rows_restored, rows_trashed
+
+CENTS = Decimal('0.01')
+
+DAY = 'day'
+MONTH = 'month'
+ROLLUP_MODELS = {
+    DAY: LedgerDailyRollup,
+    MONTH: LedgerMonthlyRollup,
+}
+LEDGER_SOURCES = {
+    Transaction: LedgerRollup.TRANSACTION,
+    Expense: LedgerRollup.EXPENSE,
+}
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def _next_month(day):
+    return (month_start(day) + datetime.timedelta(days=32)).replace(day=1)
+
+
+def _normalize(model, day, amount):
+    # Views assign raw POST strings to these fields, so coerce like the ORM would
+    return model._meta.get_field('date').to_python(day), model._meta.get_field('amount').to_python(amount)
+
+
+def _apply(model, deltas):
+    """
+    Add ``{(bucket, source, type): (count, total)}`` to ``model`` with a single
+    upsert per batch, so concurrent writers can neither lose an increment nor
+    race to create the same bucket.
+    """
+    rows = [(key, delta) for key, delta in deltas.items() if delta[0] or delta[1]]
+    if not rows:
+        return
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    fields = [model._meta.get_field(name) for name in ('bucket', 'source', 'type', 'count', 'total')]
+    columns = [quote(field.column) for field in fields]
+    bucket, source, type_, count, total = columns
+    sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))}) "
+        f"ON CONFLICT ({bucket}, {source}, {type_}) DO UPDATE SET "
+        f"{count} = {table}.{count} + excluded.{count}, {total} = {table}.{total} + excluded.{total}"
+    )
+    params = [
+        [field.get_db_prep_save(value, connection) for field, value in zip(fields, (*key, *delta))]
+        for key, delta in rows
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+
+
+def apply_deltas(deltas):
+    """
+    Apply ``{(source, day, type): (count, total)}`` to the daily and monthly
+    tables, merging days of the same month into one monthly delta.
+    """
+    daily = {}
+    monthly = defaultdict(lambda: [0, Decimal('0')])
+    for (source, day, type_), (count, total) in deltas.items():
+        daily[(day, source, type_)] = (count, total)
+        month = monthly[(month_start(day), source, type_)]
+        month[0] += count
+        month[1] += total
+    _apply(LedgerDailyRollup, daily)
+    _apply(LedgerMonthlyRollup, monthly)
+
+
+def record(model, rows, sign=1):
+    """
+    Roll up ``(date, type, amount)`` rows of ``model`` written without signals,
+    e.g. by bulk_create. Pass ``sign=-1`` for rows that were bulk deleted.
+    """
+    source = LEDGER_SOURCES[model]
+    deltas = defaultdict(lambda: [0, Decimal('0')])
+    for day, type_, amount in rows:
+        day, amount = _normalize(model, day, amount)
+        delta = deltas[(source, day, type_)]
+        delta[0] += sign
+        delta[1] += sign * amount
+    apply_deltas(deltas)
+
+
+def rebuild_rollups():
+    """Regenerate both rollup tables from the ledgers. Returns (daily rows, monthly rows)."""
+    daily = []
+    monthly = []
+    for model, source in LEDGER_SOURCES.items():
+        rows = model.objects.order_by().values('date', 'type').annotate(count=Count('id'), total=Sum('amount'))
+        daily.extend(
+            LedgerDailyRollup(bucket=row['date'], source=source, type=row['type'], count=row['count'], total=row['total'])
+            for row in rows
+        )
+        rows = model.objects.order_by().annotate(month=TruncMonth('date')).values('month', 'type').annotate(
+            count=Count('id'), total=Sum('amount')
+        )
+        monthly.extend(
+            LedgerMonthlyRollup(bucket=row['month'], source=source, type=row['type'], count=row['count'], total=row['total'])
+            for row in rows
+        )
+    with transaction.atomic():
+        LedgerDailyRollup.objects.all().delete()
+        LedgerMonthlyRollup.objects.all().delete()
+        LedgerDailyRollup.objects.bulk_create(daily, batch_size=1000)
+        LedgerMonthlyRollup.objects.bulk_create(monthly, batch_size=1000)
+    return len(daily), len(monthly)
+
+
+def _filtered(queryset, source=None, type_=None):
+    if source:
+        queryset = queryset.filter(source=source)
+    if type_:
+        queryset = queryset.filter(type=type_)
+    return queryset
+
+
+def series(start, end, granularity=DAY, source=None, type_=None):
+    """Per-bucket rows between ``start`` and ``end`` inclusive, oldest first."""
+    model = ROLLUP_MODELS[granularity]
+    if granularity == MONTH:
+        start = month_start(start)
+    queryset = _filtered(model.objects.filter(bucket__gte=start, bucket__lte=end), source, type_)
+    return list(queryset.order_by('bucket', 'source', 'type').values('bucket', 'source', 'type', 'count', 'total'))
+
+
+def period_totals(start, end, source=None, type_=None):
+    """
+    Count and total per (source, type) between ``start`` and ``end`` inclusive.
+    Whole months inside the range are read from the monthly table and only the
+    partial months at either edge from the daily table.
+    """
+    first_month = start if start.day == 1 else _next_month(start)
+    after_last_month = month_start(end + datetime.timedelta(days=1))
+    if first_month < after_last_month:
+        monthly = LedgerMonthlyRollup.objects.filter(bucket__gte=first_month, bucket__lt=after_last_month)
+        daily = LedgerDailyRollup.objects.filter(
+            Q(bucket__gte=start, bucket__lt=first_month) | Q(bucket__gte=after_last_month, bucket__lte=end)
+        )
+        querysets = [monthly, daily]
+    else:
+        querysets = [LedgerDailyRollup.objects.filter(bucket__gte=start, bucket__lte=end)]
+
+    totals = defaultdict(lambda: {'count': 0, 'total': Decimal('0')})
+    for queryset in querysets:
+        rows = _filtered(queryset, source, type_).order_by().values('source', 'type').annotate(
+            row_count=Sum('count'), row_total=Sum('total')
+        )
+        for row in rows:
+            entry = totals[(row['source'], row['type'])]
+            entry['count'] += row['row_count']
+            entry['total'] += Decimal(str(row['row_total']))
+    for entry in totals.values():
+        entry['total'] = entry['total'].quantize(CENTS)
+    return dict(totals)
+
+
+@receiver(pre_save, sender=Transaction)
+@receiver(pre_save, sender=Expense)
+def remember_ledger_fields(sender, instance, raw=False, **kwargs):
+    instance._ledger_previous = None
+    if raw or instance.pk is None:
+        return
+    instance._ledger_previous = sender.objects.filter(pk=instance.pk).values('date', 'type', 'amount').first()
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_save, sender=Expense)
+def update_rollups_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    source = LEDGER_SOURCES[sender]
+    deltas = defaultdict(lambda: [0, Decimal('0')])
+    previous = getattr(instance, '_ledger_previous', None)
+    if previous is not None:
+        day, amount = _normalize(sender, previous['date'], previous['amount'])
+        delta = deltas[(source, day, previous['type'])]
+        delta[0] -= 1
+        delta[1] -= amount
+    day, amount = _normalize(sender, instance.date, instance.amount)
+    delta = deltas[(source, day, instance.type)]
+    delta[0] += 1
+    delta[1] += amount
+    apply_deltas(deltas)
+
+
+@receiver(post_delete, sender=Transaction)
+@receiver(post_delete, sender=Expense)
+def update_rollups_on_delete(sender, instance, **kwargs):
+    if instance.is_deleted:
+        return
+    record(sender, [(instance.date, instance.type, instance.amount)], sign=-1)
+
+
+@receiver(rows_trashed, sender=Transaction)
+@receiver(rows_trashed, sender=Expense)
+def update_rollups_on_trash(sender, pks, **kwargs):
+    record(sender, sender.all_objects.filter(pk__in=pks).values_list('date', 'type', 'amount'), sign=-1)
+
+
+@receiver(rows_restored, sender=Transaction)
+@receiver(rows_restored, sender=Expense)
+def update_rollups_on_restore(sender, pks, **kwargs):
+    record(sender, sender.all_objects.filter(pk__in=pks).values_list('date', 'type', 'amount'))
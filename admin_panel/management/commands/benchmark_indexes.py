@@ -0,0 +1,253 @@
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Sum
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from admin_panel.models import Student, Employee, Expense, Transaction, RecentActivity, TrashBinEntry
+from admin_panel.pagination import keyset_page, encode_cursor
+
+BENCHMARK_ALIAS = 'index_benchmark'
+BENCHMARK_MODELS = (User, Student, Employee, Expense, Transaction, RecentActivity, TrashBinEntry)
+INDEXED_MODELS = (Student, Employee, Expense, Transaction, RecentActivity, TrashBinEntry)
+USER_COUNT = 20
+INSERT_BATCH = 10000
+
+
+def _benchmark_queries(alias, user_id, cursor):
+    """(label, callable) pairs mirroring the queries issued by the views."""
+    transactions = Transaction.objects.using(alias)
+    return [
+        ("recent_transactions date_desc", lambda: list(transactions.order_by('-date', '-id')[:50])),
+        ("recent_transactions amount_asc", lambda: list(transactions.order_by('amount', 'id')[:50])),
+        ("recent_transactions type + date_desc",
+         lambda: list(transactions.filter(type=Transaction.TRANSPORT).order_by('-date', '-id')[:50])),
+        ("recent_transactions type + amount_desc",
+         lambda: list(transactions.filter(type=Transaction.OTHER).order_by('-amount', '-id')[:50])),
+        ("recent_transactions keyset page (date_desc)",
+         lambda: keyset_page(transactions.all(), 'date', True, cursor=cursor, page_size=50)),
+        ("financial sums: salary expenses",
+         lambda: Expense.objects.using(alias).filter(type=Expense.SALARY).aggregate(Sum('amount'))),
+        ("activity feed for one user",
+         lambda: list(RecentActivity.objects.using(alias).filter(user_id=user_id).order_by('-timestamp', '-id')[:20])),
+        ("activity feed latest",
+         lambda: list(RecentActivity.objects.using(alias).order_by('-timestamp', '-id')[:20])),
+        ("trash bin for one user",
+         lambda: list(TrashBinEntry.objects.using(alias).filter(user_id=user_id).order_by('-deleted_at')[:50])),
+        ("student grid program + name_asc",
+         lambda: list(Student.objects.using(alias).filter(program=Student.IOT).order_by('name', 'id')[:10])),
+        ("student grid enrollment_date desc",
+         lambda: list(Student.objects.using(alias).order_by('-enrollment_date', '-id')[:10])),
+        ("students by type + status",
+         lambda: Student.objects.using(alias).filter(type=Student.TRAINEE, current_status=Student.ACTIVE).count()),
+        ("students by status",
+         lambda: Student.objects.using(alias).filter(current_status=Student.GRADUATED).count()),
+        ("employee grid hire_date desc",
+         lambda: list(Employee.objects.using(alias).order_by('-hire_date', '-id')[:10])),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a scratch SQLite database and time the hot view queries with and without "
+        "the composite indexes declared in Meta.indexes, printing EXPLAIN QUERY PLAN output."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000,
+                            help="Rows seeded into Transaction, Expense and RecentActivity.")
+        parser.add_argument('--repeat', type=int, default=5, help="Timed runs per query.")
+        parser.add_argument('--database', default=None,
+                            help="Path of the scratch database (a temporary file by default).")
+        parser.add_argument('--keep', action='store_true', help="Keep the scratch database afterwards.")
+        parser.add_argument('--seed', type=int, default=42, help="Random seed for the generated data.")
+
+    def handle(self, *args, **options):
+        path = options['database'] or os.path.join(tempfile.mkdtemp(prefix='index-benchmark-'), 'benchmark.sqlite3')
+        if os.path.exists(path):
+            os.remove(path)
+        connection = self._open(path)
+        try:
+            random.seed(options['seed'])
+            self._create_schema(connection)
+            self._seed(connection, options['rows'])
+
+            mid_date, mid_id = Transaction.objects.using(BENCHMARK_ALIAS).order_by('-date', '-id').values_list(
+                'date', 'id'
+            )[options['rows'] // 2]
+            cursor = encode_cursor([mid_date, mid_id])
+            user_id = User.objects.using(BENCHMARK_ALIAS).order_by('id').values_list('id', flat=True).first()
+            queries = _benchmark_queries(BENCHMARK_ALIAS, user_id, cursor)
+
+            before = self._run(connection, queries, options['repeat'])
+            started = time.perf_counter()
+            self._set_indexes(connection, create=True)
+            self.stdout.write(f"Created indexes in {time.perf_counter() - started:.1f}s\n")
+            after = self._run(connection, queries, options['repeat'])
+            self._report(queries, before, after)
+        finally:
+            connection.close()
+            del connections[BENCHMARK_ALIAS]
+            del connections.settings[BENCHMARK_ALIAS]
+            if options['keep']:
+                self.stdout.write(f"Scratch database kept at {path}")
+            elif os.path.exists(path):
+                os.remove(path)
+
+    def _open(self, path):
+        settings_dict = dict(connections['default'].settings_dict)
+        settings_dict.update({'ENGINE': 'django.db.backends.sqlite3', 'NAME': path, 'OPTIONS': {}})
+        connections.settings[BENCHMARK_ALIAS] = settings_dict
+        return connections[BENCHMARK_ALIAS]
+
+    def _create_schema(self, connection):
+        with connection.schema_editor() as editor:
+            for model in BENCHMARK_MODELS:
+                editor.create_model(model)
+        # Seed without the indexes under test so the "before" plans see the original schema
+        self._set_indexes(connection, create=False)
+
+    def _set_indexes(self, connection, create):
+        with connection.schema_editor() as editor:
+            for model in INDEXED_MODELS:
+                for index in model._meta.indexes:
+                    if create:
+                        editor.add_index(model, index)
+                    else:
+                        editor.remove_index(model, index)
+
+    def _insert(self, connection, model, rows):
+        fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+        quote = connection.ops.quote_name
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote(model._meta.db_table),
+            ', '.join(quote(field.column) for field in fields),
+            ', '.join(['%s'] * len(fields)),
+        )
+        defaults = {field.name: field.get_default() for field in fields}
+        batch = []
+        total = 0
+        with connection.cursor() as cursor:
+            for row in rows:
+                values = {**defaults, **row}
+                batch.append([field.get_db_prep_save(values[field.name], connection) for field in fields])
+                if len(batch) >= INSERT_BATCH:
+                    cursor.executemany(sql, batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                cursor.executemany(sql, batch)
+                total += len(batch)
+        return total
+
+    def _seed(self, connection, rows):
+        started = time.perf_counter()
+        today = date.today()
+        now = timezone.now()
+        people = max(rows // 10, 1)
+
+        # Scratch data only: skip the journal to keep a million-row load fast
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode = OFF')
+            cursor.execute('PRAGMA synchronous = OFF')
+
+        self._insert(connection, User, (
+            {'username': f'bench{i}', 'password': '!', 'date_joined': now} for i in range(USER_COUNT)
+        ))
+        user_ids = list(User.objects.using(BENCHMARK_ALIAS).values_list('id', flat=True))
+        types = [choice for choice, _ in Transaction.TYPE_CHOICES]
+
+        def day(span):
+            return today - timedelta(days=random.randrange(span))
+
+        def amount():
+            return Decimal(random.randrange(100, 5000000)) / 100
+
+        def moment(span_days):
+            return now - timedelta(seconds=random.randrange(span_days * 86400))
+
+        counts = {
+            'Transaction': self._insert(connection, Transaction, (
+                {'date': day(1825), 'type': random.choice(types), 'description': f'Transaction {i}', 'amount': amount()}
+                for i in range(rows)
+            )),
+            'Expense': self._insert(connection, Expense, (
+                {'date': day(1825), 'type': random.choice(types), 'description': f'Expense {i}', 'amount': amount()}
+                for i in range(rows)
+            )),
+            'RecentActivity': self._insert(connection, RecentActivity, (
+                {'user': random.choice(user_ids), 'action': f'Action {i}', 'timestamp': moment(730)}
+                for i in range(rows)
+            )),
+            'TrashBinEntry': self._insert(connection, TrashBinEntry, (
+                {'user': random.choice(user_ids), 'item_type': 'Student', 'item_id': i,
+                 'item_data': {'name': f'Student {i}'}, 'deleted_at': moment(365)}
+                for i in range(people)
+            )),
+            'Student': self._insert(connection, Student, (
+                {'name': f'Student {random.randrange(people):07d}', 'student_id': f'S{i:08d}',
+                 'enrollment_date': day(1825), 'type': random.choice(Student.TYPE_CHOICES)[0],
+                 'program': random.choice(Student.PROGRAM_CHOICES)[0], 'level': 'Beginner',
+                 'current_status': random.choice(Student.STATUS_CHOICES)[0]}
+                for i in range(people)
+            )),
+            'Employee': self._insert(connection, Employee, (
+                {'first_name': f'Employee{i}', 'last_name': 'Bench', 'employee_id': f'E{i:08d}',
+                 'hire_date': day(3650), 'position': 'Staff', 'department': 'IT', 'salary': amount()}
+                for i in range(people)
+            )),
+        }
+        summary = ', '.join(f'{count} {name}' for name, count in counts.items())
+        self.stdout.write(f"Seeded {summary} in {time.perf_counter() - started:.1f}s\n")
+
+    def _run(self, connection, queries, repeat):
+        results = []
+        for label, run in queries:
+            with CaptureQueriesContext(connection) as captured:
+                run()
+            plans = []
+            with connection.cursor() as cursor:
+                for query in captured.captured_queries:
+                    cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'])
+                    plans.extend(row[-1] for row in cursor.fetchall())
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                run()
+                timings.append((time.perf_counter() - started) * 1000)
+            results.append((plans, timings))
+        return results
+
+    def _report(self, queries, before, after):
+        rows = []
+        for (label, _), (plan_before, times_before), (plan_after, times_after) in zip(queries, before, after):
+            median_before = statistics.median(times_before)
+            median_after = statistics.median(times_after)
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write("  before:")
+            for line in plan_before:
+                self.stdout.write(f"    {line}")
+            self.stdout.write("  after:")
+            for line in plan_after:
+                self.stdout.write(f"    {line}")
+            self.stdout.write(
+                f"  median {median_before:.2f} ms -> {median_after:.2f} ms "
+                f"(best {min(times_before):.2f} -> {min(times_after):.2f})\n"
+            )
+            rows.append((label, median_before, median_after))
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Summary (median ms)"))
+        width = max(len(label) for label, _, _ in rows)
+        for label, median_before, median_after in rows:
+            speedup = median_before / median_after if median_after else float('inf')
+            self.stdout.write(f"  {label.ljust(width)}  {median_before:10.2f}  {median_after:10.2f}  {speedup:8.1f}x")
+        self.stdout.write(self.style.SUCCESS("Benchmark complete"))
@@ -0,0 +1,90 @@
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from admin_panel import report_layout, reports
+from admin_panel.financial import FinancialSummary
+
+WORDS = (
+    "attended consistently strong progress on the capstone project needs more practice with testing "
+    "collaborates well mentors peers in lab sessions delivered the sprint demo on time"
+).split()
+
+
+def _sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def _student(rng, i, comment_words):
+    data = {name: '' for name in reports.STUDENT_REPORT_FIELDS}
+    data.update({
+        'id': str(i), 'name': f'Student {i}', 'student_id': f'STU{i:06d}', 'email': f'student{i}@example.com',
+        'phone': '555-0100', 'address': '1 Main Street', 'enrollment_date': '2024-09-01', 'type': 'Trainee',
+        'program': 'Internet of Things', 'level': 'Intermediate', 'current_status': 'Active',
+        'total_sessions': '40', 'attended_sessions': '36', 'absences': '4', 'participation_score': '8.50',
+        'avg_scores': '78.25', 'project_completion_rate': '90.00', 'graduation_eligibility': 'Yes',
+    })
+    for _, name in reports.STUDENT_TEXT_FIELDS:
+        data[name] = _sentence(rng, rng.randrange(10, 60))
+    data['mentor_comments'] = '\n'.join(_sentence(rng, 25) for _ in range(comment_words // 25))
+    return data
+
+
+def _ledger(rng, rows):
+    today = date.today()
+    for i in range(rows):
+        yield (
+            (today - timedelta(days=i // 20)).strftime('%Y-%m-%d'),
+            rng.choice(['Salary', 'Transport', 'Other']),
+            _sentence(rng, rng.randrange(2, 14)),
+            f"${Decimal(rng.randrange(100, 500000)) / 100}",
+        )
+
+
+class Command(BaseCommand):
+    help = "Render synthetic student and financial reports with the layout engine and report pages per second."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=100, help="Student reports to render.")
+        parser.add_argument('--comment-words', type=int, default=1500,
+                            help="Words of mentor comments per student report.")
+        parser.add_argument('--ledger-rows', type=int, default=10000,
+                            help="Rows in each ledger table of the financial report.")
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        students = [_student(rng, i, options['comment_words']) for i in range(options['students'])]
+        transactions = list(_ledger(rng, options['ledger_rows']))
+        expenses = list(_ledger(rng, options['ledger_rows']))
+        financial = FinancialSummary(Decimal('125000.00'), Decimal('8400.50'), Decimal('12999.99'))
+
+        # Warm up the shared style and font caches so they don't count against the first run
+        report_layout.build_pdf("Warm-up", [report_layout.TextBlock('Warm-up', 'x')])
+
+        results = [
+            self._time("student reports", lambda: [
+                report_layout.build_pdf(f"Student Report: {data['name']}", reports.student_report_sections(data))
+                for data in students
+            ]),
+            self._time("financial report", lambda: [
+                report_layout.build_pdf("Financial Report",
+                                        reports.financial_report_sections(financial, transactions, expenses))
+            ]),
+        ]
+        for label, documents, pages, size, elapsed in results:
+            self.stdout.write(
+                f"{label}: {documents} documents, {pages} pages, {size / 1024:.0f} KiB in {elapsed:.2f}s "
+                f"-> {pages / elapsed:.1f} pages/s, {documents / elapsed:.1f} documents/s"
+            )
+        self.stdout.write(self.style.SUCCESS("Benchmark complete"))
+
+    def _time(self, label, render):
+        started = time.perf_counter()
+        rendered = render()
+        elapsed = time.perf_counter() - started
+        return (label, len(rendered), sum(pdf.pages for pdf in rendered),
+                sum(len(pdf.content) for pdf in rendered), elapsed)
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from admin_panel import exports
+
+
+class Command(BaseCommand):
+    help = "Export a whole table (students, employees, transactions or expenses) to an XLSX workbook."
+
+    def add_arguments(self, parser):
+        parser.add_argument('table', choices=sorted(exports.TABLE_EXPORTS))
+        parser.add_argument('path', help="XLSX file to write.")
+        parser.add_argument('--filter', action='append', default=[], metavar='NAME=VALUE',
+                            help="Filter rows, e.g. --filter program=IOT or --filter start=2024-01-01.")
+        parser.add_argument('--chunk-size', type=int, default=exports.EXPORT_CHUNK_SIZE,
+                            help="Rows fetched from the database per round trip.")
+
+    def handle(self, *args, **options):
+        params = dict(item.partition('=')[::2] for item in options['filter'])
+        export = exports.TABLE_EXPORTS[options['table']]
+        queryset = exports.export_queryset(options['table'], params)
+        with open(options['path'], 'wb') as file:
+            count = exports.write_xlsx(export, queryset, file, options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Exported {count} {options['table']} to {options['path']}"))
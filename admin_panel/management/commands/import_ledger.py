@@ -0,0 +1,41 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from admin_panel import imports
+
+
+class Command(BaseCommand):
+    help = "Bulk import transactions or expenses from a CSV or NDJSON file (columns: date, type, description, amount)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(imports.LEDGER_MODELS), help="What the file contains.")
+        parser.add_argument('path', help="CSV or NDJSON file to import.")
+        parser.add_argument('--user', required=True, help="Username the import is logged under.")
+        parser.add_argument('--format', choices=imports.IMPORT_FORMATS,
+                            help="File format; inferred from the file extension by default.")
+        parser.add_argument('--chunk-size', type=int, default=imports.DEFAULT_CHUNK_SIZE,
+                            help="Rows validated and inserted per transaction.")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"Unknown user: {options['user']}")
+        fmt = options['format'] or imports.format_for_filename(options['path'])
+        model = imports.LEDGER_MODELS[options['kind']]
+        try:
+            with open(options['path'], 'rb') as lines:
+                result = imports.import_ledger(
+                    lines, model, fmt, user, source_name=options['path'], chunk_size=options['chunk_size']
+                )
+        except OSError as e:
+            raise CommandError(str(e))
+
+        for error in result.errors:
+            self.stderr.write(f"line {error['line']}: {error['error']}")
+        if result.error_count > len(result.errors):
+            self.stderr.write(f"... and {result.error_count - len(result.errors)} more rejected rows")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result.created} {options['kind']}: "
+            f"{result.duplicates} duplicates skipped, {result.error_count} rows rejected"
+        ))
@@ -0,0 +1,45 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from admin_panel import imports
+
+
+class Command(BaseCommand):
+    help = (
+        "Enroll students from an XLSX or CSV roster "
+        "(columns: name, type, program, level and optionally student_id, email, phone, address, "
+        "category, enrollment_date, current_status)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="XLSX or CSV file to import.")
+        parser.add_argument('--user', required=True, help="Username the import is logged under.")
+        parser.add_argument('--format', choices=imports.ROSTER_FORMATS,
+                            help="File format; inferred from the file extension by default.")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"Unknown user: {options['user']}")
+        fmt = options['format'] or imports.format_for_filename(options['path'])
+        if fmt not in imports.ROSTER_FORMATS:
+            raise CommandError(f"Unsupported roster format: {fmt}")
+        try:
+            with open(options['path'], 'rb') as file:
+                if fmt == imports.XLSX:
+                    records = imports.read_xlsx_records(file)
+                else:
+                    records = imports.read_records(file, fmt)
+                result = imports.import_roster(records, user, source_name=options['path'])
+        except OSError as e:
+            raise CommandError(str(e))
+
+        for error in result.errors:
+            self.stderr.write(f"row {error['line']}: {error['error']}")
+        if result.error_count > len(result.errors):
+            self.stderr.write(f"... and {result.error_count - len(result.errors)} more rejected rows")
+        self.stdout.write(self.style.SUCCESS(
+            f"Enrolled {result.created} students: "
+            f"{result.duplicates} already enrolled, {result.error_count} rows rejected"
+        ))
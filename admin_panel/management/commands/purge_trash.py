@@ -0,0 +1,45 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from admin_panel import trash
+
+
+def _days(value):
+    # 0 disables the step
+    return datetime.timedelta(days=value) if value else None
+
+
+class Command(BaseCommand):
+    help = (
+        "Enforce the trash bin retention policy: drop entries past the age limit or over the per-user cap "
+        "(deleting the rows they hold in the trash) and compress older payloads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-age-days', type=int, default=trash.TRASH_RETENTION.days,
+                            help="Purge entries older than this many days (0 keeps them).")
+        parser.add_argument('--max-per-user', type=int, default=trash.TRASH_MAX_ENTRIES_PER_USER,
+                            help="Keep at most this many entries per user (0 for no cap).")
+        parser.add_argument('--compress-after-days', type=int, default=trash.TRASH_COMPRESS_AFTER.days,
+                            help="Compress payloads of entries older than this many days (0 never compresses).")
+        parser.add_argument('--chunk-size', type=int, default=trash.TRASH_CHUNK_SIZE)
+        parser.add_argument('--vacuum', action='store_true',
+                            help="VACUUM the SQLite database afterwards to give the freed pages back.")
+
+    def handle(self, *args, **options):
+        result = trash.purge_trash(
+            max_age=_days(options['max_age_days']),
+            max_per_user=options['max_per_user'] or None,
+            compress_after=_days(options['compress_after_days']),
+            chunk_size=options['chunk_size'],
+        )
+        if options['vacuum'] and connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('VACUUM')
+        self.stdout.write(self.style.SUCCESS(
+            f"Purged {result.expired + result.over_cap} trash entries ({result.expired} expired, "
+            f"{result.over_cap} over the per-user cap), deleted {result.rows_deleted} trashed rows, "
+            f"compressed {result.compressed} payloads"
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from admin_panel.models import DashboardSnapshot
+
+
+class Command(BaseCommand):
+    help = "Recompute the dashboard snapshot counters from the Student, Employee and Expense tables."
+
+    def handle(self, *args, **options):
+        snapshot = DashboardSnapshot.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Dashboard snapshot rebuilt: {snapshot.total_students} students, "
+            f"{snapshot.total_employees} employees, ${snapshot.total_expenses} total expenses"
+        ))
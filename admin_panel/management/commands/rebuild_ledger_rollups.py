@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from admin_panel import ledger
+
+
+class Command(BaseCommand):
+    help = "Regenerate the daily and monthly ledger rollups from the Transaction and Expense tables."
+
+    def handle(self, *args, **options):
+        daily, monthly = ledger.rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Ledger rollups rebuilt: {daily} daily rows, {monthly} monthly rows"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from admin_panel import search
+
+
+class Command(BaseCommand):
+    help = "Regenerate the full-text search index from the Student, Employee and Expense tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000, help="Rows read and inserted per batch.")
+
+    def handle(self, *args, **options):
+        total = search.rebuild_index(chunk_size=options['chunk_size'])
+        backend = "FTS5" if search.fts_available() else "fallback"
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} documents ({backend} backend)"))
@@ -0,0 +1,85 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from admin_panel import jobs, outbox
+
+
+def _run_in_thread(job):
+    try:
+        return jobs.run_job(job)
+    finally:
+        # Each pool thread opens its own connection; don't leave it dangling
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background jobs (report exports) with a pool of worker threads, "
+        "sending due outbox emails every --outbox-interval seconds and whenever the job queue is idle."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help="Jobs run concurrently.")
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help="Seconds to wait before checking an empty queue again.")
+        parser.add_argument('--outbox-interval', type=float, default=5.0,
+                            help="Seconds between outbox sends, whether or not jobs are running.")
+        parser.add_argument('--once', action='store_true', help="Exit when the queue is empty.")
+
+    def handle(self, *args, **options):
+        workers = max(options['workers'], 1)
+        requeued, failed = jobs.requeue_stale()
+        if requeued or failed:
+            self.stdout.write(f"Requeued {requeued} stale jobs, failed {failed}")
+        purged = jobs.purge_finished()
+        if purged:
+            self.stdout.write(f"Purged {purged} expired jobs")
+        self.stdout.write(f"Running jobs with {workers} workers")
+
+        running = set()
+        next_outbox = 0.0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            try:
+                while True:
+                    if time.monotonic() >= next_outbox:
+                        # On its own clock, so a steady stream of jobs can't hold back email
+                        sent = self._send_outbox()
+                        next_outbox = time.monotonic() + (0 if sent else options['outbox_interval'])
+                    claimed = None
+                    if len(running) < workers:
+                        claimed = jobs.claim_next()
+                        if claimed is not None:
+                            running.add(pool.submit(_run_in_thread, claimed))
+                    if claimed is not None and len(running) < workers:
+                        continue
+                    if running:
+                        done, running = wait(running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._report(future.result())
+                        continue
+                    sent = self._send_outbox()
+                    if options['once'] and not sent:
+                        break
+                    if not sent:
+                        time.sleep(options['poll_interval'])
+                        jobs.requeue_stale()
+                        jobs.purge_finished()
+            except KeyboardInterrupt:
+                self.stdout.write("Stopping; waiting for running jobs to finish")
+        for future in running:
+            self._report(future.result())
+
+    def _send_outbox(self):
+        result = outbox.send_due()
+        if any(result):
+            self.stdout.write(f"Outbox: {result.sent} sent, {result.retrying} to retry, {result.failed} failed")
+        return any(result)
+
+    def _report(self, job):
+        if job.status == job.DONE:
+            self.stdout.write(self.style.SUCCESS(f"{job} finished"))
+        else:
+            self.stderr.write(f"{job} failed: {job.error}")
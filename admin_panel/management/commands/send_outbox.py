@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from admin_panel import outbox
+
+
+class Command(BaseCommand):
+    help = "Send due outbox emails in batches over one mail connection per batch."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=outbox.OUTBOX_BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help="Keep polling instead of exiting when nothing is due.")
+        parser.add_argument('--interval', type=float, default=5.0, help="Seconds between polls with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            result = outbox.drain(options['batch_size'])
+            if any(result) or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Sent {result.sent} emails: {result.retrying} to retry, {result.failed} failed"
+                ))
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
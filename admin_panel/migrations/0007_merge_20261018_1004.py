@@ -0,0 +1,14 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:04
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0005_activitiesachievements_attendanceparticipation_and_more'),
+        ('admin_panel', '0006_remove_employee_name_employee_access_permissions_and_more'),
+    ]
+
+    operations = [
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0007_merge_20261018_1004'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_students', models.IntegerField(default=0)),
+                ('iot_students', models.IntegerField(default=0)),
+                ('sod_students', models.IntegerField(default=0)),
+                ('total_employees', models.IntegerField(default=0)),
+                ('total_salaries', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('transport_expenses', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('other_expenses', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_actor_summaries(apps, schema_editor):
+    RecentActivity = apps.get_model('admin_panel', 'RecentActivity')
+    ActivityActorSummary = apps.get_model('admin_panel', 'ActivityActorSummary')
+    rows = RecentActivity.objects.values('user_id').annotate(
+        activity_count=models.Count('id'),
+        last_active_at=models.Max('timestamp'),
+    ).order_by()
+    ActivityActorSummary.objects.bulk_create(
+        [ActivityActorSummary(**row) for row in rows],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0009_recentactivity_timestamp_index'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityActorSummary',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='activity_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('activity_count', models.IntegerField(default=0)),
+                ('last_active_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_actor_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+FTS_TABLE = 'admin_panel_searchdocument_fts'
+DOCUMENT_TABLE = 'admin_panel_searchdocument'
+
+
+def create_fts_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+            cursor.execute("DROP TABLE temp.fts5_probe")
+        except Exception:
+            # No FTS5 in this SQLite build; admin_panel.search falls back to icontains
+            return
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            f"title, content, content='{DOCUMENT_TABLE}', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2')"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER {DOCUMENT_TABLE}_ai AFTER INSERT ON {DOCUMENT_TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content); "
+            f"END"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER {DOCUMENT_TABLE}_ad AFTER DELETE ON {DOCUMENT_TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) VALUES ('delete', old.id, old.title, old.content); "
+            f"END"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER {DOCUMENT_TABLE}_au AFTER UPDATE ON {DOCUMENT_TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content) VALUES ('delete', old.id, old.title, old.content); "
+            f"INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content); "
+            f"END"
+        )
+
+
+def drop_fts_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for suffix in ('ai', 'ad', 'au'):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {DOCUMENT_TABLE}_{suffix}")
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def backfill_search_documents(apps, schema_editor):
+    Student = apps.get_model('admin_panel', 'Student')
+    Employee = apps.get_model('admin_panel', 'Employee')
+    Expense = apps.get_model('admin_panel', 'Expense')
+    SearchDocument = apps.get_model('admin_panel', 'SearchDocument')
+
+    def join(*parts):
+        return ' '.join(str(part) for part in parts if part)
+
+    documents = []
+    for student in Student.objects.iterator():
+        documents.append(SearchDocument(
+            entity_type='student', entity_id=student.pk, title=student.name,
+            content=join(student.name, student.student_id, student.type, student.get_type_display(),
+                         student.category, student.program, student.get_program_display(), student.level),
+        ))
+    for employee in Employee.objects.iterator():
+        documents.append(SearchDocument(
+            entity_type='employee', entity_id=employee.pk,
+            title=join(employee.first_name, employee.middle_name, employee.last_name),
+            content=join(employee.first_name, employee.middle_name, employee.last_name, employee.employee_id,
+                         employee.email, employee.position, employee.department),
+        ))
+    for expense in Expense.objects.iterator():
+        documents.append(SearchDocument(
+            entity_type='expense', entity_id=expense.pk, title=expense.description[:200],
+            content=join(expense.description, expense.type, expense.get_type_display()),
+        ))
+    SearchDocument.objects.bulk_create(documents, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0010_activityactorsummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(choices=[('student', 'Student'), ('employee', 'Employee'), ('expense', 'Expense')], max_length=20)),
+                ('entity_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('content', models.TextField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('entity_type', 'entity_id'), name='unique_search_document')],
+            },
+        ),
+        migrations.RunPython(create_fts_index, drop_fts_index),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:20
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def backfill_ledger_rollups(apps, schema_editor):
+    LedgerDailyRollup = apps.get_model('admin_panel', 'LedgerDailyRollup')
+    LedgerMonthlyRollup = apps.get_model('admin_panel', 'LedgerMonthlyRollup')
+    sources = {
+        'transaction': apps.get_model('admin_panel', 'Transaction'),
+        'expense': apps.get_model('admin_panel', 'Expense'),
+    }
+    for source, model in sources.items():
+        rows = model.objects.order_by().values('date', 'type').annotate(count=Count('id'), total=Sum('amount'))
+        LedgerDailyRollup.objects.bulk_create([
+            LedgerDailyRollup(bucket=row['date'], source=source, type=row['type'], count=row['count'], total=row['total'])
+            for row in rows
+        ], batch_size=1000)
+        rows = model.objects.order_by().annotate(month=TruncMonth('date')).values('month', 'type').annotate(
+            count=Count('id'), total=Sum('amount')
+        )
+        LedgerMonthlyRollup.objects.bulk_create([
+            LedgerMonthlyRollup(bucket=row['month'], source=source, type=row['type'], count=row['count'], total=row['total'])
+            for row in rows
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0012_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateField()),
+                ('source', models.CharField(choices=[('transaction', 'Transaction'), ('expense', 'Expense')], max_length=20)),
+                ('type', models.CharField(choices=[('salary', 'Salary'), ('transport', 'Transport'), ('other', 'Other')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('bucket', 'source', 'type'), name='unique_ledger_daily_rollup')],
+            },
+        ),
+        migrations.CreateModel(
+            name='LedgerMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateField()),
+                ('source', models.CharField(choices=[('transaction', 'Transaction'), ('expense', 'Expense')], max_length=20)),
+                ('type', models.CharField(choices=[('salary', 'Salary'), ('transport', 'Transport'), ('other', 'Other')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('bucket', 'source', 'type'), name='unique_ledger_monthly_rollup')],
+            },
+        ),
+        migrations.RunPython(backfill_ledger_rollups, migrations.RunPython.noop),
+    ]
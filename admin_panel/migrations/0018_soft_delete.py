@@ -0,0 +1,144 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0017_email_outbox'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='employee',
+            name='employee_hire_date_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='expense',
+            name='expense_type_amount_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='recentactivity',
+            name='activity_timestamp_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='recentactivity',
+            name='activity_user_timestamp_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='student',
+            name='student_name_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='student',
+            name='student_enrolled_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='student',
+            name='student_program_name_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='student',
+            name='student_type_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='student',
+            name='student_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='transaction',
+            name='transaction_date_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='transaction',
+            name='transaction_amount_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='transaction',
+            name='transaction_type_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='transaction',
+            name='transaction_type_amount_idx',
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='expense',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='recentactivity',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['hire_date', 'id'], name='employee_hire_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['type', 'deleted_at', 'amount'], name='expense_type_amount_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recentactivity',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['timestamp', 'id'], name='activity_timestamp_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recentactivity',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['user', 'timestamp', 'id'], name='activity_user_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['name', 'id'], name='student_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['enrollment_date', 'id'], name='student_enrolled_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['program', 'name', 'id'], name='student_program_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['type', 'current_status'], name='student_type_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['current_status'], name='student_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['date', 'id'], name='transaction_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['amount', 'id'], name='transaction_amount_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['type', 'date', 'id'], name='transaction_type_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['type', 'amount', 'id'], name='transaction_type_amount_idx'),
+        ),
+    ]
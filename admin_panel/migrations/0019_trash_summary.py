@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def _summarize(item_data, length=255):
+    # TrashBinEntry.summarize as of this migration
+    if not item_data:
+        text = "No details available"
+    elif isinstance(item_data, dict):
+        text = item_data.get('action') or ", ".join(f"{key}: {value}" for key, value in item_data.items())
+    else:
+        text = str(item_data)
+    return text if len(text) <= length else text[:length - 3] + '...'
+
+
+def backfill_summaries(apps, schema_editor):
+    TrashBinEntry = apps.get_model('admin_panel', 'TrashBinEntry')
+    batch = []
+    for entry in TrashBinEntry.objects.only('id', 'item_data').iterator(chunk_size=500):
+        entry.summary = _summarize(entry.item_data)
+        batch.append(entry)
+        if len(batch) == 500:
+            TrashBinEntry.objects.bulk_update(batch, ['summary'])
+            batch = []
+    TrashBinEntry.objects.bulk_update(batch, ['summary'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0018_soft_delete'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='trashbinentry',
+            name='trash_user_deleted_at_idx',
+        ),
+        migrations.AddField(
+            model_name='trashbinentry',
+            name='summary',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='trashbinentry',
+            index=models.Index(fields=['user', 'deleted_at', 'id'], name='trash_user_deleted_at_idx'),
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0019_trash_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trashbinentry',
+            name='item_data_compressed',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='trashbinentry',
+            name='item_data',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:05
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import migrations, models
+
+import admin_panel.models
+
+
+def move_results(apps, schema_editor):
+    """Move results written under the public MEDIA_ROOT into the private job results storage."""
+    BackgroundJob = apps.get_model('admin_panel', 'BackgroundJob')
+    public = FileSystemStorage(location=settings.MEDIA_ROOT)
+    private = admin_panel.models.job_result_storage()
+    for job in BackgroundJob.objects.exclude(result='').only('id', 'result'):
+        old_name = job.result.name
+        if not public.exists(old_name):
+            continue
+        with public.open(old_name) as file:
+            new_name = private.save(admin_panel.models.job_result_path(job, old_name), file)
+        public.delete(old_name)
+        BackgroundJob.objects.filter(pk=job.pk).update(result=new_name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0021_backgroundjob_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='backgroundjob',
+            name='result',
+            field=models.FileField(blank=True, storage=admin_panel.models.job_result_storage, upload_to=admin_panel.models.job_result_path),
+        ),
+        migrations.RunPython(move_results, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,22 @@
-from django.db import models
+import os
+import re
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import models, transaction, IntegrityError
 from django.contrib.auth.models import User
 from django.utils import timezone
-from django.db.models import JSONField
+from django.db.models import JSONField, F, Sum, Count, Max, Q, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .softdelete import LIVE, SoftDeleteModel, rows_restored, rows_trashed
+from decimal import Decimal
 import json
+import zlib
 
-class Student(models.Model):
+class Student(SoftDeleteModel):
     TRAINEE = 'trainee'
     INTERNEE_UNIVERSITY = 'internee-university'
     INTERNEE_HIGHSCHOOL = 'internee-highschool'
@@ -72,6 +84,17 @@ class Student(models.Model):
     next_steps = models.TextField(blank=True)
     graduation_eligibility = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Grid sorts (keyset pagination orders by the field, then id)
+            models.Index(fields=['name', 'id'], name='student_name_id_idx', condition=LIVE),
+            models.Index(fields=['enrollment_date', 'id'], name='student_enrolled_id_idx', condition=LIVE),
+            # Program/type/status filters and breakdowns
+            models.Index(fields=['program', 'name', 'id'], name='student_program_name_idx', condition=LIVE),
+            models.Index(fields=['type', 'current_status'], name='student_type_status_idx', condition=LIVE),
+            models.Index(fields=['current_status'], name='student_status_idx', condition=LIVE),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -81,7 +104,7 @@ class Student(models.Model):
             return (self.attended_sessions / self.total_sessions) * 100
         return 0
 
-class Employee(models.Model):
+class Employee(SoftDeleteModel):
     # Personal Information
     employee_id = models.CharField(max_length=20, unique=True, blank=True, null=True)
     first_name = models.CharField(max_length=50, blank=True, null=True)
@@ -146,6 +169,11 @@ class Employee(models.Model):
     ], default='active')
     notes = models.TextField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['hire_date', 'id'], name='employee_hire_date_id_idx', condition=LIVE),
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
@@ -187,7 +215,7 @@ class Employee(models.Model):
         }
         return status_colors.get(self.current_status, 'gray')
 
-class Expense(models.Model):
+class Expense(SoftDeleteModel):
     SALARY = 'salary'
     TRANSPORT = 'transport'
     OTHER = 'other'
@@ -200,12 +228,21 @@ class Expense(models.Model):
     type = models.CharField(max_length=20, choices=TYPE_CHOICES)
     description = models.TextField()
     amount = models.DecimalField(max_digits=12, decimal_places=2)
-    date = models.DateField(auto_now_add=True)
+    date = models.DateField(default=timezone.now)
+    # Content hash of bulk-imported rows, used to skip them when a file is imported again
+    import_hash = models.CharField(max_length=64, unique=True, blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            # Covers the per-type SUM(amount) of live rows without touching the table; a partial
+            # index can't, as SQLite still reads deleted_at from the table to check the condition
+            models.Index(fields=['type', 'deleted_at', 'amount'], name='expense_type_amount_idx'),
+        ]
 
     def __str__(self):
         return f"{self.type} - {self.amount}"
 
-class Transaction(models.Model):
+class Transaction(SoftDeleteModel):
     SALARY = 'salary'
     TRANSPORT = 'transport'
     OTHER = 'other'
@@ -215,15 +252,25 @@ class Transaction(models.Model):
         (OTHER, 'Other'),
     ]
 
-    date = models.DateField(auto_now_add=True)
+    date = models.DateField(default=timezone.now)
     type = models.CharField(max_length=20, choices=TYPE_CHOICES)
     description = models.TextField()
     amount = models.DecimalField(max_digits=12, decimal_places=2)
+    # Content hash of bulk-imported rows, used to skip them when a file is imported again
+    import_hash = models.CharField(max_length=64, unique=True, blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['date', 'id'], name='transaction_date_id_idx', condition=LIVE),
+            models.Index(fields=['amount', 'id'], name='transaction_amount_id_idx', condition=LIVE),
+            models.Index(fields=['type', 'date', 'id'], name='transaction_type_date_idx', condition=LIVE),
+            models.Index(fields=['type', 'amount', 'id'], name='transaction_type_amount_idx', condition=LIVE),
+        ]
 
     def __str__(self):
         return f"{self.type} - {self.amount}"
 
-class RecentActivity(models.Model):
+class RecentActivity(SoftDeleteModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     action = models.CharField(max_length=255)
     icon_class = models.CharField(max_length=100, default='fas fa-info-circle')
@@ -231,46 +278,185 @@ class RecentActivity(models.Model):
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['timestamp', 'id'], name='activity_timestamp_id_idx', condition=LIVE),
+            models.Index(fields=['user', 'timestamp', 'id'], name='activity_user_timestamp_idx', condition=LIVE),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.action} at {self.timestamp}"
 
+class ActivityActorSummary(models.Model):
+    """
+    Per-user rollup of RecentActivity, maintained by the signal handlers below.
+    Backs the activity user-filter dropdown and the most-active-users list
+    without scanning the activity log.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='activity_summary')
+    activity_count = models.IntegerField(default=0)
+    last_active_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.user.username}: {self.activity_count} activities"
+
+    @classmethod
+    def usernames(cls):
+        return list(cls.objects.order_by('user__username').values_list('user__username', flat=True))
+
+    @classmethod
+    def most_active(cls, limit=5):
+        return list(cls.objects.select_related('user').order_by('-activity_count', '-last_active_at')[:limit])
+
+@receiver(post_save, sender=RecentActivity)
+def update_actor_summary_on_activity_save(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    updated = ActivityActorSummary.objects.filter(user_id=instance.user_id).update(
+        activity_count=F('activity_count') + 1,
+        last_active_at=Greatest(Coalesce('last_active_at', Value(instance.timestamp)), Value(instance.timestamp)),
+    )
+    if not updated:
+        ActivityActorSummary.objects.create(
+            user_id=instance.user_id, activity_count=1, last_active_at=instance.timestamp
+        )
+
+@receiver(post_delete, sender=RecentActivity)
+def update_actor_summary_on_activity_delete(sender, instance, **kwargs):
+    if instance.is_deleted:
+        return
+    summary = ActivityActorSummary.objects.filter(user_id=instance.user_id).first()
+    if summary is None:
+        return
+    if summary.activity_count <= 1:
+        summary.delete()
+        return
+    summary.activity_count = F('activity_count') - 1
+    if summary.last_active_at is not None and instance.timestamp >= summary.last_active_at:
+        summary.last_active_at = RecentActivity.objects.filter(user_id=instance.user_id).aggregate(
+            latest=Max('timestamp')
+        )['latest']
+    summary.save(update_fields=['activity_count', 'last_active_at'])
+
+@receiver(rows_trashed, sender=RecentActivity)
+@receiver(rows_restored, sender=RecentActivity)
+def refresh_actor_summaries(sender, pks, **kwargs):
+    """Recount the summaries of the users whose activities were trashed or restored."""
+    user_ids = set(RecentActivity.all_objects.filter(pk__in=pks).values_list('user_id', flat=True))
+    live = RecentActivity.objects.filter(user_id__in=user_ids).order_by().values('user_id').annotate(
+        count=Count('id'), latest=Max('timestamp')
+    )
+    for row in live:
+        ActivityActorSummary.objects.update_or_create(
+            user_id=row['user_id'], defaults={'activity_count': row['count'], 'last_active_at': row['latest']}
+        )
+        user_ids.discard(row['user_id'])
+    ActivityActorSummary.objects.filter(user_id__in=user_ids).delete()
+
+class SearchDocument(models.Model):
+    """
+    Flattened searchable text for one Student, Employee or Expense, maintained
+    by admin_panel.search. On SQLite it is indexed by an FTS5 table.
+    """
+    STUDENT = 'student'
+    EMPLOYEE = 'employee'
+    EXPENSE = 'expense'
+    ENTITY_TYPE_CHOICES = [
+        (STUDENT, 'Student'),
+        (EMPLOYEE, 'Employee'),
+        (EXPENSE, 'Expense'),
+    ]
+
+    entity_type = models.CharField(max_length=20, choices=ENTITY_TYPE_CHOICES)
+    entity_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255)
+    content = models.TextField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['entity_type', 'entity_id'], name='unique_search_document'),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type} {self.entity_id}: {self.title}"
+
 class TrashBinEntry(models.Model):
+    SUMMARY_LENGTH = 255
+
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     item_type = models.CharField(max_length=100)
     item_id = models.PositiveIntegerField()
-    item_data = JSONField()
+    # NULL once compressed into item_data_compressed; read entries through ``payload``
+    item_data = JSONField(null=True, blank=True)
+    # zlib-compressed JSON of item_data, written by admin_panel.trash.compress_payloads
+    item_data_compressed = models.BinaryField(null=True, blank=True, editable=False)
+    # summarize(item_data), stored so the trash bin list never has to load item_data
+    summary = models.CharField(max_length=SUMMARY_LENGTH, blank=True)
     deleted_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         ordering = ['-deleted_at']
+        indexes = [
+            # Trash bin pages (keyset pagination orders by deleted_at, then id)
+            models.Index(fields=['user', 'deleted_at', 'id'], name='trash_user_deleted_at_idx'),
+        ]
 
     def __str__(self):
         return f"Deleted {self.item_type} (ID: {self.item_id}) by {self.user.username} at {self.deleted_at}"
 
+    @staticmethod
+    def compress(item_data):
+        return zlib.compress(json.dumps(item_data, separators=(',', ':')).encode(), 9)
+
+    @property
+    def payload(self):
+        """item_data, decompressed if the entry has been compressed."""
+        if self.item_data is None and self.item_data_compressed is not None:
+            return json.loads(zlib.decompress(self.item_data_compressed))
+        return self.item_data
+
+    @classmethod
+    def summarize(cls, item_data):
+        """formatted_item_data() of ``item_data``, cut to fit the summary column."""
+        text = cls(item_data=item_data).formatted_item_data()
+        if len(text) > cls.SUMMARY_LENGTH:
+            text = text[:cls.SUMMARY_LENGTH - 3] + '...'
+        return text
+
     def formatted_item_data(self):
         """
         Return a user-friendly string representation of item_data.
         Tries to extract key fields like 'action' or others for display.
         """
-        if not self.item_data:
+        item_data = self.payload
+        if not item_data:
             return "No details available"
 
         # If item_data is a dict, try to extract meaningful info
-        if isinstance(self.item_data, dict):
+        if isinstance(item_data, dict):
             # Example: show 'action' if present
-            action = self.item_data.get('action')
+            action = item_data.get('action')
             if action:
                 return action
             # Otherwise, join key-value pairs
             details_list = []
-            for key, value in self.item_data.items():
+            for key, value in item_data.items():
                 details_list.append(f"{key}: {value}")
             return ", ".join(details_list)
 
         # If item_data is a string or other type, return as is
-        return str(self.item_data)
-        
+        return str(item_data)
+
+@receiver(pre_save, sender=TrashBinEntry)
+def fill_trash_summary(sender, instance, raw=False, **kwargs):
+    if not instance.summary:
+        instance.summary = TrashBinEntry.summarize(instance.item_data)
+
+# The one-to-one satellites below split a student's profile into sections, but
+# every one of their fields is also a Student column. Student is the flattened
+# read model: the views, reports, exports and emails all read a student from
+# its own row, one query per student (one per iterator chunk for a cohort).
+# The satellites are copies written when a student is enrolled and are not
+# kept in sync afterwards, so nothing should render from them.
 class StudentProfile(models.Model):
     student = models.OneToOneField(Student, on_delete=models.CASCADE)
     name = models.CharField(max_length=100)
@@ -346,3 +532,390 @@ class StatusRecommendations(models.Model):
 
     def __str__(self):
         return f"Status for {self.student.name}"
+
+def student_satellites(student):
+    """The unsaved satellite rows of a newly enrolled ``student``, copied from its columns."""
+    return [
+        StudentProfile(
+            student=student, name=student.name, email=student.email, phone=student.phone,
+            address=student.address, enrollment_date=student.enrollment_date,
+        ),
+        EnrollmentDetail(
+            student=student, type=student.type, category=student.category,
+            program=student.program, level=student.level,
+        ),
+        AttendanceParticipation(student=student),
+        PerformanceGrades(student=student),
+        ActivitiesAchievements(student=student),
+        FeedbackEvaluation(student=student),
+        StatusRecommendations(student=student, current_status=student.current_status),
+    ]
+
+class DashboardSnapshot(models.Model):
+    """
+    Single-row read model holding the dashboard counters and financial totals.
+    Kept current by the signal handlers below so the dashboard never has to
+    count or sum the underlying tables.
+    """
+    SINGLETON_ID = 1
+
+    total_students = models.IntegerField(default=0)
+    iot_students = models.IntegerField(default=0)
+    sod_students = models.IntegerField(default=0)
+    total_employees = models.IntegerField(default=0)
+    total_salaries = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    transport_expenses = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    other_expenses = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Dashboard snapshot at {self.updated_at}"
+
+    @property
+    def total_expenses(self):
+        return self.total_salaries + self.transport_expenses + self.other_expenses
+
+    @classmethod
+    def load(cls):
+        snapshot = cls.objects.filter(pk=cls.SINGLETON_ID).first()
+        if snapshot is None:
+            snapshot = cls.rebuild()
+        return snapshot
+
+    @classmethod
+    def rebuild(cls):
+        """Recompute every counter from the source tables."""
+        student_counts = Student.objects.aggregate(
+            total=Count('id'),
+            iot=Count('id', filter=Q(program=Student.IOT)),
+            sod=Count('id', filter=Q(program=Student.SOD)),
+        )
+        employee_totals = Employee.objects.aggregate(total=Count('id'), salaries=Sum('salary'))
+        expense_totals = Expense.objects.aggregate(
+            transport=Sum('amount', filter=Q(type=Expense.TRANSPORT)),
+            other=Sum('amount', filter=Q(type=Expense.OTHER)),
+        )
+        snapshot, created = cls.objects.update_or_create(
+            pk=cls.SINGLETON_ID,
+            defaults={
+                'total_students': student_counts['total'],
+                'iot_students': student_counts['iot'],
+                'sod_students': student_counts['sod'],
+                'total_employees': employee_totals['total'],
+                'total_salaries': employee_totals['salaries'] or 0,
+                'transport_expenses': expense_totals['transport'] or 0,
+                'other_expenses': expense_totals['other'] or 0,
+            },
+        )
+        return snapshot
+
+    @classmethod
+    def apply_delta(cls, **deltas):
+        deltas = {field: value for field, value in deltas.items() if value}
+        if not deltas:
+            return
+        updated = cls.objects.filter(pk=cls.SINGLETON_ID).update(
+            updated_at=timezone.now(),
+            **{field: F(field) + value for field, value in deltas.items()}
+        )
+        if not updated:
+            # No snapshot yet: build it from the tables, which already include this change.
+            cls.rebuild()
+
+def _to_decimal(value):
+    return Decimal(str(value)) if value not in (None, '') else Decimal('0')
+
+def _student_counters(program):
+    return {
+        'total_students': 1,
+        'iot_students': 1 if program == Student.IOT else 0,
+        'sod_students': 1 if program == Student.SOD else 0,
+    }
+
+def _expense_counters(type_, amount):
+    amount = _to_decimal(amount)
+    return {
+        'transport_expenses': amount if type_ == Expense.TRANSPORT else 0,
+        'other_expenses': amount if type_ == Expense.OTHER else 0,
+    }
+
+def _diff(new, old):
+    return {field: new.get(field, 0) - old.get(field, 0) for field in set(new) | set(old)}
+
+def _negate(counters):
+    return {field: -value for field, value in counters.items()}
+
+@receiver(pre_save, sender=Student)
+@receiver(pre_save, sender=Employee)
+@receiver(pre_save, sender=Expense)
+def remember_snapshot_fields(sender, instance, raw=False, **kwargs):
+    """Stash the stored values the snapshot depends on so post_save can apply a diff."""
+    instance._snapshot_previous = None
+    if raw or instance.pk is None:
+        return
+    fields = {
+        Student: ('program',),
+        Employee: ('salary',),
+        Expense: ('type', 'amount'),
+    }[sender]
+    instance._snapshot_previous = sender.objects.filter(pk=instance.pk).values(*fields).first()
+
+@receiver(post_save, sender=Student)
+def update_snapshot_on_student_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_snapshot_previous', None)
+    new = _student_counters(instance.program)
+    if previous is None:
+        DashboardSnapshot.apply_delta(**new)
+    else:
+        DashboardSnapshot.apply_delta(**_diff(new, _student_counters(previous['program'])))
+
+@receiver(post_delete, sender=Student)
+def update_snapshot_on_student_delete(sender, instance, **kwargs):
+    if instance.is_deleted:
+        return
+    DashboardSnapshot.apply_delta(**_negate(_student_counters(instance.program)))
+
+@receiver(post_save, sender=Employee)
+def update_snapshot_on_employee_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_snapshot_previous', None)
+    salary = _to_decimal(instance.salary)
+    if previous is None:
+        DashboardSnapshot.apply_delta(total_employees=1, total_salaries=salary)
+    else:
+        DashboardSnapshot.apply_delta(total_salaries=salary - _to_decimal(previous['salary']))
+
+@receiver(post_delete, sender=Employee)
+def update_snapshot_on_employee_delete(sender, instance, **kwargs):
+    if instance.is_deleted:
+        return
+    DashboardSnapshot.apply_delta(total_employees=-1, total_salaries=-_to_decimal(instance.salary))
+
+@receiver(post_save, sender=Expense)
+def update_snapshot_on_expense_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_snapshot_previous', None)
+    new = _expense_counters(instance.type, instance.amount)
+    if previous is None:
+        DashboardSnapshot.apply_delta(**new)
+    else:
+        DashboardSnapshot.apply_delta(**_diff(new, _expense_counters(previous['type'], previous['amount'])))
+
+@receiver(post_delete, sender=Expense)
+def update_snapshot_on_expense_delete(sender, instance, **kwargs):
+    if instance.is_deleted:
+        return
+    DashboardSnapshot.apply_delta(**_negate(_expense_counters(instance.type, instance.amount)))
+
+def _trashable_counters(model, pks):
+    """Snapshot counters of the ``model`` rows ``pks``, trashed or not."""
+    rows = model.all_objects.filter(pk__in=pks)
+    if model is Student:
+        counts = rows.aggregate(
+            total=Count('id'),
+            iot=Count('id', filter=Q(program=Student.IOT)),
+            sod=Count('id', filter=Q(program=Student.SOD)),
+        )
+        return {'total_students': counts['total'], 'iot_students': counts['iot'], 'sod_students': counts['sod']}
+    if model is Employee:
+        totals = rows.aggregate(total=Count('id'), salaries=Sum('salary'))
+        return {'total_employees': totals['total'], 'total_salaries': totals['salaries'] or 0}
+    totals = rows.aggregate(
+        transport=Sum('amount', filter=Q(type=Expense.TRANSPORT)),
+        other=Sum('amount', filter=Q(type=Expense.OTHER)),
+    )
+    return {'transport_expenses': totals['transport'] or 0, 'other_expenses': totals['other'] or 0}
+
+@receiver(rows_trashed, sender=Student)
+@receiver(rows_trashed, sender=Employee)
+@receiver(rows_trashed, sender=Expense)
+def update_snapshot_on_trash(sender, pks, **kwargs):
+    DashboardSnapshot.apply_delta(**_negate(_trashable_counters(sender, pks)))
+
+@receiver(rows_restored, sender=Student)
+@receiver(rows_restored, sender=Employee)
+@receiver(rows_restored, sender=Expense)
+def update_snapshot_on_restore(sender, pks, **kwargs):
+    DashboardSnapshot.apply_delta(**_trashable_counters(sender, pks))
+
+class LedgerRollup(models.Model):
+    """
+    Count and amount total of Transaction or Expense rows per (bucket, type),
+    maintained incrementally by admin_panel.ledger.
+    """
+    TRANSACTION = 'transaction'
+    EXPENSE = 'expense'
+    SOURCE_CHOICES = [
+        (TRANSACTION, 'Transaction'),
+        (EXPENSE, 'Expense'),
+    ]
+
+    bucket = models.DateField()
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    type = models.CharField(max_length=20, choices=Transaction.TYPE_CHOICES)
+    count = models.IntegerField(default=0)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return f"{self.bucket} {self.source} {self.type}: {self.count} / {self.total}"
+
+class LedgerDailyRollup(LedgerRollup):
+    """One row per day, source and type."""
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['bucket', 'source', 'type'], name='unique_ledger_daily_rollup'),
+        ]
+
+class LedgerMonthlyRollup(LedgerRollup):
+    """One row per month (bucket is the first day of the month), source and type."""
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['bucket', 'source', 'type'], name='unique_ledger_monthly_rollup'),
+        ]
+
+class IdentifierSequence(models.Model):
+    """
+    Named counter for human-readable identifiers. ``allocate`` reserves a
+    contiguous block in one UPDATE, so bulk inserts never retry on collisions.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    next_value = models.PositiveBigIntegerField(default=1)
+
+    def __str__(self):
+        return f"{self.name}: next {self.next_value}"
+
+    @classmethod
+    def allocate(cls, name, count=1):
+        """Reserve ``count`` values of sequence ``name`` and return them as a range."""
+        with transaction.atomic():
+            updated = cls.objects.filter(name=name).update(next_value=F('next_value') + count)
+            if not updated:
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(name=name, next_value=1 + count)
+                except IntegrityError:
+                    # Created concurrently; reserve on top of it
+                    cls.objects.filter(name=name).update(next_value=F('next_value') + count)
+            end = cls.objects.filter(name=name).values_list('next_value', flat=True).get()
+        return range(end - count, end)
+
+    @classmethod
+    def reserve_through(cls, name, value):
+        """Make sure sequence ``name`` never hands out ``value`` or anything below it."""
+        with transaction.atomic():
+            cls.allocate(name, 0)
+            cls.objects.filter(name=name, next_value__lte=value).update(next_value=value + 1)
+
+STUDENT_ID_SEQUENCE = 'student_id'
+# Hex uuid prefixes (the legacy format) never contain 'S', so allocated IDs cannot collide with them
+STUDENT_ID_PREFIX = 'STU'
+
+STUDENT_ID_PATTERN = re.compile(rf'{STUDENT_ID_PREFIX}(\d+)')
+
+def allocate_student_ids(count):
+    return [f"{STUDENT_ID_PREFIX}{value:06d}" for value in IdentifierSequence.allocate(STUDENT_ID_SEQUENCE, count)]
+
+def reserve_student_ids(student_ids):
+    """
+    Advance the student ID sequence past any of ``student_ids`` (e.g. from an
+    import) that fall in the allocated STU###### range, so allocate_student_ids
+    can never hand them out again.
+    """
+    values = [int(match[1]) for match in map(STUDENT_ID_PATTERN.fullmatch, student_ids) if match]
+    if values:
+        IdentifierSequence.reserve_through(STUDENT_ID_SEQUENCE, max(values))
+
+def job_result_storage():
+    return FileSystemStorage(location=settings.JOB_RESULTS_ROOT)
+
+def job_result_path(instance, filename):
+    # Unguessable, so a leaked or listed path gives nothing away; the download name is kept in result_name
+    return f"{timezone.now():%Y/%m}/{uuid.uuid4().hex}{os.path.splitext(filename)[1]}"
+
+class BackgroundJob(models.Model):
+    """
+    A report export or email queued by a view and run by the ``run_jobs``
+    worker. ``kind`` names a handler registered in admin_panel.jobs.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='background_jobs')
+    kind = models.CharField(max_length=50)
+    params = JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    result = models.FileField(upload_to=job_result_path, storage=job_result_storage, blank=True)
+    result_name = models.CharField(max_length=255, blank=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Refreshed by the worker while the job runs; a RUNNING job whose heartbeat stops has lost its worker
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id'], name='job_status_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+class OutboxMessage(models.Model):
+    """An email rendered once and queued for any number of recipients (see admin_panel.outbox)."""
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='outbox_messages')
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    content_subtype = models.CharField(max_length=20, default='html')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.subject
+
+class OutboxDelivery(models.Model):
+    """Delivery of an OutboxMessage to one recipient, retried with backoff until sent or failed."""
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENDING, 'Sending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    ]
+
+    message = models.ForeignKey(OutboxMessage, on_delete=models.CASCADE, related_name='deliveries')
+    recipient = models.EmailField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at', 'id'], name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient}: {self.message} ({self.status})"
@@ -0,0 +1,186 @@
+"""
+Email outbox for the report emails.
+
+``queue_email`` stores the rendered subject and body once as an
+OutboxMessage and adds one OutboxDelivery row per recipient, so a request
+never waits on SMTP and a report mailed to many people is rendered only
+once. ``send_due`` drains due deliveries in batches over a single connection
+from ``get_connection()``. A failed delivery is retried with exponential
+backoff until OUTBOX_MAX_ATTEMPTS. Any EMAIL_BACKEND works, including
+locmem and console.
+"""
+import datetime
+from collections import namedtuple
+
+from django.core.exceptions import ValidationError
+from django.core.mail import EmailMessage, get_connection
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Count, F
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import OutboxDelivery, OutboxMessage, Transaction
+
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_BACKOFF_BASE = datetime.timedelta(minutes=1)
+OUTBOX_BACKOFF_MAX = datetime.timedelta(hours=6)
+# A SENDING delivery older than this belongs to a sender that died mid-batch
+OUTBOX_STALE_AFTER = datetime.timedelta(minutes=15)
+
+SendResult = namedtuple('SendResult', ['sent', 'retrying', 'failed'])
+
+
+def parse_recipients(value):
+    """
+    Split a comma/semicolon separated string (or a list) of addresses into
+    (valid addresses without duplicates, invalid addresses).
+    """
+    if isinstance(value, str):
+        value = value.replace(';', ',').split(',')
+    valid, invalid = [], []
+    seen = set()
+    for address in value or []:
+        address = str(address).strip()
+        if not address:
+            continue
+        try:
+            validate_email(address)
+        except ValidationError:
+            invalid.append(address)
+            continue
+        if address.lower() not in seen:
+            seen.add(address.lower())
+            valid.append(address)
+    return valid, invalid
+
+
+def queue_email(subject, body, recipients, user=None, content_subtype='html'):
+    """Queue one message for every address in ``recipients``. Returns the OutboxMessage."""
+    with transaction.atomic():
+        message = OutboxMessage.objects.create(user=user, subject=subject, body=body, content_subtype=content_subtype)
+        OutboxDelivery.objects.bulk_create(
+            [OutboxDelivery(message=message, recipient=recipient) for recipient in recipients],
+            batch_size=OUTBOX_BATCH_SIZE,
+        )
+    return message
+
+
+def student_report_email(student):
+    """(subject, body) of the student report email."""
+    context = {'student': student, 'now': timezone.now()}
+    return f"Student Report: {student.name}", render_to_string('admin_panel/email_student_report.html', context)
+
+
+def employee_report_email(employee):
+    context = {'employee': employee, 'now': timezone.now()}
+    return f"Employee Report: {employee.name}", render_to_string('admin_panel/email_employment_report.html', context)
+
+
+def financial_report_email(financial):
+    context = dict(
+        financial.as_dict(),
+        now=timezone.now(),
+        recent_transactions=Transaction.objects.order_by('-date', '-id')[:10],
+    )
+    return "Financial Report", render_to_string('admin_panel/email_financial_report.html', context)
+
+
+def backoff(attempts):
+    """Delay before retrying a delivery that has failed ``attempts`` times."""
+    return min(OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1), OUTBOX_BACKOFF_MAX)
+
+
+def _requeue_stale(now):
+    return OutboxDelivery.objects.filter(
+        status=OutboxDelivery.SENDING, next_attempt_at__lt=now - OUTBOX_STALE_AFTER,
+    ).update(status=OutboxDelivery.PENDING)
+
+
+def _claim(batch_size, now):
+    due = OutboxDelivery.objects.filter(status=OutboxDelivery.PENDING, next_attempt_at__lte=now)
+    ids = list(due.order_by('next_attempt_at', 'id').values_list('id', flat=True)[:batch_size])
+    if not ids:
+        return []
+    # The claim time doubles as a marker, so concurrent senders only pick up rows they flipped themselves
+    OutboxDelivery.objects.filter(id__in=ids, status=OutboxDelivery.PENDING).update(
+        status=OutboxDelivery.SENDING, attempts=F('attempts') + 1, next_attempt_at=now,
+    )
+    return list(OutboxDelivery.objects.filter(
+        id__in=ids, status=OutboxDelivery.SENDING, next_attempt_at=now,
+    ).select_related('message').order_by('id'))
+
+
+def _email(delivery, connection):
+    email = EmailMessage(delivery.message.subject, delivery.message.body, to=[delivery.recipient],
+                         connection=connection)
+    email.content_subtype = delivery.message.content_subtype
+    return email
+
+
+def send_due(batch_size=OUTBOX_BATCH_SIZE, connection=None, now=None):
+    """
+    Send up to ``batch_size`` due deliveries over one backend connection and
+    return a SendResult. Each message is handed to the open connection on its
+    own, so a rejected address only affects its own delivery.
+    """
+    now = now or timezone.now()
+    _requeue_stale(now)
+    claimed = _claim(batch_size, now)
+    if not claimed:
+        return SendResult(0, 0, 0)
+
+    connection = connection or get_connection()
+    sent = []
+    errors = {}
+    try:
+        connection.open()
+    except Exception as e:
+        errors = {delivery.id: f"{type(e).__name__}: {e}" for delivery in claimed}
+    else:
+        try:
+            for delivery in claimed:
+                try:
+                    if connection.send_messages([_email(delivery, connection)]):
+                        sent.append(delivery.id)
+                    else:
+                        errors[delivery.id] = "Not accepted by the mail backend"
+                except Exception as e:
+                    errors[delivery.id] = f"{type(e).__name__}: {e}"
+        finally:
+            connection.close()
+
+    OutboxDelivery.objects.filter(id__in=sent).update(status=OutboxDelivery.SENT, sent_at=timezone.now(), last_error='')
+    retrying = failed = 0
+    for delivery in claimed:
+        if delivery.id not in errors:
+            continue
+        if delivery.attempts >= OUTBOX_MAX_ATTEMPTS:
+            status, next_attempt_at = OutboxDelivery.FAILED, delivery.next_attempt_at
+            failed += 1
+        else:
+            status, next_attempt_at = OutboxDelivery.PENDING, now + backoff(delivery.attempts)
+            retrying += 1
+        OutboxDelivery.objects.filter(id=delivery.id).update(
+            status=status, next_attempt_at=next_attempt_at, last_error=errors[delivery.id],
+        )
+    return SendResult(len(sent), retrying, failed)
+
+
+def drain(batch_size=OUTBOX_BATCH_SIZE, connection=None):
+    """Send batches until nothing is due. Returns the summed SendResult."""
+    totals = SendResult(0, 0, 0)
+    while True:
+        result = send_due(batch_size, connection)
+        if result == (0, 0, 0):
+            return totals
+        totals = SendResult(*(total + count for total, count in zip(totals, result)))
+
+
+def delivery_counts(message):
+    """Deliveries of ``message`` per status."""
+    counts = {status: 0 for status, _ in OutboxDelivery.STATUS_CHOICES}
+    for row in message.deliveries.order_by().values('status').annotate(count=Count('id')):
+        counts[row['status']] = row['count']
+    return counts
@@ -0,0 +1,111 @@
+"""
+Keyset (seek) pagination helpers shared by the JSON list endpoints.
+
+Pages are ordered by (sort field, id) and the opaque cursor carries the last
+row's pair, so fetching page N costs the same as fetching page 1 no matter
+how large the table grows.
+"""
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # DjangoJSONEncoder truncates datetimes to milliseconds, which would make
+        # the cursor compare unequal to the stored value and repeat rows.
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values):
+    raw = json.dumps(list(values), cls=_CursorEncoder).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, fields=None):
+    """
+    The values stored in ``cursor``. With ``fields`` (one model field per
+    value) each value is converted with the field's ``to_python()``, so a
+    cursor holding a value of the wrong type raises InvalidCursor here rather
+    than failing when the page is queried.
+    """
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, binascii.Error):
+        raise InvalidCursor(f"Malformed cursor: {cursor!r}")
+    if not isinstance(values, list) or len(values) != 2:
+        raise InvalidCursor(f"Malformed cursor: {cursor!r}")
+    if fields is not None:
+        try:
+            values = [field.to_python(value) for field, value in zip(fields, values)]
+        except (ValidationError, TypeError, ValueError):
+            raise InvalidCursor(f"Malformed cursor: {cursor!r}")
+        if any(value is None or isinstance(value, (list, dict)) for value in values):
+            raise InvalidCursor(f"Malformed cursor: {cursor!r}")
+    return values
+
+
+def get_page_size(request, default=DEFAULT_PAGE_SIZE):
+    try:
+        page_size = int(request.GET.get('page_size', default))
+    except (TypeError, ValueError):
+        page_size = default
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def _cursor_field(queryset, name):
+    """The model field, or the annotation's output field, that ``queryset`` orders by as ``name``."""
+    annotation = queryset.query.annotations.get(name)
+    if annotation is not None:
+        return annotation.output_field
+    return queryset.model._meta.get_field(name)
+
+
+def _row_value(row, field):
+    if isinstance(row, dict):
+        return row[field]
+    return getattr(row, field)
+
+
+def keyset_page(queryset, sort_field, descending=False, cursor=None, page_size=DEFAULT_PAGE_SIZE, tiebreaker='id'):
+    """
+    Return ``(rows, next_cursor)`` for one page of ``queryset`` ordered by
+    ``(sort_field, tiebreaker)``. Works with model and ``values()`` querysets
+    as long as both fields are present on every row. ``next_cursor`` is None
+    on the last page.
+    """
+    direction = '-' if descending else ''
+    lookup = 'lt' if descending else 'gt'
+    queryset = queryset.order_by(f'{direction}{sort_field}', f'{direction}{tiebreaker}')
+
+    if cursor:
+        last_value, last_id = decode_cursor(
+            cursor, [_cursor_field(queryset, sort_field), _cursor_field(queryset, tiebreaker)],
+        )
+        queryset = queryset.filter(
+            Q(**{f'{sort_field}__{lookup}': last_value}) |
+            Q(**{sort_field: last_value, f'{tiebreaker}__{lookup}': last_id})
+        )
+
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor([_row_value(last, sort_field), _row_value(last, tiebreaker)])
+    return rows, next_cursor
@@ -0,0 +1,161 @@
+"""
+Declarative multi-page PDF layout on top of reportlab's platypus.
+
+A document is a title plus a list of sections: FieldList (label/value
+pairs), TextBlock (free text under a heading) and DataTable (a header row
+plus any number of data rows). ``build_pdf`` flows them through a
+SimpleDocTemplate, which paginates automatically. Long text continues on the
+next page, and tables repeat their header row on every page they span.
+
+Paragraph and table styles are built once per process and shared by every
+render. Table columns get fixed widths, so reportlab never measures a whole
+column to size it. Long tables are emitted as TABLE_CHUNK_ROWS-row slices,
+so splitting them across pages stays linear in the row count.
+"""
+import io
+from collections import namedtuple
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+PAGE_SIZE = letter
+MARGIN = 0.75 * inch
+FRAME_WIDTH = PAGE_SIZE[0] - 2 * MARGIN
+CELL_PADDING = 6
+TABLE_FONT = 'Helvetica'
+TABLE_FONT_SIZE = 9
+TABLE_CHUNK_ROWS = 200
+FIELD_LABEL_WIDTH = 0.3
+
+FieldList = namedtuple('FieldList', ['heading', 'fields'])
+TextBlock = namedtuple('TextBlock', ['heading', 'text'])
+# ``widths`` are fractions of the frame width, one per column; equal by default
+DataTable = namedtuple('DataTable', ['heading', 'columns', 'rows', 'widths'], defaults=[None])
+RenderedPdf = namedtuple('RenderedPdf', ['content', 'pages'])
+
+
+@lru_cache(maxsize=None)
+def styles():
+    sheet = getSampleStyleSheet()
+    return {
+        'title': sheet['Title'],
+        'heading': sheet['Heading2'],
+        'body': sheet['BodyText'],
+        'cell': ParagraphStyle('ReportCell', parent=sheet['BodyText'], fontName=TABLE_FONT,
+                               fontSize=TABLE_FONT_SIZE, leading=TABLE_FONT_SIZE + 2),
+        'label': ParagraphStyle('ReportLabel', parent=sheet['BodyText'], fontName='Helvetica-Bold'),
+    }
+
+
+@lru_cache(maxsize=None)
+def table_styles():
+    grid = [
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('FONT', (0, 0), (-1, -1), TABLE_FONT, TABLE_FONT_SIZE),
+    ]
+    return {
+        'fields': TableStyle(grid + [
+            ('FONT', (0, 0), (0, -1), 'Helvetica-Bold', TABLE_FONT_SIZE),
+            ('BACKGROUND', (0, 0), (0, -1), colors.whitesmoke),
+        ]),
+        'data': TableStyle(grid + [
+            ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold', TABLE_FONT_SIZE),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ]),
+    }
+
+
+def _text(value):
+    return '' if value is None else str(value)
+
+
+def _paragraph(text, style):
+    # Paragraph markup is XML-like; keep line breaks from multi-line text fields
+    return Paragraph(escape(text).replace('\n', '<br/>'), style)
+
+
+def _cell(value, width):
+    """Plain strings are cheapest to lay out; only text too wide for its column is wrapped."""
+    text = _text(value)
+    if '\n' in text or stringWidth(text, TABLE_FONT, TABLE_FONT_SIZE) > width - 2 * CELL_PADDING:
+        return _paragraph(text, styles()['cell'])
+    return text
+
+
+def _field_list(section):
+    widths = [FRAME_WIDTH * FIELD_LABEL_WIDTH, FRAME_WIDTH * (1 - FIELD_LABEL_WIDTH)]
+    rows = [[_cell(label, widths[0]), _cell(value, widths[1])] for label, value in section.fields]
+    if not rows:
+        return []
+    return [Table(rows, colWidths=widths, style=table_styles()['fields'])]
+
+
+def _text_block(section):
+    text = _text(section.text).strip()
+    return [_paragraph(text or '-', styles()['body'])]
+
+
+def _data_table(section):
+    fractions = section.widths or [1 / len(section.columns)] * len(section.columns)
+    widths = [FRAME_WIDTH * fraction for fraction in fractions]
+    header = [_text(column) for column in section.columns]
+    flowables = []
+    chunk = []
+
+    def flush():
+        flowables.append(Table([header] + chunk, colWidths=widths, repeatRows=1, style=table_styles()['data']))
+
+    for row in section.rows:
+        chunk.append([_cell(value, width) for value, width in zip(row, widths)])
+        if len(chunk) == TABLE_CHUNK_ROWS:
+            flush()
+            chunk = []
+    if chunk or not flowables:
+        flush()
+    return flowables
+
+
+SECTION_BUILDERS = {
+    FieldList: _field_list,
+    TextBlock: _text_block,
+    DataTable: _data_table,
+}
+
+
+def _footer(title):
+    def draw(canvas, doc):
+        canvas.saveState()
+        canvas.setFont('Helvetica', 8)
+        canvas.drawString(MARGIN, MARGIN / 2, title)
+        canvas.drawRightString(PAGE_SIZE[0] - MARGIN, MARGIN / 2, f"Page {doc.page}")
+        canvas.restoreState()
+    return draw
+
+
+def build_pdf(title, sections):
+    """Lay out ``sections`` under ``title`` and return a RenderedPdf (bytes and page count)."""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer, pagesize=PAGE_SIZE, title=title,
+        leftMargin=MARGIN, rightMargin=MARGIN, topMargin=MARGIN, bottomMargin=MARGIN,
+    )
+    story = [Paragraph(escape(title), styles()['title'])]
+    for section in sections:
+        if section.heading:
+            story.append(Paragraph(escape(section.heading), styles()['heading']))
+        story.extend(SECTION_BUILDERS[type(section)](section))
+        story.append(Spacer(1, 6))
+    footer = _footer(title)
+    doc.build(story, onFirstPage=footer, onLaterPages=footer)
+    return RenderedPdf(buffer.getvalue(), doc.page)
+
+
+def render_pdf(title, sections):
+    return build_pdf(title, sections).content
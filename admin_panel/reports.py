@@ -0,0 +1,242 @@
+"""
+Rendering of the student, employee and financial reports to PDF and XLSX.
+
+The PDFs are declared as sections for admin_panel.report_layout, which
+paginates them. The renderers take plain dicts or already loaded objects and
+return the file contents as bytes. They never query the database, so the
+views, the background job handlers and the batch exports' worker processes
+all share them.
+"""
+import datetime
+import io
+
+import openpyxl
+from django.utils.text import get_valid_filename
+
+from .report_layout import DataTable, FieldList, TextBlock, render_pdf
+
+# Part of the artifact cache key; bump it whenever a renderer's output changes
+RENDER_VERSION = 2
+
+PDF_CONTENT_TYPE = 'application/pdf'
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+STUDENT_PROFILE_FIELDS = [
+    ('Student ID', 'student_id'),
+    ('Email', 'email'),
+    ('Phone', 'phone'),
+    ('Address', 'address'),
+    ('Enrollment Date', 'enrollment_date'),
+    ('Type', 'type'),
+    ('Category', 'category'),
+    ('Program', 'program'),
+    ('Level', 'level'),
+    ('Current Status', 'current_status'),
+]
+STUDENT_PROGRESS_FIELDS = [
+    ('Total Sessions', 'total_sessions'),
+    ('Attended Sessions', 'attended_sessions'),
+    ('Absences', 'absences'),
+    ('Participation Score', 'participation_score'),
+    ('Average Scores', 'avg_scores'),
+    ('Project Completion Rate', 'project_completion_rate'),
+    ('Graduation Eligibility', 'graduation_eligibility'),
+]
+STUDENT_TEXT_FIELDS = [
+    ('Certifications', 'certifications'),
+    ('Hackathons Attended', 'hackathons_attended'),
+    ('Awards', 'awards'),
+    ('Contributions', 'contributions'),
+    ('Mentor Comments', 'mentor_comments'),
+    ('Peer Reviews', 'peer_reviews'),
+    ('Strengths', 'strengths'),
+    ('Areas for Improvement', 'areas_for_improvement'),
+    ('Next Steps', 'next_steps'),
+]
+STUDENT_REPORT_FIELDS = ('id', 'name') + tuple(
+    name for _, name in STUDENT_PROFILE_FIELDS + STUDENT_PROGRESS_FIELDS + STUDENT_TEXT_FIELDS
+)
+
+EMPLOYEE_PERSONAL_FIELDS = [
+    ('Employee ID', 'employee_id'),
+    ('Email', 'email'),
+    ('Phone', 'phone'),
+    ('Date of Birth', 'date_of_birth'),
+    ('Street', 'address_street'),
+    ('City', 'address_city'),
+    ('State', 'address_state'),
+    ('ZIP', 'address_zip'),
+    ('Emergency Contact', 'emergency_contact_name'),
+    ('Emergency Phone', 'emergency_contact_phone'),
+]
+EMPLOYEE_EMPLOYMENT_FIELDS = [
+    ('Position', 'position'),
+    ('Department', 'department'),
+    ('Hire Date', 'hire_date'),
+    ('Employment Status', 'employment_status'),
+    ('Employee Type', 'employee_type'),
+    ('Work Schedule', 'work_schedule'),
+    ('Contract End Date', 'contract_end_date'),
+    ('Probation Status', 'probation_period_status'),
+    ('Current Status', 'current_status'),
+]
+EMPLOYEE_PROFESSIONAL_FIELDS = [
+    ('Salary', 'salary'),
+    ('Salary Range', 'salary_range'),
+    ('Education Level', 'education_level'),
+    ('Years of Experience', 'years_of_experience'),
+    ('Performance Rating', 'performance_rating'),
+    ('Access Permissions', 'access_permissions'),
+]
+EMPLOYEE_TEXT_FIELDS = [
+    ('Skills', 'skills'),
+    ('Certifications', 'certifications'),
+    ('Previous Work History', 'previous_work_history'),
+    ('Training Records', 'training_records'),
+    ('Notes', 'notes'),
+]
+
+LEDGER_COLUMNS = ['Date', 'Type', 'Description', 'Amount']
+LEDGER_COLUMN_WIDTHS = [0.15, 0.15, 0.52, 0.18]
+
+
+def display_value(instance, name):
+    """``instance.name`` as report text: choice labels, ISO dates, Yes/No and '' for None."""
+    display = getattr(instance, f'get_{name}_display', None)
+    value = display() if display else getattr(instance, name)
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'Yes' if value else 'No'
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.strftime('%Y-%m-%d')
+    return str(value)
+
+
+def _fields(data, fields):
+    return [(label, data[name]) for label, name in fields]
+
+
+def _xlsx(title, rows):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = title
+
+    ws.append(["Field", "Value"])
+    for row in rows:
+        ws.append(row)
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def student_report_data(student):
+    """The STUDENT_REPORT_FIELDS of a Student instance as a dict of report text."""
+    return {name: display_value(student, name) for name in STUDENT_REPORT_FIELDS}
+
+
+def student_report_sections(student):
+    return [
+        FieldList('Profile', _fields(student, STUDENT_PROFILE_FIELDS)),
+        FieldList('Attendance & Performance', _fields(student, STUDENT_PROGRESS_FIELDS)),
+        *(TextBlock(label, student[name]) for label, name in STUDENT_TEXT_FIELDS),
+    ]
+
+
+def render_student_report(student):
+    """Render the report of ``student`` (see student_report_data) to PDF bytes."""
+    return render_pdf(f"Student Report: {student['name']}", student_report_sections(student))
+
+
+def render_student_report_entry(student):
+    """
+    (archive file name, PDF bytes) of a student_report_data dict. Runs in the
+    batch export's worker processes, which import this module without Django
+    being set up.
+    """
+    name = get_valid_filename(f"{student['id']}_{student['name']}_report.pdf")
+    return name, render_student_report(student)
+
+
+def render_student_report_xlsx(student):
+    return _xlsx("Student Report", [
+        ["Name", student.name],
+        ["Student ID", student.student_id],
+        ["Email", student.email],
+        ["Phone", student.phone],
+        ["Address", student.address],
+        ["Enrollment Date", student.enrollment_date.strftime("%Y-%m-%d")],
+        ["Type", student.get_type_display()],
+        ["Category", student.category],
+        ["Program", student.get_program_display()],
+        ["Level", student.level],
+        ["Total Sessions", student.total_sessions],
+        ["Attended Sessions", student.attended_sessions],
+        ["Absences", student.absences],
+        ["Participation Score", float(student.participation_score)],
+        ["Average Scores", float(student.avg_scores)],
+        ["Project Completion Rate", float(student.project_completion_rate)],
+        ["Certifications", student.certifications],
+        ["Hackathons Attended", student.hackathons_attended],
+        ["Awards", student.awards],
+        ["Contributions", student.contributions],
+        ["Mentor Comments", student.mentor_comments],
+        ["Peer Reviews", student.peer_reviews],
+        ["Strengths", student.strengths],
+        ["Areas for Improvement", student.areas_for_improvement],
+        ["Current Status", student.get_current_status_display()],
+        ["Next Steps", student.next_steps],
+        ["Graduation Eligibility", "Yes" if student.graduation_eligibility else "No"],
+    ])
+
+
+def render_employee_report(employee):
+    def fields(spec):
+        return [(label, display_value(employee, name)) for label, name in spec]
+    return render_pdf(f"Employee Report: {employee.name}", [
+        FieldList('Personal Information', fields(EMPLOYEE_PERSONAL_FIELDS)),
+        FieldList('Employment', fields(EMPLOYEE_EMPLOYMENT_FIELDS)),
+        FieldList('Professional & Compensation', fields(EMPLOYEE_PROFESSIONAL_FIELDS)),
+        *(TextBlock(label, display_value(employee, name)) for label, name in EMPLOYEE_TEXT_FIELDS),
+    ])
+
+
+def render_employee_report_xlsx(employee):
+    return _xlsx("Employee Report", [
+        ["Name", employee.name],
+        ["Position", employee.position],
+        ["Department", employee.department],
+        ["Salary", str(employee.salary)],
+    ])
+
+
+def financial_report_sections(financial, transactions=(), expenses=()):
+    """
+    A FinancialSummary followed by complete ledger tables. ``transactions``
+    and ``expenses`` are iterables of (date, type label, description, amount)
+    rows.
+    """
+    return [
+        FieldList('Summary', [
+            ('Total Salaries', f"${financial.total_salaries}"),
+            ('Transport Expenses', f"${financial.transport_expenses}"),
+            ('Other Expenses', f"${financial.other_expenses}"),
+            ('Total Expenses', f"${financial.total_expenses}"),
+        ]),
+        DataTable('Transactions', LEDGER_COLUMNS, transactions, LEDGER_COLUMN_WIDTHS),
+        DataTable('Expenses', LEDGER_COLUMNS, expenses, LEDGER_COLUMN_WIDTHS),
+    ]
+
+
+def render_financial_report(financial, transactions=(), expenses=()):
+    return render_pdf("Financial Report", financial_report_sections(financial, transactions, expenses))
+
+
+def render_financial_report_xlsx(financial):
+    return _xlsx("Financial Report", [
+        ["Total Salaries", str(financial.total_salaries)],
+        ["Transport Expenses", str(financial.transport_expenses)],
+        ["Other Expenses", str(financial.other_expenses)],
+        ["Total Expenses", str(financial.total_expenses)],
+    ])
@@ -0,0 +1,200 @@
+"""
+Full-text search across students, employees and expenses.
+
+Each searchable row is mirrored into a SearchDocument by the signal handlers
+below. On SQLite an FTS5 table (created by migration 0011 and kept in sync by
+SQL triggers) indexes those documents and results are ranked with bm25; on
+other databases, or a SQLite build without FTS5, a plain icontains scan over
+the single SearchDocument table is used instead.
+"""
+import re
+from collections import namedtuple
+
+from django.db import connection
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Student, Employee, Expense, SearchDocument
+from .softdelete import rows_restored, rows_trashed
+
+FTS_TABLE = 'admin_panel_searchdocument_fts'
+SEARCH_MODELS = {
+    SearchDocument.STUDENT: Student,
+    SearchDocument.EMPLOYEE: Employee,
+    SearchDocument.EXPENSE: Expense,
+}
+
+ENTITY_TYPES = {model: entity_type for entity_type, model in SEARCH_MODELS.items()}
+
+SearchHit = namedtuple('SearchHit', ['entity_type', 'entity_id', 'title', 'obj'])
+
+_fts_available = None
+
+
+def fts_available():
+    global _fts_available
+    if _fts_available is None:
+        if connection.vendor != 'sqlite':
+            _fts_available = False
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+                _fts_available = cursor.fetchone() is not None
+    return _fts_available
+
+
+def _join(*parts):
+    return ' '.join(str(part) for part in parts if part)
+
+
+def build_document(instance):
+    """Return the (entity_type, title, content) to index for a model instance."""
+    if isinstance(instance, Student):
+        return SearchDocument.STUDENT, instance.name, _join(
+            instance.name, instance.student_id, instance.type, instance.get_type_display(),
+            instance.category, instance.program, instance.get_program_display(), instance.level,
+        )
+    if isinstance(instance, Employee):
+        return SearchDocument.EMPLOYEE, instance.full_name, _join(
+            instance.first_name, instance.middle_name, instance.last_name, instance.employee_id,
+            instance.email, instance.position, instance.department,
+        )
+    if isinstance(instance, Expense):
+        return SearchDocument.EXPENSE, instance.description[:200], _join(
+            instance.description, instance.type, instance.get_type_display(),
+        )
+    raise TypeError(f"{type(instance).__name__} is not searchable")
+
+
+def index_instance(instance):
+    entity_type, title, content = build_document(instance)
+    SearchDocument.objects.update_or_create(
+        entity_type=entity_type,
+        entity_id=instance.pk,
+        defaults={'title': title, 'content': content},
+    )
+
+
+def unindex_instance(instance):
+    entity_type = build_document(instance)[0]
+    SearchDocument.objects.filter(entity_type=entity_type, entity_id=instance.pk).delete()
+
+
+def rebuild_index(chunk_size=2000):
+    """Regenerate every SearchDocument from the source tables. Returns the number indexed."""
+    SearchDocument.objects.all().delete()
+    total = 0
+    for model in SEARCH_MODELS.values():
+        batch = []
+        for instance in model.objects.all().iterator(chunk_size=chunk_size):
+            entity_type, title, content = build_document(instance)
+            batch.append(SearchDocument(entity_type=entity_type, entity_id=instance.pk, title=title, content=content))
+            if len(batch) >= chunk_size:
+                SearchDocument.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        SearchDocument.objects.bulk_create(batch)
+        total += len(batch)
+    if fts_available():
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return total
+
+
+def _terms(query):
+    return re.findall(r'\w+', query.lower())
+
+
+def _fts_search(terms, entity_type, limit, offset):
+    # Quote every term and prefix-match it so user input can never be parsed as FTS syntax
+    match = ' '.join(f'"{term}"*' for term in terms)
+    sql = (
+        f"SELECT d.entity_type, d.entity_id, d.title FROM {FTS_TABLE} "
+        f"JOIN admin_panel_searchdocument d ON d.id = {FTS_TABLE}.rowid "
+        f"WHERE {FTS_TABLE} MATCH %s"
+    )
+    params = [match]
+    if entity_type:
+        sql += " AND d.entity_type = %s"
+        params.append(entity_type)
+    # Title matches weigh ten times content matches
+    sql += f" ORDER BY bm25({FTS_TABLE}, 10.0, 1.0) LIMIT %s OFFSET %s"
+    params += [limit, offset]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _fallback_search(terms, entity_type, limit, offset):
+    queryset = SearchDocument.objects.all()
+    for term in terms:
+        queryset = queryset.filter(content__icontains=term)
+    if entity_type:
+        queryset = queryset.filter(entity_type=entity_type)
+    return list(queryset.order_by('title', 'id').values_list('entity_type', 'entity_id', 'title')[offset:offset + limit])
+
+
+def search(query, entity_type=None, page=1, page_size=20):
+    """
+    Return ``(hits, has_next)`` for one page of ranked results. Each hit
+    carries the matching model instance in ``obj``; hits whose row has
+    disappeared since it was indexed are dropped.
+    """
+    terms = _terms(query)
+    if not terms:
+        return [], False
+    offset = (max(page, 1) - 1) * page_size
+    search_rows = _fts_search if fts_available() else _fallback_search
+    rows = search_rows(terms, entity_type, page_size + 1, offset)
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+
+    ids_by_type = {}
+    for row_type, row_id, _ in rows:
+        ids_by_type.setdefault(row_type, []).append(row_id)
+    objects = {
+        row_type: SEARCH_MODELS[row_type].objects.in_bulk(ids)
+        for row_type, ids in ids_by_type.items()
+    }
+    hits = [
+        SearchHit(row_type, row_id, title, objects[row_type][row_id])
+        for row_type, row_id, title in rows
+        if row_id in objects[row_type]
+    ]
+    return hits, has_next
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=Employee)
+@receiver(post_save, sender=Expense)
+def index_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    index_instance(instance)
+
+
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=Employee)
+@receiver(post_delete, sender=Expense)
+def unindex_on_delete(sender, instance, **kwargs):
+    unindex_instance(instance)
+
+
+@receiver(rows_trashed, sender=Student)
+@receiver(rows_trashed, sender=Employee)
+@receiver(rows_trashed, sender=Expense)
+def unindex_on_trash(sender, pks, **kwargs):
+    entity_type = ENTITY_TYPES[sender]
+    SearchDocument.objects.filter(entity_type=entity_type, entity_id__in=pks).delete()
+
+
+@receiver(rows_restored, sender=Student)
+@receiver(rows_restored, sender=Employee)
+@receiver(rows_restored, sender=Expense)
+def index_on_restore(sender, pks, **kwargs):
+    documents = []
+    for instance in sender.objects.filter(pk__in=pks):
+        entity_type, title, content = build_document(instance)
+        documents.append(SearchDocument(entity_type=entity_type, entity_id=instance.pk, title=title, content=content))
+    SearchDocument.objects.filter(entity_type=ENTITY_TYPES[sender], entity_id__in=pks).delete()
+    SearchDocument.objects.bulk_create(documents)
@@ -0,0 +1,86 @@
+"""
+Opt-in soft delete.
+
+A model that subclasses SoftDeleteModel gets a nullable ``deleted_at``
+column. Its default manager, ``objects``, only returns live rows, so views,
+the admin, the dashboard rebuild and the search index skip trashed rows
+without any change. ``all_objects`` sees every row. Related-object access
+goes through the plain base manager, so a trashed row keeps its primary key
+and whatever points to it.
+
+``soft_delete()`` and ``restore()`` on a queryset are each one UPDATE of
+``deleted_at``. Neither sends post_save or post_delete. They send
+``rows_trashed`` / ``rows_restored`` with the affected primary keys instead.
+The dashboard snapshot, the search index, the ledger rollups, the activity
+summary and the cache versions listen to those next to their post_delete
+handlers. A hard ``delete()`` still removes the row. post_delete handlers
+ignore rows that were already trashed, since those were already taken out
+of the derived data.
+
+Indexes meant for live rows are partial on ``LIVE``. Live queries always
+carry that condition, so they can use these indexes, and trashed rows cost
+nothing in them.
+
+Soft delete is opt-in: set ``SOFT_DELETE = True`` in the settings to turn it
+on. While it is off (the default), the trash bin keeps a full serialized copy
+of each row and hard-deletes it, as it did before. Turning it on changes what
+a delete leaves behind: a trashed row keeps its unique values (student_id,
+employee email, import hash), so they can't be reused until the row is
+purged. The ``LIVE`` filter stays in place either way: with nothing
+soft-deleted it matches every row, and rows trashed while the setting was on
+stay hidden until they are restored or purged.
+"""
+from django.conf import settings
+from django.db import models, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+LIVE = models.Q(deleted_at__isnull=True)
+TRASHED = models.Q(deleted_at__isnull=False)
+
+def soft_delete_enabled():
+    return getattr(settings, 'SOFT_DELETE', False)
+
+
+# Both are sent with ``pks``, the primary keys of the ``sender`` rows that changed
+rows_trashed = Signal()
+rows_restored = Signal()
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    def _set_deleted_at(self, condition, deleted_at, signal):
+        with transaction.atomic(using=self.db):
+            rows = self.filter(condition)
+            # Locks the rows where the database supports it, so concurrent calls can't both signal them
+            pks = list(rows.select_for_update().values_list('pk', flat=True))
+            if pks:
+                rows.update(deleted_at=deleted_at)
+                signal.send(sender=self.model, pks=pks)
+        return pks
+
+    def soft_delete(self):
+        """Move the live rows of this queryset to the trash. Returns their primary keys."""
+        return self._set_deleted_at(LIVE, timezone.now(), rows_trashed)
+
+    def restore(self):
+        """Bring the trashed rows of this queryset back. Returns their primary keys."""
+        return self._set_deleted_at(TRASHED, None, rows_restored)
+
+
+class LiveManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset().filter(LIVE)
+
+
+class SoftDeleteModel(models.Model):
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = LiveManager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    @property
+    def is_deleted(self):
+        return self.deleted_at is not None
@@ -1,3 +1,303 @@
-from django.test import TestCase
+import datetime
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from . import jobs, trash
+from .imports import CSV, import_ledger, import_roster
+from .models import (
+    BackgroundJob, DashboardSnapshot, Employee, Expense, IdentifierSequence, RecentActivity, Student, TrashBinEntry,
+    allocate_student_ids, reserve_student_ids,
+)
+
+SNAPSHOT_FIELDS = (
+    'total_students', 'iot_students', 'sod_students', 'total_employees',
+    'total_salaries', 'transport_expenses', 'other_expenses',
+)
+
+
+def snapshot_values(snapshot):
+    return {field: getattr(snapshot, field) for field in SNAPSHOT_FIELDS}
+
+
+class DashboardSnapshotTests(TestCase):
+    """The counters kept by apply_delta must always match a full rebuild."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('admin', password='secret')
+
+    def setUp(self):
+        DashboardSnapshot.rebuild()
+
+    def assertMatchesRebuild(self):
+        maintained = snapshot_values(DashboardSnapshot.objects.get(pk=DashboardSnapshot.SINGLETON_ID))
+        self.assertEqual(maintained, snapshot_values(DashboardSnapshot.rebuild()))
+
+    def test_saves_and_deletes(self):
+        student = Student.objects.create(name='Ada', student_id='T-1', type=Student.TRAINEE, program=Student.IOT, level='1')
+        Student.objects.create(name='Bob', student_id='T-2', type=Student.TRAINEE, program=Student.SOD, level='1')
+        employee = Employee.objects.create(first_name='Eve', salary=Decimal('1200.50'))
+        expense = Expense.objects.create(type=Expense.TRANSPORT, description='Bus', amount=Decimal('30.00'))
+        Expense.objects.create(type=Expense.OTHER, description='Paper', amount=Decimal('12.25'))
+        self.assertMatchesRebuild()
+
+        student.program = Student.SOD
+        student.save()
+        employee.salary = Decimal('900.00')
+        employee.save()
+        expense.type = Expense.OTHER
+        expense.amount = Decimal('45.00')
+        expense.save()
+        self.assertMatchesRebuild()
+
+        student.delete()
+        employee.delete()
+        expense.delete()
+        self.assertMatchesRebuild()
+
+    def test_missing_snapshot_is_rebuilt(self):
+        DashboardSnapshot.objects.all().delete()
+        Employee.objects.create(first_name='Eve', salary=Decimal('100.00'))
+        self.assertMatchesRebuild()
+
+    def test_imports(self):
+        roster = import_roster([
+            (2, {'name': 'Ada', 'type': Student.TRAINEE, 'program': Student.IOT, 'level': '1'}),
+            (3, {'name': 'Bob', 'type': Student.TRAINEE, 'program': Student.SOD, 'level': '2'}),
+        ], self.user)
+        ledger = import_ledger([
+            b'date,type,description,amount\n',
+            b'2025-01-02,transport,Bus,30.00\n',
+            b'2025-01-03,other,Paper,12.25\n',
+        ], Expense, CSV, self.user)
+        self.assertEqual((roster.created, ledger.created), (2, 2))
+        self.assertMatchesRebuild()
+
+
+class TrashRoundTripMixin:
+    """Move rows to the trash and back; run with SOFT_DELETE on and off."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('admin', password='secret')
+
+    def test_student_round_trip(self):
+        student = Student.objects.create(name='Ada', student_id='T-1', type=Student.TRAINEE, program=Student.IOT, level='1')
+        DashboardSnapshot.rebuild()
+
+        self.assertEqual(trash.move_to_trash(Student, [student.pk], self.user), 1)
+        self.assertFalse(Student.objects.filter(pk=student.pk).exists())
+        entry = TrashBinEntry.objects.get(user=self.user, item_type='Student', item_id=student.pk)
+        self.assertIn('Ada', entry.summary)
+        self.assertEqual(DashboardSnapshot.load().iot_students, DashboardSnapshot.rebuild().iot_students)
+
+        result = trash.restore_entries([entry])
+        self.assertEqual(result.restored, {'Student': 1})
+        self.assertEqual(result.skipped, [])
+        restored = Student.objects.get(pk=student.pk)
+        self.assertEqual((restored.name, restored.student_id, restored.program), ('Ada', 'T-1', Student.IOT))
+        self.assertFalse(TrashBinEntry.objects.filter(pk=entry.pk).exists())
+        self.assertEqual(snapshot_values(DashboardSnapshot.load()), snapshot_values(DashboardSnapshot.rebuild()))
+
+    def test_activity_keeps_its_timestamp(self):
+        activity = RecentActivity.objects.create(user=self.user, action='Added a student')
+        logged_at = (timezone.now() - datetime.timedelta(days=40)).replace(microsecond=0)
+        RecentActivity.objects.filter(pk=activity.pk).update(timestamp=logged_at)
+
+        trash.move_to_trash(RecentActivity, [activity.pk], self.user)
+        trash.restore_entry(TrashBinEntry.objects.get(item_type='RecentActivity', item_id=activity.pk))
+        self.assertEqual(RecentActivity.objects.get(pk=activity.pk).timestamp, logged_at)
+
+    def test_restore_many(self):
+        expenses = [
+            Expense.objects.create(type=Expense.OTHER, description=f'Item {n}', amount=Decimal(n))
+            for n in range(1, 8)
+        ]
+        trash.move_to_trash(Expense, [expense.pk for expense in expenses], self.user, chunk_size=3)
+        self.assertEqual(TrashBinEntry.objects.filter(item_type='Expense').count(), 7)
+
+        result = trash.restore_entries(TrashBinEntry.objects.filter(item_type='Expense'), chunk_size=3)
+        self.assertEqual(result.restored, {'Expense': 7})
+        self.assertEqual(Expense.objects.filter(pk__in=[expense.pk for expense in expenses]).count(), 7)
+        self.assertFalse(TrashBinEntry.objects.exists())
+
+
+@override_settings(SOFT_DELETE=True)
+class SoftDeleteTrashTests(TrashRoundTripMixin, TestCase):
+    def test_row_stays_in_place(self):
+        expense = Expense.objects.create(type=Expense.OTHER, description='Paper', amount=Decimal('5.00'))
+        trash.move_to_trash(Expense, [expense.pk], self.user)
+        self.assertIsNotNone(Expense.all_objects.get(pk=expense.pk).deleted_at)
+
+
+@override_settings(SOFT_DELETE=False)
+class CopyTrashTests(TrashRoundTripMixin, TestCase):
+    def test_row_is_deleted(self):
+        expense = Expense.objects.create(type=Expense.OTHER, description='Paper', amount=Decimal('5.00'))
+        trash.move_to_trash(Expense, [expense.pk], self.user)
+        self.assertFalse(Expense.all_objects.filter(pk=expense.pk).exists())
+        self.assertEqual(TrashBinEntry.objects.get(item_id=expense.pk).payload['description'], 'Paper')
+
+    def test_legacy_and_unreadable_copies(self):
+        legacy = TrashBinEntry.objects.create(
+            user=self.user, item_type='Employee', item_id=9001, summary='Ada Lovelace',
+            item_data={'name': 'Ada Lovelace', 'position': 'Engineer', 'salary': '1000.00'},
+        )
+        unreadable = TrashBinEntry.objects.create(
+            user=self.user, item_type='Employee', item_id=9002, summary='Bob',
+            item_data={'first_name': 'Bob', 'salary': '1000.00', 'date_of_birth': 'not a date'},
+        )
+        result = trash.restore_entries([legacy, unreadable])
+        self.assertEqual(result.restored, {'Employee': 1})
+        self.assertEqual(result.skipped, [unreadable])
+        employee = Employee.objects.get(pk=9001)
+        self.assertEqual((employee.first_name, employee.last_name), ('Ada', 'Lovelace'))
+        self.assertFalse(Employee.all_objects.filter(pk=9002).exists())
+        self.assertEqual(list(TrashBinEntry.objects.all()), [unreadable])
+        with self.assertRaises(ValueError):
+            trash.restore_entry(unreadable)
+
+
+class BackgroundJobTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('admin', password='secret')
+
+    def running_job(self, heartbeat_age, attempts=1):
+        beat = timezone.now() - heartbeat_age
+        return BackgroundJob.objects.create(
+            user=self.user, kind='financial_report_pdf', status=BackgroundJob.RUNNING,
+            attempts=attempts, started_at=beat - datetime.timedelta(hours=1), heartbeat_at=beat,
+        )
+
+    def test_requeues_jobs_without_a_recent_heartbeat(self):
+        stale = self.running_job(jobs.JOB_STALE_AFTER + datetime.timedelta(seconds=1))
+        # Started long ago but still beating: a live worker on a long export
+        alive = self.running_job(jobs.JOB_HEARTBEAT_INTERVAL)
+
+        self.assertEqual(jobs.requeue_stale(), (1, 0))
+        stale.refresh_from_db()
+        alive.refresh_from_db()
+        self.assertEqual(stale.status, BackgroundJob.PENDING)
+        self.assertEqual(alive.status, BackgroundJob.RUNNING)
+        self.assertEqual(jobs.claim_next().pk, stale.pk)
+
+    def test_fails_jobs_out_of_attempts(self):
+        job = self.running_job(jobs.JOB_STALE_AFTER * 2, attempts=jobs.JOB_MAX_ATTEMPTS)
+
+        self.assertEqual(jobs.requeue_stale(), (0, 1))
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.FAILED)
+        self.assertEqual(job.error, 'Worker stopped responding')
+        self.assertIsNotNone(job.finished_at)
+
+    def test_now_argument(self):
+        job = self.running_job(datetime.timedelta(0))
+        self.assertEqual(jobs.requeue_stale(), (0, 0))
+        self.assertEqual(jobs.requeue_stale(now=timezone.now() + jobs.JOB_STALE_AFTER * 2), (1, 0))
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.PENDING)
+
+    def test_purge_finished(self):
+        finished = timezone.now() - jobs.JOB_RESULT_TTL - datetime.timedelta(minutes=1)
+        expired = BackgroundJob.objects.create(
+            user=self.user, kind='financial_report_pdf', status=BackgroundJob.DONE, finished_at=finished,
+        )
+        recent = BackgroundJob.objects.create(
+            user=self.user, kind='financial_report_pdf', status=BackgroundJob.FAILED, finished_at=timezone.now(),
+        )
+        pending = BackgroundJob.objects.create(user=self.user, kind='financial_report_pdf')
+
+        self.assertEqual(jobs.purge_finished(), 1)
+        self.assertQuerySetEqual(BackgroundJob.objects.order_by('id'), [recent, pending])
+        self.assertFalse(BackgroundJob.objects.filter(pk=expired.pk).exists())
+
+
+class IdentifierSequenceTests(TestCase):
+    def test_blocks_are_contiguous_and_disjoint(self):
+        self.assertEqual(IdentifierSequence.allocate('test'), range(1, 2))
+        self.assertEqual(IdentifierSequence.allocate('test', 3), range(2, 5))
+        self.assertEqual(IdentifierSequence.allocate('test', 1), range(5, 6))
+        self.assertEqual(IdentifierSequence.objects.get(name='test').next_value, 6)
+
+    def test_empty_block(self):
+        self.assertEqual(IdentifierSequence.allocate('test', 0), range(1, 1))
+        self.assertEqual(IdentifierSequence.allocate('test', 2), range(1, 3))
+        self.assertEqual(IdentifierSequence.allocate('test', 0), range(3, 3))
+
+    def test_sequences_are_independent(self):
+        IdentifierSequence.allocate('one', 10)
+        self.assertEqual(IdentifierSequence.allocate('two', 2), range(1, 3))
+
+    def test_reserve_through(self):
+        IdentifierSequence.allocate('test', 2)
+        IdentifierSequence.reserve_through('test', 9)
+        self.assertEqual(IdentifierSequence.allocate('test'), range(10, 11))
+        # Never moves the sequence backwards
+        IdentifierSequence.reserve_through('test', 4)
+        self.assertEqual(IdentifierSequence.allocate('test'), range(11, 12))
+
+    def test_imported_student_ids_are_not_allocated_again(self):
+        first = allocate_student_ids(2)
+        reserve_student_ids(['STU000041', 'legacy-7', 'STU000040'])
+        self.assertEqual(allocate_student_ids(1), ['STU000042'])
+        self.assertNotIn('STU000042', first)
+
+
+@override_settings(SOFT_DELETE=True)
+class TrashRetentionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('admin', password='secret')
+
+    def trashed_expenses(self, count, age):
+        expenses = [
+            Expense.objects.create(type=Expense.OTHER, description=f'Item {n}', amount=Decimal('1.00'))
+            for n in range(count)
+        ]
+        pks = [expense.pk for expense in expenses]
+        trash.move_to_trash(Expense, pks, self.user)
+        TrashBinEntry.objects.filter(item_id__in=pks).update(deleted_at=timezone.now() - age)
+        return pks
+
+    def test_purge_expired(self):
+        old = self.trashed_expenses(5, trash.TRASH_RETENTION + datetime.timedelta(days=1))
+        recent = self.trashed_expenses(2, datetime.timedelta(days=1))
+
+        purged = trash.purge_expired(timezone.now() - trash.TRASH_RETENTION, chunk_size=2)
+        self.assertEqual(purged, (5, 5))
+        self.assertFalse(Expense.all_objects.filter(pk__in=old).exists())
+        self.assertEqual(Expense.all_objects.filter(pk__in=recent).count(), 2)
+        self.assertEqual(set(TrashBinEntry.objects.values_list('item_id', flat=True)), set(recent))
+
+    def test_purge_expired_keeps_restored_rows(self):
+        [pk] = self.trashed_expenses(1, trash.TRASH_RETENTION * 2)
+        # Restored behind the trash bin's back; the stale entry must not take the live row with it
+        Expense.all_objects.filter(pk=pk).restore()
+
+        self.assertEqual(trash.purge_expired(timezone.now() - trash.TRASH_RETENTION), (1, 0))
+        self.assertTrue(Expense.objects.filter(pk=pk).exists())
+        self.assertFalse(TrashBinEntry.objects.exists())
+
+    def test_purge_over_cap(self):
+        oldest = self.trashed_expenses(3, datetime.timedelta(days=3))
+        newest = self.trashed_expenses(2, datetime.timedelta(days=1))
+
+        self.assertEqual(trash.purge_over_cap(2, chunk_size=2), (3, 3))
+        self.assertEqual(set(TrashBinEntry.objects.values_list('item_id', flat=True)), set(newest))
+        self.assertFalse(Expense.all_objects.filter(pk__in=oldest).exists())
+
+    def test_compressed_payloads_still_restore(self):
+        with self.settings(SOFT_DELETE=False):
+            [pk] = self.trashed_expenses(1, trash.TRASH_COMPRESS_AFTER * 2)
+
+        result = trash.purge_trash(now=timezone.now())
+        self.assertEqual((result.compressed, result.expired), (1, 0))
+        entry = TrashBinEntry.objects.get(item_id=pk)
+        self.assertIsNone(entry.item_data)
+        self.assertEqual(entry.payload['description'], 'Item 0')
+        trash.restore_entry(entry)
+        self.assertTrue(Expense.objects.filter(pk=pk).exists())
@@ -0,0 +1,323 @@
+"""
+The trash bin: soft-deleting rows on a user's behalf and restoring them.
+
+``move_to_trash`` soft-deletes the selected rows of a SoftDeleteModel, one
+UPDATE per TRASH_CHUNK_SIZE chunk, and records one TrashBinEntry per row so
+the trash bin can show who deleted what. The row keeps its primary key and its
+satellite rows, so an entry only stores a short summary of it in item_data.
+With the SOFT_DELETE setting off, entries instead get a full
+``serialize('json')`` copy and the rows are hard-deleted.
+``restore_entries`` brings rows back grouped by item type, one UPDATE per
+chunk of each type. The trash bin lists entries a keyset page at a time
+(``trash_page``) from their stored ``summary``, never loading item_data.
+
+Entries written before soft delete, or with it turned off, hold a full
+``serialize('json')`` copy of a hard-deleted row. Restoring re-inserts those rows from that copy with
+bulk_create, using their original primary key, and sends ``rows_restored``
+for them. Fields the model no longer has are ignored; an entry whose copy
+can't be deserialized at all is skipped and stays in the trash.
+
+``purge_trash`` enforces retention in chunks, each in its own transaction.
+Entries older than TRASH_RETENTION and entries beyond a user's newest
+TRASH_MAX_ENTRIES_PER_USER are dropped, and the rows they still hold in the
+trash are deleted for good. Payloads older than TRASH_COMPRESS_AFTER are moved
+into zlib-compressed item_data_compressed; ``TrashBinEntry.payload`` reads
+either form.
+"""
+import datetime
+import json
+from collections import namedtuple
+
+from django.core import serializers
+from django.core.serializers.base import DeserializationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Case, Count, Value, When
+from django.utils import timezone
+
+from .imports import chunked
+from .models import Employee, Expense, RecentActivity, Student, Transaction, TrashBinEntry
+from .pagination import keyset_page
+from .softdelete import TRASHED, rows_restored, soft_delete_enabled
+
+# Rows per SELECT/UPDATE; keeps ``IN (...)`` lists under SQLite's 999 variable limit
+TRASH_CHUNK_SIZE = 500
+TRASH_PAGE_SIZE = 25
+
+# Retention enforced by the purge_trash command
+TRASH_RETENTION = datetime.timedelta(days=90)
+TRASH_MAX_ENTRIES_PER_USER = 5000
+TRASH_COMPRESS_AFTER = datetime.timedelta(days=30)
+
+# ``restored`` maps item types to the number of rows put back; ``skipped`` are entries of unknown types
+# and entries whose stored copy can't be deserialized any more
+RestoreResult = namedtuple('RestoreResult', ['restored', 'skipped'])
+# Entries compressed, entries purged for age and over the per-user cap, and trashed rows deleted with them
+PurgeResult = namedtuple('PurgeResult', ['compressed', 'expired', 'over_cap', 'rows_deleted'])
+
+TRASHABLE_MODELS = {model.__name__: model for model in (Student, Employee, Expense, Transaction, RecentActivity)}
+
+# What an entry keeps of its row for display in the trash bin
+SUMMARY_FIELDS = {
+    Student: ('name', 'student_id', 'program', 'level'),
+    Employee: ('first_name', 'last_name', 'position', 'department'),
+    Expense: ('type', 'description', 'amount', 'date'),
+    Transaction: ('type', 'description', 'amount', 'date'),
+    RecentActivity: ('action', 'icon_class', 'timestamp'),
+}
+
+_encoder = DjangoJSONEncoder()
+
+
+def _json_value(value):
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    return _encoder.default(value)
+
+
+def _copy_to_trash(model, chunk, user, chunk_size):
+    """Store a full copy of the live rows in ``chunk`` as entries and hard-delete them (SOFT_DELETE off)."""
+    rows = list(model.objects.filter(pk__in=chunk))
+    entries = []
+    for copy in json.loads(serializers.serialize('json', rows)):
+        shown = {name: copy['fields'][name] for name in SUMMARY_FIELDS[model]}
+        entries.append(TrashBinEntry(
+            user=user, item_type=model.__name__, item_id=copy['pk'],
+            item_data=copy['fields'], summary=TrashBinEntry.summarize(shown),
+        ))
+    TrashBinEntry.objects.bulk_create(entries, batch_size=chunk_size)
+    # A regular delete, so the post_delete handlers update the derived data
+    model.objects.filter(pk__in=[row.pk for row in rows]).delete()
+    return len(rows)
+
+
+def move_to_trash(model, ids, user, chunk_size=TRASH_CHUNK_SIZE):
+    """
+    Soft-delete the live ``model`` rows with primary keys ``ids`` into
+    ``user``'s trash bin, or copy and hard-delete them when SOFT_DELETE is
+    off. Returns the number of rows trashed.
+    """
+    fields = SUMMARY_FIELDS[model]
+    trashed = 0
+    with transaction.atomic():
+        for chunk in chunked(ids, chunk_size):
+            if not soft_delete_enabled():
+                trashed += _copy_to_trash(model, chunk, user, chunk_size)
+                continue
+            rows = {row['pk']: row for row in model.objects.filter(pk__in=chunk).values('pk', *fields)}
+            pks = model.objects.filter(pk__in=list(rows)).soft_delete()
+            entries = []
+            for pk in pks:
+                item_data = {name: _json_value(rows[pk][name]) for name in fields}
+                entries.append(TrashBinEntry(
+                    user=user, item_type=model.__name__, item_id=pk,
+                    item_data=item_data, summary=TrashBinEntry.summarize(item_data),
+                ))
+            TrashBinEntry.objects.bulk_create(entries, batch_size=chunk_size)
+            trashed += len(pks)
+    return trashed
+
+
+def trash_object(instance, user):
+    return move_to_trash(type(instance), [instance.pk], user)
+
+
+def trash_page(user, cursor=None, page_size=TRASH_PAGE_SIZE):
+    """
+    One keyset page of ``user``'s trash bin, newest first, as
+    ``(entries, next_cursor)``. item_data is deferred; the list shows ``summary``.
+    """
+    entries = TrashBinEntry.objects.filter(user=user).defer('item_data')
+    return keyset_page(entries, 'deleted_at', descending=True, cursor=cursor, page_size=page_size)
+
+
+def _recreated(model, entry, item_data):
+    """
+    A hard-deleted row rebuilt unsaved from its serialized copy. Fields the
+    model no longer has are ignored. Raises DeserializationError when a
+    value no longer fits its field.
+    """
+    fields = dict(item_data)
+    if model is RecentActivity:
+        # Those entries didn't record the activity's user
+        fields.setdefault('user', entry.user_id)
+    if model is Employee and 'name' in fields and not fields.get('first_name'):
+        # Copies from before 0006 have a single name field
+        first_name, _, last_name = (fields['name'] or '').partition(' ')
+        fields['first_name'], fields['last_name'] = first_name or None, last_name or None
+    [deserialized] = serializers.deserialize('python', [
+        {'model': model._meta.label_lower, 'pk': entry.item_id, 'fields': fields},
+    ], ignorenonexistent=True)
+    return deserialized.object
+
+
+def _stored_dates(model, rows):
+    """
+    The auto_now/auto_now_add values of the unsaved ``rows``, per field, which
+    saving them would overwrite with the current time.
+    """
+    return {
+        field: {row.pk: getattr(row, field.attname) for row in rows if getattr(row, field.attname) is not None}
+        for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    }
+
+
+def _restore_group(model, entries, chunk_size):
+    """Restore the rows of ``entries``. Returns (rows restored, entries that couldn't be deserialized)."""
+    restored = 0
+    unreadable = []
+    for chunk in chunked(entries, chunk_size):
+        item_ids = {entry.item_id for entry in chunk}
+        restored += len(model.all_objects.filter(pk__in=item_ids).restore())
+        existing = set(model.all_objects.filter(pk__in=item_ids).values_list('pk', flat=True))
+        missing = {entry.item_id: entry for entry in chunk if entry.item_id not in existing}
+        if not missing:
+            continue
+        # Only these entries' payloads are needed, so item_data may be deferred on the rest
+        payloads = {
+            stored.pk: stored.payload
+            for stored in TrashBinEntry.objects.filter(
+                pk__in=[entry.pk for entry in missing.values()],
+            ).only('id', 'item_data', 'item_data_compressed')
+        }
+        recreated = []
+        for entry in missing.values():
+            try:
+                recreated.append(_recreated(model, entry, payloads[entry.pk]))
+            except DeserializationError:
+                unreadable.append(entry)
+        if not recreated:
+            continue
+        stored_dates = _stored_dates(model, recreated)
+        # bulk_create sends no post_save, so announce the rows like any other restore
+        model.objects.bulk_create(recreated, batch_size=chunk_size)
+        for field, values in stored_dates.items():
+            if values:
+                # Put back the dates bulk_create replaced with the current time
+                model.all_objects.filter(pk__in=list(values)).update(**{field.attname: Case(
+                    *[When(pk=pk, then=Value(value, output_field=field)) for pk, value in values.items()],
+                )})
+        rows_restored.send(sender=model, pks=[row.pk for row in recreated])
+        restored += len(recreated)
+    return restored, unreadable
+
+
+def restore_entries(entries, chunk_size=TRASH_CHUNK_SIZE):
+    """
+    Put the rows of the trash ``entries`` back and drop those entries, in one
+    transaction. Entries are grouped by item_type: trashed rows come back with
+    one UPDATE per chunk, rows deleted before soft delete are re-inserted with
+    bulk_create. Entries of unknown item types, and entries whose stored copy
+    can't be deserialized, are left in the trash and returned as skipped.
+    Returns a RestoreResult.
+    """
+    groups = {}
+    skipped = []
+    for entry in entries:
+        model = TRASHABLE_MODELS.get(entry.item_type)
+        if model is None:
+            skipped.append(entry)
+        else:
+            groups.setdefault(model, []).append(entry)
+    restored = {}
+    with transaction.atomic():
+        for model, group in groups.items():
+            restored[model.__name__], unreadable = _restore_group(model, group, chunk_size)
+            skipped.extend(unreadable)
+            kept = {entry.pk for entry in unreadable}
+            TrashBinEntry.objects.filter(pk__in=[entry.pk for entry in group if entry.pk not in kept]).delete()
+    return RestoreResult(restored, skipped)
+
+
+def restore_entry(entry):
+    """
+    Put the row of trash ``entry`` back and drop the entry. Raises ValueError
+    for item types that can't be restored and for stored copies that no longer
+    fit the model.
+    """
+    if entry.item_type not in TRASHABLE_MODELS:
+        raise ValueError(f"Restore not implemented for item type: {entry.item_type}")
+    if restore_entries([entry]).skipped:
+        raise ValueError(f"The stored copy of this {entry.item_type} no longer matches its fields and can't be restored.")
+
+
+def _purge_chunk(rows):
+    """Drop the entries ``rows`` of (id, item_type, item_id) and delete the rows they still hold in the trash."""
+    item_ids = {}
+    for _, item_type, item_id in rows:
+        item_ids.setdefault(item_type, []).append(item_id)
+    deleted = 0
+    with transaction.atomic():
+        for item_type, ids in item_ids.items():
+            model = TRASHABLE_MODELS.get(item_type)
+            if model is None:
+                continue
+            # A row restored since is live again and must stay
+            deleted += model.all_objects.filter(TRASHED, pk__in=ids).delete()[1].get(model._meta.label, 0)
+        TrashBinEntry.objects.filter(pk__in=[entry_id for entry_id, _, _ in rows]).delete()
+    return deleted
+
+
+def purge_expired(deleted_before, chunk_size=TRASH_CHUNK_SIZE):
+    """Purge the entries deleted before ``deleted_before``. Returns (entries purged, rows deleted)."""
+    purged = rows_deleted = 0
+    expired = TrashBinEntry.objects.filter(deleted_at__lt=deleted_before).order_by('id')
+    while True:
+        rows = list(expired.values_list('id', 'item_type', 'item_id')[:chunk_size])
+        if not rows:
+            return purged, rows_deleted
+        rows_deleted += _purge_chunk(rows)
+        purged += len(rows)
+
+
+def purge_over_cap(max_per_user, chunk_size=TRASH_CHUNK_SIZE):
+    """Purge all but the newest ``max_per_user`` entries of every user. Returns (entries purged, rows deleted)."""
+    purged = rows_deleted = 0
+    over_cap = TrashBinEntry.objects.order_by().values('user').annotate(count=Count('id')).filter(
+        count__gt=max_per_user,
+    )
+    for user_id in list(over_cap.values_list('user', flat=True)):
+        entries = TrashBinEntry.objects.filter(user_id=user_id).order_by('-deleted_at', '-id')
+        while True:
+            rows = list(entries.values_list('id', 'item_type', 'item_id')[max_per_user:max_per_user + chunk_size])
+            if not rows:
+                break
+            rows_deleted += _purge_chunk(rows)
+            purged += len(rows)
+    return purged, rows_deleted
+
+
+def compress_payloads(deleted_before, chunk_size=TRASH_CHUNK_SIZE):
+    """Compress the item_data of entries deleted before ``deleted_before``. Returns the number compressed."""
+    compressed = 0
+    pending = TrashBinEntry.objects.filter(deleted_at__lt=deleted_before, item_data__isnull=False).order_by('id')
+    while True:
+        chunk = list(pending.only('id', 'item_data')[:chunk_size])
+        if not chunk:
+            return compressed
+        for entry in chunk:
+            entry.item_data_compressed = TrashBinEntry.compress(entry.item_data)
+        with transaction.atomic():
+            TrashBinEntry.objects.bulk_update(chunk, ['item_data_compressed'])
+            # update() stores None as SQL NULL; bulk_update would write a JSON null
+            TrashBinEntry.objects.filter(pk__in=[entry.pk for entry in chunk]).update(item_data=None)
+        compressed += len(chunk)
+
+
+def purge_trash(max_age=TRASH_RETENTION, max_per_user=TRASH_MAX_ENTRIES_PER_USER,
+                compress_after=TRASH_COMPRESS_AFTER, chunk_size=TRASH_CHUNK_SIZE, now=None):
+    """
+    Apply the retention policy and return a PurgeResult. Pass None for
+    ``max_age``, ``max_per_user`` or ``compress_after`` to skip that step.
+    """
+    now = now or timezone.now()
+    expired = over_cap = (0, 0)
+    if max_age is not None:
+        expired = purge_expired(now - max_age, chunk_size)
+    if max_per_user is not None:
+        over_cap = purge_over_cap(max_per_user, chunk_size)
+    compressed = 0
+    if compress_after is not None:
+        compressed = compress_payloads(now - compress_after, chunk_size)
+    return PurgeResult(compressed, expired[0], over_cap[0], expired[1] + over_cap[1])
@@ -0,0 +1,100 @@
+"""
+Per-process prefix index for instant student and employee lookup.
+
+The index is a sorted array of lowercase keys (full name, each name word and
+the student/employee ID) searched with bisect. It is rebuilt lazily when the
+Student or Employee version counters from admin_panel.cache change, so a
+lookup never touches the database unless the data has moved on. The counters
+live in the shared cache backend (files on disk), so they are read at most
+once per VERSION_CHECK_INTERVAL rather than on every keystroke; a write shows
+up in suggestions within that interval.
+"""
+import threading
+import time
+from bisect import bisect_left
+from collections import namedtuple
+
+from .cache import model_versions
+from .models import Student, Employee
+
+INDEXED_MODELS = ('Student', 'Employee')
+VERSION_CHECK_INTERVAL = 2.0  # seconds
+
+Suggestion = namedtuple('Suggestion', ['entity_type', 'entity_id', 'label', 'detail'])
+
+
+class PrefixIndex:
+    def __init__(self, entries):
+        # entries: iterable of (key, Suggestion)
+        entries = sorted(entries, key=lambda entry: entry[0])
+        self.keys = [key for key, _ in entries]
+        self.suggestions = [suggestion for _, suggestion in entries]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, prefix, limit=10, entity_type=None):
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        results = []
+        seen = set()
+        position = bisect_left(self.keys, prefix)
+        while position < len(self.keys) and len(results) < limit:
+            if not self.keys[position].startswith(prefix):
+                break
+            suggestion = self.suggestions[position]
+            identity = (suggestion.entity_type, suggestion.entity_id)
+            if identity not in seen and (entity_type is None or suggestion.entity_type == entity_type):
+                seen.add(identity)
+                results.append(suggestion)
+            position += 1
+        return results
+
+
+def _keys_for(name, identifier):
+    name = ' '.join((name or '').lower().split())
+    keys = {name} if name else set()
+    keys.update(name.split())
+    if identifier:
+        keys.add(identifier.lower())
+    return keys
+
+
+def build_index():
+    entries = []
+    for pk, name, student_id, program in Student.objects.values_list('id', 'name', 'student_id', 'program').iterator():
+        suggestion = Suggestion('student', pk, name, student_id or program)
+        entries.extend((key, suggestion) for key in _keys_for(name, student_id))
+    employee_rows = Employee.objects.values_list(
+        'id', 'first_name', 'middle_name', 'last_name', 'employee_id', 'position'
+    ).iterator()
+    for pk, first_name, middle_name, last_name, employee_id, position in employee_rows:
+        name = ' '.join(part for part in (first_name, middle_name, last_name) if part)
+        suggestion = Suggestion('employee', pk, name, position)
+        entries.extend((key, suggestion) for key in _keys_for(name, employee_id))
+    return PrefixIndex(entries)
+
+
+_index = None
+_index_versions = None
+_versions_checked_at = None
+_lock = threading.Lock()
+
+
+def get_index():
+    global _index, _index_versions, _versions_checked_at
+    now = time.monotonic()
+    if _index is not None and now - _versions_checked_at < VERSION_CHECK_INTERVAL:
+        return _index
+    versions = model_versions(INDEXED_MODELS)
+    with _lock:
+        if _index is None or versions != _index_versions:
+            _index = build_index()
+            _index_versions = versions
+        _versions_checked_at = now
+    return _index
+
+
+def suggest(prefix, limit=10, entity_type=None):
+    return get_index().lookup(prefix, limit=limit, entity_type=entity_type)
@@ -11,6 +11,8 @@ urlpatterns = [
     path('add-expense/', views.add_expense, name='add_expense'),
     path('recent-transactions/', views.recent_transactions, name='recent_transactions'),
     path('add-transaction/', views.add_transaction, name='add_transaction'),
+    path('import-students/', views.import_students, name='import_students'),
+    path('import/<str:kind>/', views.import_ledger, name='import_ledger'),
     path('update-student/<int:student_id>/', views.update_student, name='update_student'),
     path('delete-student/<int:student_id>/', views.delete_student, name='delete_student'),
     path('update-employee/<int:employee_id>/', views.update_employee, name='update_employee'),
@@ -25,6 +27,7 @@ urlpatterns = [
     path('trash-bin/', views.trash_bin, name='trash_bin'),
     path('student-report/<int:student_id>/', views.student_report_detail, name='student_report_detail'),
     path('export-student-report-pdf/<int:student_id>/', views.export_student_report_pdf, name='export_student_report_pdf'),
+    path('export-student-reports/', views.export_student_reports, name='export_student_reports'),
     path('export-student-report-excel/<int:student_id>/', views.export_student_report_excel, name='export_student_report_excel'),
     path('email-student-report/<int:student_id>/', views.email_student_report, name='email_student_report'),
 
@@ -37,8 +40,19 @@ urlpatterns = [
     path('export-financial-report-pdf/', views.export_financial_report_pdf, name='export_financial_report_pdf'),
     path('export-financial-report-excel/', views.export_financial_report_excel, name='export_financial_report_excel'),
     path('email-financial-report/', views.email_financial_report, name='email_financial_report'),
+    path('export/<str:table>.xlsx', views.export_table, name='export_table'),
 
     path('bulk-delete-students/', views.bulk_delete_students, name='bulk_delete_students'),
     path('fetch-tab-data/<str:tab_name>/', views.fetch_tab_data, name='fetch_tab_data'),
     path('bulk-delete-employees/', views.bulk_delete_employees, name='bulk_delete_employees'),
+    path('api/students/', views.students_grid, name='students_grid'),
+    path('api/employees/', views.employees_grid, name='employees_grid'),
+    path('api/typeahead/', views.typeahead_view, name='typeahead'),
+    path('api/activities/', views.activity_feed, name='activity_feed'),
+    path('api/ledger/', views.ledger_rollups, name='ledger_rollups'),
+    path('api/jobs/<int:job_id>/', views.job_status, name='job_status'),
+    path('jobs/<int:job_id>/download/', views.job_download, name='job_download'),
+    path('api/email-report/', views.email_report_bulk, name='email_report_bulk'),
+    path('api/outbox/<int:message_id>/', views.outbox_status, name='outbox_status'),
+    path('cache-stats/', views.cache_stats_view, name='cache_stats'),
 ]
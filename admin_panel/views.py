@@ -1,124 +1,63 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.views.decorators.http import require_POST
-from django.db.models import Sum, Q
-from django.http import JsonResponse, HttpResponse
+from django.views.decorators.http import require_POST, condition
+from django.db import transaction
+from django.db.models import Q, F, Value
+from django.db.models.functions import Coalesce, Concat
+from django.http import JsonResponse, HttpResponse, Http404, StreamingHttpResponse, FileResponse, HttpResponseBadRequest
 from django.middleware.csrf import get_token
-from .models import Student, Employee, Expense, Transaction, RecentActivity, TrashBinEntry
+from django.urls import reverse
+from .models import Student, Employee, Expense, Transaction, RecentActivity, DashboardSnapshot, ActivityActorSummary, SearchDocument, BackgroundJob, OutboxMessage, allocate_student_ids, student_satellites
 from django.contrib.auth.decorators import login_required
 from user_auth.models import Profile
 import json
 from django.utils import timezone
-from django.core.serializers import serialize
+from django.utils.dateparse import parse_date
+import datetime
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
-from django.template.loader import render_to_string
-import io
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-import openpyxl
-from django.core.mail import EmailMessage
+import zipfile
+from django.conf import settings
+from .pagination import keyset_page, get_page_size, InvalidCursor
+from .cache import cached, cache_stats, version_etag
+from .financial import get_financial_summary
+from . import ledger
+from . import imports
+from . import artifacts
+from . import exports
+from . import jobs
+from . import outbox
+from . import reports
+from . import trash
+from . import search as search_index
+from . import typeahead
 
 @login_required
 def add_employee_form(request):
     if request.method == 'GET':
         return render(request, 'admin_panel/add_employee.html')
 
+DASHBOARD_DEPENDENCIES = ('Student', 'Employee', 'Expense', 'Transaction', 'RecentActivity')
+
 @login_required
+@condition(etag_func=version_etag(DASHBOARD_DEPENDENCIES, ajax_only=True))
 def dashboard(request):
-    # Fetch counts and summaries for dashboard
-    total_students = Student.objects.count()
-    total_employees = Employee.objects.count()
-    iot_students = Student.objects.filter(program='iot').count()
-    sod_students = Student.objects.filter(program='sod').count()
-
-    # Financial summaries
-    total_salaries = Employee.objects.aggregate(Sum('salary'))['salary__sum'] or 0
-    transport_expenses = Expense.objects.filter(type=Expense.TRANSPORT).aggregate(Sum('amount'))['amount__sum'] or 0
-    other_expenses = Expense.objects.filter(type=Expense.OTHER).aggregate(Sum('amount'))['amount__sum'] or 0
-    total_expenses = total_salaries + transport_expenses + other_expenses
-
-    # Recent transactions (last 5)
-    recent_transactions = Transaction.objects.order_by('-date')[:5]
-
-    # Filtering and sorting for recent activities
-    recent_activities_qs = RecentActivity.objects.all()
-
-    # Filtering by user
-    user_filter = request.GET.get('user')
-    if user_filter:
-        recent_activities_qs = recent_activities_qs.filter(user__username__icontains=user_filter)
-
-    # Filtering by action text search
-    action_search = request.GET.get('action_search')
-    if action_search:
-        recent_activities_qs = recent_activities_qs.filter(action__icontains=action_search)
-
-    # Filtering by date range
-    start_date = request.GET.get('start_date')
-    end_date = request.GET.get('end_date')
-    if start_date and end_date:
-        recent_activities_qs = recent_activities_qs.filter(timestamp__date__range=[start_date, end_date])
-
-    # Sorting
-    sort_by = request.GET.get('sort_by', 'timestamp_desc')
-    if sort_by == 'timestamp_asc':
-        recent_activities_qs = recent_activities_qs.order_by('timestamp')
-    elif sort_by == 'action_asc':
-        recent_activities_qs = recent_activities_qs.order_by('action')
-    elif sort_by == 'action_desc':
-        recent_activities_qs = recent_activities_qs.order_by('-action')
-    else:
-        # Default to timestamp descending
-        recent_activities_qs = recent_activities_qs.order_by('-timestamp')
-
-    # Limit to 20 for performance
-    recent_activities = recent_activities_qs[:20]
-
-    # Populate user filter dropdown with distinct usernames
-    user_list = RecentActivity.objects.values_list('user__username', flat=True).distinct().order_by('user__username')
-
-    # Fetch all students, employees, expenses for rendering
-    sort = request.GET.get('sort', 'name_asc')
-    if sort == 'name_asc':
-        students = Student.objects.all().order_by('name')
-    elif sort == 'name_desc':
-        students = Student.objects.all().order_by('-name')
-    elif sort == 'date_asc':
-        students = Student.objects.all().order_by('enrollment_date')
-    elif sort == 'date_desc':
-        students = Student.objects.all().order_by('-enrollment_date')
-    else:
-        students = Student.objects.all().order_by('name')
-
-    employees = Employee.objects.all()
-    expenses = Expense.objects.all()
+    # Everything but the per-user profile is served from the versioned cache
+    context = cached(
+        'dashboard',
+        sorted(request.GET.lists()),
+        DASHBOARD_DEPENDENCIES,
+        lambda: _dashboard_context(request),
+    )
 
     # Get or create profile for logged-in user
     profile, created = Profile.objects.get_or_create(user=request.user)
-
-    context = {
-        'total_students': total_students,
-        'total_employees': total_employees,
-        'iot_students': iot_students,
-        'sod_students': sod_students,
-        'total_salaries': total_salaries,
-        'transport_expenses': transport_expenses,
-        'other_expenses': other_expenses,
-        'total_expenses': total_expenses,
-        'recent_transactions': recent_transactions,
-        'recent_activities': recent_activities,
-        'students': students,
-        'employees': employees,
-        'expenses': expenses,
-        'profile': profile,
-        'user_list': user_list,
-    }
+    context = dict(context, profile=profile)
 
     if request.headers.get('x-requested-with') == 'XMLHttpRequest':
         # Return JSON for AJAX GET requests (for filtering/sorting)
         if request.method == 'GET':
             activities = []
-            for activity in recent_activities:
+            for activity in context['recent_activities']:
                 activities.append({
                     'id': activity.id,
                     'action': activity.action,
@@ -132,148 +71,332 @@ def dashboard(request):
 
     return render(request, 'admin_panel/index.html', context)
 
+def _dashboard_context(request):
+    # Counts and money totals all come from the maintained snapshot row
+    snapshot = DashboardSnapshot.load()
+    financial = get_financial_summary(request, snapshot)
+
+    # Recent transactions (last 5)
+    recent_transactions = list(Transaction.objects.order_by('-date')[:5])
+
+    # First page of the activity feed; further pages come from the activity feed API
+    sort_field, descending = ACTIVITY_SORTS.get(request.GET.get('sort_by'), ACTIVITY_SORTS['timestamp_desc'])
+    recent_activities, activities_next_cursor = keyset_page(
+        _activity_queryset(request).select_related('user'), sort_field, descending, page_size=ACTIVITY_PAGE_SIZE
+    )
+
+    # Populate user filter dropdown from the maintained per-user activity summary
+    user_list = ActivityActorSummary.usernames()
+    most_active_users = ActivityActorSummary.most_active()
+
+    # Only the first page of each grid is rendered; further pages come from the grid APIs
+    sort = request.GET.get('sort', 'name_asc')
+    sort_field, descending = STUDENT_GRID_SORTS.get(sort, STUDENT_GRID_SORTS['name_asc'])
+    students, students_next_cursor = keyset_page(
+        _student_grid_queryset(request), sort_field, descending, page_size=GRID_PAGE_SIZE
+    )
+    sort_field, descending = EMPLOYEE_GRID_SORTS.get(sort, EMPLOYEE_GRID_SORTS['name_asc'])
+    employees, employees_next_cursor = keyset_page(
+        _employee_grid_queryset(request), sort_field, descending, page_size=GRID_PAGE_SIZE
+    )
+
+    return {
+        'total_students': snapshot.total_students,
+        'total_employees': snapshot.total_employees,
+        'iot_students': snapshot.iot_students,
+        'sod_students': snapshot.sod_students,
+        **financial.as_dict(),
+        'recent_transactions': recent_transactions,
+        'recent_activities': recent_activities,
+        'activities_next_cursor': activities_next_cursor,
+        'students': students,
+        'students_next_cursor': students_next_cursor,
+        'employees': employees,
+        'employees_next_cursor': employees_next_cursor,
+        'grid_page_size': GRID_PAGE_SIZE,
+        'user_list': user_list,
+        'most_active_users': most_active_users,
+    }
+
+ACTIVITY_PAGE_SIZE = 20
+
+ACTIVITY_SORTS = {
+    'timestamp_desc': ('timestamp', True),
+    'timestamp_asc': ('timestamp', False),
+    'action_asc': ('action', False),
+    'action_desc': ('action', True),
+}
+
+def _day_start(value):
+    """Parse a YYYY-MM-DD string into an aware datetime at midnight, or None if invalid."""
+    try:
+        day = parse_date(value or '')
+    except ValueError:
+        return None
+    if day is None:
+        return None
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+def _activity_queryset(request):
+    queryset = RecentActivity.objects.all()
+
+    # Filtering by user
+    user_filter = request.GET.get('user')
+    if user_filter:
+        queryset = queryset.filter(user__username__icontains=user_filter)
+
+    # Filtering by action text search
+    action_search = request.GET.get('action_search')
+    if action_search:
+        queryset = queryset.filter(action__icontains=action_search)
+
+    # Filtering by date range, as plain timestamp bounds so the timestamp index is usable
+    start = _day_start(request.GET.get('start_date'))
+    if start is not None:
+        queryset = queryset.filter(timestamp__gte=start)
+    end = _day_start(request.GET.get('end_date'))
+    if end is not None:
+        queryset = queryset.filter(timestamp__lt=end + datetime.timedelta(days=1))
+    return queryset
+
+@login_required
+@condition(etag_func=version_etag(('RecentActivity',)))
+def activity_feed(request):
+    """One cursor-paginated page of the recent activity feed as JSON."""
+    sort_field, descending = ACTIVITY_SORTS.get(request.GET.get('sort_by'), ACTIVITY_SORTS['timestamp_desc'])
+    queryset = _activity_queryset(request).values(
+        'id', 'action', 'icon_class', 'timestamp', username=F('user__username'),
+    )
+    try:
+        rows, next_cursor = keyset_page(
+            queryset, sort_field, descending,
+            cursor=request.GET.get('cursor'),
+            page_size=get_page_size(request, ACTIVITY_PAGE_SIZE),
+        )
+    except InvalidCursor as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    activities = [{
+        'id': row['id'],
+        'action': row['action'],
+        'icon_class': row['icon_class'],
+        'timestamp': row['timestamp'].isoformat(),
+        'user': row['username'],
+    } for row in rows]
+    return JsonResponse({'success': True, 'activities': activities, 'next_cursor': next_cursor})
+
+GRID_PAGE_SIZE = 10
+
+# sort option -> (keyset sort field, descending)
+STUDENT_GRID_SORTS = {
+    'name_asc': ('name', False),
+    'name_desc': ('name', True),
+    'date_asc': ('enrollment_date', False),
+    'date_desc': ('enrollment_date', True),
+}
+
+EMPLOYEE_GRID_SORTS = {
+    'name_asc': ('sort_name', False),
+    'name_desc': ('sort_name', True),
+    'date_asc': ('hire_date', False),
+    'date_desc': ('hire_date', True),
+}
+
+STUDENT_TYPE_LABELS = dict(Student.TYPE_CHOICES)
+STUDENT_PROGRAM_LABELS = dict(Student.PROGRAM_CHOICES)
+STUDENT_STATUS_LABELS = dict(Student.STATUS_CHOICES)
+
+def _student_grid_queryset(request):
+    queryset = Student.objects.all()
+    search = request.GET.get('search', '').strip()
+    if search:
+        queryset = queryset.filter(name__icontains=search)
+    student_type = request.GET.get('type')
+    if student_type:
+        queryset = queryset.filter(type__startswith=student_type)
+    program = request.GET.get('program')
+    if program:
+        queryset = queryset.filter(program=program)
+    return queryset
+
+def _employee_grid_queryset(request):
+    # first/last name are nullable, so sort on a coalesced name to keep cursors comparable
+    queryset = Employee.objects.annotate(
+        sort_name=Concat(Coalesce('first_name', Value('')), Value(' '), Coalesce('last_name', Value('')))
+    )
+    search = request.GET.get('search', '').strip()
+    if search:
+        queryset = queryset.filter(
+            Q(first_name__icontains=search) |
+            Q(last_name__icontains=search) |
+            Q(position__icontains=search) |
+            Q(department__icontains=search)
+        )
+    return queryset
+
+def _grid_response(request, queryset, sorts, serialize_row, total):
+    # total is the unfiltered row count from the dashboard snapshot, or None when filters apply
+    sort_field, descending = sorts.get(request.GET.get('sort', 'name_asc'), sorts['name_asc'])
+    try:
+        rows, next_cursor = keyset_page(
+            queryset, sort_field, descending,
+            cursor=request.GET.get('cursor'),
+            page_size=get_page_size(request, GRID_PAGE_SIZE),
+        )
+    except InvalidCursor as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    return JsonResponse({
+        'success': True,
+        'results': [serialize_row(row) for row in rows],
+        'next_cursor': next_cursor,
+        'total': total,
+    })
+
+@login_required
+def students_grid(request):
+    """One keyset-paginated page of the students grid as JSON."""
+    queryset = _student_grid_queryset(request).values(
+        'id', 'name', 'type', 'address', 'program', 'level', 'enrollment_date',
+        'photo', 'total_sessions', 'attended_sessions', 'current_status',
+    )
+
+    def serialize_row(row):
+        total_sessions = row['total_sessions']
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'type': row['type'],
+            'type_display': STUDENT_TYPE_LABELS.get(row['type'], row['type']),
+            'address': row['address'],
+            'program': row['program'],
+            'program_display': STUDENT_PROGRAM_LABELS.get(row['program'], row['program']),
+            'level': row['level'],
+            'enrollment_date': row['enrollment_date'].isoformat(),
+            'photo_url': f"{settings.MEDIA_URL}{row['photo']}" if row['photo'] else None,
+            'attendance_percentage': (row['attended_sessions'] / total_sessions) * 100 if total_sessions else 0,
+            'current_status_display': STUDENT_STATUS_LABELS.get(row['current_status'], row['current_status']),
+        }
+
+    filtered = any(request.GET.get(key) for key in ('search', 'type', 'program'))
+    total = None if filtered else DashboardSnapshot.load().total_students
+    return _grid_response(request, queryset, STUDENT_GRID_SORTS, serialize_row, total)
+
+@login_required
+def employees_grid(request):
+    """One keyset-paginated page of the employees grid as JSON."""
+    queryset = _employee_grid_queryset(request).values(
+        'id', 'sort_name', 'first_name', 'middle_name', 'last_name', 'email', 'phone',
+        'position', 'department', 'salary', 'hire_date',
+    )
+
+    def serialize_row(row):
+        names = [row['first_name'], row['middle_name'], row['last_name']]
+        return {
+            'id': row['id'],
+            'name': ' '.join(str(name) for name in names if name),
+            'email': row['email'],
+            'phone': row['phone'],
+            'position': row['position'],
+            'department': row['department'],
+            'salary': str(row['salary']),
+            'hire_date': row['hire_date'].isoformat(),
+        }
+
+    total = None if request.GET.get('search') else DashboardSnapshot.load().total_employees
+    return _grid_response(request, queryset, EMPLOYEE_GRID_SORTS, serialize_row, total)
+
 @login_required
 def student_report_detail(request, student_id):
-    student = get_object_or_404(Student, id=student_id)
+    student = cached(
+        'student_report', [student_id], ('Student',),
+        lambda: Student.objects.filter(id=student_id).first(),
+    )
+    if student is None:
+        raise Http404("No Student matches the given query.")
     return render(request, 'admin_panel/student_report_detail.html', {'student': student})
 
 @login_required
 def employment_report_detail(request, employee_id):
-    employee = get_object_or_404(Employee, id=employee_id)
+    employee = cached(
+        'employment_report', [employee_id], ('Employee',),
+        lambda: Employee.objects.filter(id=employee_id).first(),
+    )
+    if employee is None:
+        raise Http404("No Employee matches the given query.")
     return render(request, 'admin_panel/employment_report_detail.html', {'employee': employee})
 
 @login_required
 def export_student_report_pdf(request, student_id):
     student = get_object_or_404(Student, id=student_id)
-    buffer = io.BytesIO()
-    p = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
-
-    y = height - 50
-    p.setFont("Helvetica-Bold", 16)
-    p.drawString(50, y, f"Student Report: {student.name}")
-    y -= 30
-
-    p.setFont("Helvetica", 12)
-    p.drawString(50, y, f"Student ID: {student.student_id}")
-    y -= 20
-    p.drawString(50, y, f"Email: {student.email}")
-    y -= 20
-    p.drawString(50, y, f"Phone: {student.phone}")
-    y -= 20
-    p.drawString(50, y, f"Address: {student.address}")
-    y -= 30
-
-    # Add more fields as needed...
-
-    p.showPage()
-    p.save()
-    buffer.seek(0)
-    response = HttpResponse(buffer, content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="{student.name}_report.pdf"'
+    if _wants_background(request):
+        return _enqueue_job(request, 'student_report_pdf', student_id=student.id)
+    return FileResponse(artifacts.student_report(student, artifacts.PDF), as_attachment=True,
+                        filename=f"{student.name}_report.pdf", content_type=reports.PDF_CONTENT_TYPE)
+
+@login_required
+def export_student_reports(request):
+    """
+    The PDF reports of the filtered students (see exports.student_report_queryset)
+    as one ZIP: a background job by default, streamed in the request with ``?sync=1``.
+    """
+    params = request.POST if request.method == 'POST' else request.GET
+    try:
+        queryset = exports.student_report_queryset(params)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid student id'}, status=400)
+    # Archives run as a job unless ?sync=1 asks for the streamed download
+    if _wants_background(request, default=True):
+        return _enqueue_job(request, 'student_report_archive', filters=_export_filters(params))
+    response = StreamingHttpResponse(exports.iter_student_report_archive(queryset), content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="student_reports_{timezone.localdate():%Y%m%d}.zip"'
     return response
 
 @login_required
 def export_student_report_excel(request, student_id):
     student = get_object_or_404(Student, id=student_id)
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Student Report"
-
-    ws.append(["Field", "Value"])
-    ws.append(["Name", student.name])
-    ws.append(["Student ID", student.student_id])
-    ws.append(["Email", student.email])
-    ws.append(["Phone", student.phone])
-    ws.append(["Address", student.address])
-    ws.append(["Enrollment Date", student.enrollment_date.strftime("%Y-%m-%d")])
-    ws.append(["Type", student.get_type_display()])
-    ws.append(["Category", student.category])
-    ws.append(["Program", student.get_program_display()])
-    ws.append(["Level", student.level])
-    ws.append(["Total Sessions", student.total_sessions])
-    ws.append(["Attended Sessions", student.attended_sessions])
-    ws.append(["Absences", student.absences])
-    ws.append(["Participation Score", float(student.participation_score)])
-    ws.append(["Average Scores", float(student.avg_scores)])
-    ws.append(["Project Completion Rate", float(student.project_completion_rate)])
-    ws.append(["Certifications", student.certifications])
-    ws.append(["Hackathons Attended", student.hackathons_attended])
-    ws.append(["Awards", student.awards])
-    ws.append(["Contributions", student.contributions])
-    ws.append(["Mentor Comments", student.mentor_comments])
-    ws.append(["Peer Reviews", student.peer_reviews])
-    ws.append(["Strengths", student.strengths])
-    ws.append(["Areas for Improvement", student.areas_for_improvement])
-    ws.append(["Current Status", student.get_current_status_display()])
-    ws.append(["Next Steps", student.next_steps])
-    ws.append(["Graduation Eligibility", "Yes" if student.graduation_eligibility else "No"])
-
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = f'attachment; filename="{student.name}_report.xlsx"'
-    wb.save(response)
-    return response
+    if _wants_background(request):
+        return _enqueue_job(request, 'student_report_excel', student_id=student.id)
+    return FileResponse(artifacts.student_report(student, artifacts.XLSX), as_attachment=True,
+                        filename=f"{student.name}_report.xlsx", content_type=reports.XLSX_CONTENT_TYPE)
 
 @login_required
 def email_student_report(request, student_id):
     student = get_object_or_404(Student, id=student_id)
     if request.method == 'POST':
-        recipient_email = request.POST.get('email')
-        if recipient_email:
-            subject = f"Student Report: {student.name}"
-            message = render_to_string('admin_panel/email_student_report.html', {'student': student})
-            email = EmailMessage(subject, message, to=[recipient_email])
-            email.content_subtype = "html"
-            email.send()
-            return JsonResponse({'success': True, 'message': 'Email sent successfully'})
-        return JsonResponse({'success': False, 'message': 'Recipient email is required'})
+        return _queue_report_email(request, outbox.student_report_email(student), request.POST.get('email'))
     return JsonResponse({'success': False, 'message': 'Invalid request method'})
 
 @login_required
 def delete_recent_activity(request, activity_id):
     if request.method == 'POST':
         activity = get_object_or_404(RecentActivity, id=activity_id)
-        # Save to TrashBinEntry before deleting
-        TrashBinEntry.objects.create(
-            user=request.user,
-            item_type='RecentActivity',
-            item_id=activity.id,
-            item_data={
-                'action': activity.action,
-                'icon_class': activity.icon_class,
-                'timestamp': activity.timestamp.isoformat(),
-            },
-            deleted_at=timezone.now()
-        )
-        activity.delete()
+        trash.trash_object(activity, request.user)
         if request.headers.get('x-requested-with') == 'XMLHttpRequest':
             return JsonResponse({'success': True})
         return redirect('admin_panel:dashboard')
     return JsonResponse({'success': False, 'error': 'Invalid request method'})
 
-import uuid
-
 @require_POST
 @login_required
 def add_student(request):
-    def generate_unique_student_id():
-        return str(uuid.uuid4())[:8]  # Short unique ID
-
     name = request.POST.get('student-name')
     type_ = request.POST.get('student-type')
     program = request.POST.get('student-program')
     level = request.POST.get('student-level')
     address = request.POST.get('student-address')
     if name and type_ and program and level and address:
-        student_id = generate_unique_student_id()
-        student = Student.objects.create(
-            name=name,
-            student_id=student_id,
-            type=type_,
-            program=program,
-            level=level,
-            address=address,
-        )
+        with transaction.atomic():
+            student_id = allocate_student_ids(1)[0]
+            student = Student.objects.create(
+                name=name,
+                student_id=student_id,
+                type=type_,
+                program=program,
+                level=level,
+                address=address,
+            )
+            # The same satellite rows a roster import creates
+            for satellite in student_satellites(student):
+                satellite.save()
         # Create recent activity
         RecentActivity.objects.create(
             user=request.user,
@@ -282,9 +405,7 @@ def add_student(request):
         )
         if request.headers.get('x-requested-with') == 'XMLHttpRequest':
             # AJAX request
-            total_students = Student.objects.count()
-            iot_students = Student.objects.filter(program='iot').count()
-            sod_students = Student.objects.filter(program='sod').count()
+            snapshot = DashboardSnapshot.load()
             return JsonResponse({
                 'success': True,
             'student': {
@@ -297,9 +418,9 @@ def add_student(request):
                 'level': student.level,
             },
                 'counts': {
-                    'total_students': total_students,
-                    'iot_students': iot_students,
-                    'sod_students': sod_students,
+                    'total_students': snapshot.total_students,
+                    'iot_students': snapshot.iot_students,
+                    'sod_students': snapshot.sod_students,
                 }
             })
     return redirect('admin_panel:dashboard')
@@ -326,11 +447,8 @@ def add_employee(request):
         )
         if request.headers.get('x-requested-with') == 'XMLHttpRequest':
             # AJAX request
-            total_employees = Employee.objects.count()
-            total_salaries = Employee.objects.aggregate(Sum('salary'))['salary__sum'] or 0
-            transport_expenses = Expense.objects.filter(type=Expense.TRANSPORT).aggregate(Sum('amount'))['amount__sum'] or 0
-            other_expenses = Expense.objects.filter(type=Expense.OTHER).aggregate(Sum('amount'))['amount__sum'] or 0
-            total_expenses = total_salaries + transport_expenses + other_expenses
+            snapshot = DashboardSnapshot.load()
+            financial = get_financial_summary(request, snapshot)
             return JsonResponse({
                 'success': True,
                 'employee': {
@@ -341,11 +459,11 @@ def add_employee(request):
                     'salary': str(employee.salary),
                 },
                 'financial': {
-                    'total_salaries': total_salaries,
-                    'total_expenses': total_expenses,
+                    'total_salaries': financial.total_salaries,
+                    'total_expenses': financial.total_expenses,
                 },
                 'counts': {
-                    'total_employees': total_employees,
+                    'total_employees': snapshot.total_employees,
                 }
             })
     if request.headers.get('x-requested-with') == 'XMLHttpRequest':
@@ -388,21 +506,13 @@ def update_student(request, student_id):
 def delete_student(request, student_id):
     student = get_object_or_404(Student, id=student_id)
     if request.method == 'POST':
-        # Save to TrashBinEntry before deleting
-        TrashBinEntry.objects.create(
-            user=request.user,
-            item_type='Student',
-            item_id=student.id,
-            item_data=json.loads(serialize('json', [student]))[0]['fields'],
-            deleted_at=timezone.now()
-        )
         # Create recent activity before deleting
         RecentActivity.objects.create(
             user=request.user,
             action=f"Deleted trainee {student.name} from {student.get_program_display()} program",
             icon_class="fas fa-trash text-red-500"
         )
-        student.delete()
+        trash.trash_object(student, request.user)
         return redirect('admin_panel:dashboard')
     context = {'student': student}
     return render(request, 'admin_panel/delete_student.html', context)
@@ -420,21 +530,8 @@ def bulk_delete_students(request):
             if not student_ids:
                 return JsonResponse({'success': False, 'error': 'No student IDs provided'})
 
-            students = Student.objects.filter(id__in=student_ids)
-            deleted_count = 0
-            for student in students:
-                # Save to TrashBinEntry before deleting
-                TrashBinEntry.objects.create(
-                    user=request.user,
-                    item_type='Student',
-                    item_id=student.id,
-                    item_data=json.loads(serialize('json', [student]))[0]['fields'],
-                    deleted_at=timezone.now()
-                )
-                deleted_count += 1
-
-            # Bulk delete
-            students.delete()
+            # Soft-deletes in chunks and records the trash entries, in one transaction
+            deleted_count = trash.move_to_trash(Student, student_ids, request.user)
 
             # Create recent activity
             RecentActivity.objects.create(
@@ -481,21 +578,13 @@ def update_employee(request, employee_id):
 def delete_employee(request, employee_id):
     employee = get_object_or_404(Employee, id=employee_id)
     if request.method == 'POST':
-        # Save to TrashBinEntry before deleting
-        TrashBinEntry.objects.create(
-            user=request.user,
-            item_type='Employee',
-            item_id=employee.id,
-            item_data=json.loads(serialize('json', [employee]))[0]['fields'],
-            deleted_at=timezone.now()
-        )
         # Create recent activity before deleting
         RecentActivity.objects.create(
             user=request.user,
             action=f"Deleted employee {employee.name} from {employee.department} department",
             icon_class="fas fa-trash text-red-500"
         )
-        employee.delete()
+        trash.trash_object(employee, request.user)
         return redirect('admin_panel:dashboard')
     context = {'employee': employee}
     return render(request, 'admin_panel/delete_employee.html', context)
@@ -526,84 +615,134 @@ def add_expense(request):
         )
         if request.headers.get('x-requested-with') == 'XMLHttpRequest':
             # AJAX request
-            total_salaries = Employee.objects.aggregate(Sum('salary'))['salary__sum'] or 0
-            transport_expenses = Expense.objects.filter(type=Expense.TRANSPORT).aggregate(Sum('amount'))['amount__sum'] or 0
-            other_expenses = Expense.objects.filter(type=Expense.OTHER).aggregate(Sum('amount'))['amount__sum'] or 0
-            total_expenses = total_salaries + transport_expenses + other_expenses
-            return JsonResponse({
-                'success': True,
-                'total_salaries': total_salaries,
-                'transport_expenses': transport_expenses,
-                'other_expenses': other_expenses,
-                'total_expenses': total_expenses,
-            })
+            return JsonResponse({'success': True, **get_financial_summary(request).as_dict()})
     if request.headers.get('x-requested-with') == 'XMLHttpRequest':
         return JsonResponse({'success': False, 'error': 'Missing required fields'})
     return redirect('admin_panel:dashboard')
 
-def recent_transactions(request):
-    # Get query params for filtering, sorting, searching
-    search_query = request.GET.get('search', '').strip()
-    sort_by = request.GET.get('sort_by', 'date_desc')
-    filter_type = request.GET.get('filter_type', '')
+TRANSACTION_PAGE_SIZE = 50
+TRANSACTION_STREAM_CHUNK_SIZE = 2000
+TRANSACTION_FIELDS = ('id', 'date', 'type', 'description', 'amount')
+TRANSACTION_TYPE_LABELS = dict(Transaction.TYPE_CHOICES)
 
-    transactions_qs = Transaction.objects.all()
+# sort option -> (keyset sort field, descending)
+TRANSACTION_SORTS = {
+    'date_desc': ('date', True),
+    'date_asc': ('date', False),
+    'amount_desc': ('amount', True),
+    'amount_asc': ('amount', False),
+}
+
+def _transaction_queryset(request):
+    queryset = Transaction.objects.values(*TRANSACTION_FIELDS)
 
     # Filter by type if provided
+    filter_type = request.GET.get('filter_type', '')
     if filter_type:
-        transactions_qs = transactions_qs.filter(type=filter_type)
+        queryset = queryset.filter(type=filter_type)
 
-    # Search in description and type display
+    # Search in description and type
+    search_query = request.GET.get('search', '').strip()
     if search_query:
-        transactions_qs = transactions_qs.filter(
+        queryset = queryset.filter(
             Q(description__icontains=search_query) |
             Q(type__icontains=search_query)
         )
+    return queryset
+
+def _transaction_row(row):
+    return {
+        'id': row['id'],
+        'date': row['date'].isoformat(),
+        'type': TRANSACTION_TYPE_LABELS.get(row['type'], row['type']),
+        'description': row['description'],
+        'amount': str(row['amount']),
+    }
 
-    # Sorting
-    if sort_by == 'date_asc':
-        transactions_qs = transactions_qs.order_by('date')
-    elif sort_by == 'date_desc':
-        transactions_qs = transactions_qs.order_by('-date')
-    elif sort_by == 'amount_asc':
-        transactions_qs = transactions_qs.order_by('amount')
-    elif sort_by == 'amount_desc':
-        transactions_qs = transactions_qs.order_by('-amount')
-    else:
-        transactions_qs = transactions_qs.order_by('-date')
-
-    # Limit to 50 for performance
-    transactions = transactions_qs[:50]
-
-    data = []
-    for tx in transactions:
-        data.append({
-            'id': tx.id,
-            'date': tx.date.strftime('%Y-%m-%d'),
-            'type': tx.get_type_display(),
-            'description': tx.description,
-            'amount': str(tx.amount),
-        })
-    return JsonResponse({'transactions': data})
+def _stream_transactions(queryset):
+    for row in queryset.iterator(chunk_size=TRANSACTION_STREAM_CHUNK_SIZE):
+        yield json.dumps(_transaction_row(row)) + '\n'
+
+@login_required
+@condition(etag_func=version_etag(('Transaction',)))
+def recent_transactions(request):
+    """
+    Transactions matching the search/filter/sort query parameters, one
+    cursor-paginated page at a time, or the whole result streamed as NDJSON
+    with ``format=ndjson``.
+    """
+    sort_field, descending = TRANSACTION_SORTS.get(request.GET.get('sort_by'), TRANSACTION_SORTS['date_desc'])
+    queryset = _transaction_queryset(request)
+
+    if request.GET.get('format') == 'ndjson':
+        direction = '-' if descending else ''
+        queryset = queryset.order_by(f'{direction}{sort_field}', f'{direction}id')
+        return StreamingHttpResponse(_stream_transactions(queryset), content_type='application/x-ndjson')
+
+    try:
+        rows, next_cursor = keyset_page(
+            queryset, sort_field, descending,
+            cursor=request.GET.get('cursor'),
+            page_size=get_page_size(request, TRANSACTION_PAGE_SIZE),
+        )
+    except InvalidCursor as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    return JsonResponse({
+        'transactions': [_transaction_row(row) for row in rows],
+        'next_cursor': next_cursor,
+    })
 
 @login_required
 @require_POST
 def ajax_delete_transaction(request, transaction_id):
     try:
         transaction = Transaction.objects.get(id=transaction_id)
-        # Save to TrashBinEntry before deleting
-        TrashBinEntry.objects.create(
-            user=request.user,
-            item_type='Transaction',
-            item_id=transaction.id,
-            item_data=json.loads(serialize('json', [transaction]))[0]['fields'],
-            deleted_at=timezone.now()
-        )
-        transaction.delete()
+        trash.trash_object(transaction, request.user)
         return JsonResponse({'success': True})
     except Transaction.DoesNotExist:
         return JsonResponse({'success': False, 'error': 'Transaction not found'})
 
+@require_POST
+@login_required
+def import_students(request):
+    """Enroll a roster of students from an uploaded XLSX or CSV file."""
+    upload = request.FILES.get('file')
+    if upload is None:
+        return JsonResponse({'success': False, 'error': 'No file uploaded'}, status=400)
+    fmt = request.POST.get('format') or imports.format_for_filename(upload.name)
+    if fmt not in imports.ROSTER_FORMATS:
+        return JsonResponse({'success': False, 'error': f'Unsupported format: {fmt}'}, status=400)
+    try:
+        if fmt == imports.XLSX:
+            records = imports.read_xlsx_records(upload)
+        else:
+            records = imports.read_records(upload, fmt)
+        result = imports.import_roster(records, request.user, source_name=upload.name)
+    except UnicodeDecodeError:
+        return JsonResponse({'success': False, 'error': 'File must be UTF-8 encoded'}, status=400)
+    except (zipfile.BadZipFile, KeyError):
+        return JsonResponse({'success': False, 'error': 'Not a valid XLSX workbook'}, status=400)
+    return JsonResponse({'success': True, **result.as_dict()})
+
+@require_POST
+@login_required
+def import_ledger(request, kind):
+    """Bulk import transactions or expenses from an uploaded CSV or NDJSON file."""
+    model = imports.LEDGER_MODELS.get(kind)
+    if model is None:
+        return JsonResponse({'success': False, 'error': f'Unknown import kind: {kind}'}, status=404)
+    upload = request.FILES.get('file')
+    if upload is None:
+        return JsonResponse({'success': False, 'error': 'No file uploaded'}, status=400)
+    fmt = request.POST.get('format') or imports.format_for_filename(upload.name)
+    if fmt not in imports.IMPORT_FORMATS:
+        return JsonResponse({'success': False, 'error': f'Unsupported format: {fmt}'}, status=400)
+    try:
+        result = imports.import_ledger(upload, model, fmt, request.user, source_name=upload.name)
+    except UnicodeDecodeError:
+        return JsonResponse({'success': False, 'error': 'File must be UTF-8 encoded'}, status=400)
+    return JsonResponse({'success': True, **result.as_dict()})
+
 @login_required
 def update_expense(request, expense_id):
     expense = get_object_or_404(Expense, id=expense_id)
@@ -626,21 +765,13 @@ def update_expense(request, expense_id):
 def delete_expense(request, expense_id):
     expense = get_object_or_404(Expense, id=expense_id)
     if request.method == 'POST':
-        # Save to TrashBinEntry before deleting
-        TrashBinEntry.objects.create(
-            user=request.user,
-            item_type='Expense',
-            item_id=expense.id,
-            item_data=json.loads(serialize('json', [expense]))[0]['fields'],
-            deleted_at=timezone.now()
-        )
         # Create recent activity before deleting
         RecentActivity.objects.create(
             user=request.user,
             action=f"Deleted expense: {expense.description} - ${expense.amount}",
             icon_class="fas fa-trash text-red-500"
         )
-        expense.delete()
+        trash.trash_object(expense, request.user)
         return redirect('admin_panel:dashboard')
     context = {'expense': expense}
     return render(request, 'admin_panel/delete_expense.html', context)
@@ -682,215 +813,331 @@ def update_transaction(request, transaction_id):
 def delete_transaction(request, transaction_id):
     transaction = get_object_or_404(Transaction, id=transaction_id)
     if request.method == 'POST':
-        transaction.delete()
+        trash.trash_object(transaction, request.user)
         return redirect('admin_panel:dashboard')
     context = {'transaction': transaction}
     return render(request, 'admin_panel/delete_transaction.html', context)
 
+# The student columns the tabs receive; deleted_at and anything added later stay out of the payload
+STUDENT_TAB_FIELDS = (
+    'id', 'name', 'student_id', 'email', 'phone', 'address', 'enrollment_date', 'photo', 'type', 'category',
+    'program', 'level', 'total_sessions', 'attended_sessions', 'absences', 'participation_score', 'avg_scores',
+    'project_completion_rate', 'certifications', 'progress_graph_data', 'hackathons_attended', 'awards',
+    'contributions', 'mentor_comments', 'peer_reviews', 'strengths', 'areas_for_improvement', 'current_status',
+    'next_steps', 'graduation_eligibility',
+)
+
+@login_required
+@condition(etag_func=version_etag(('Student',)))
 def fetch_tab_data(request, tab_name):
     if tab_name == 'trainees':
-        data = Student.objects.filter(type='trainee').values()
+        data = Student.objects.filter(type='trainee').values(*STUDENT_TAB_FIELDS)
     elif tab_name == 'internees':
-        data = Student.objects.filter(type='internee').values()
+        data = Student.objects.filter(type='internee').values(*STUDENT_TAB_FIELDS)
     elif tab_name == 'iot':
-        data = Student.objects.filter(type='iot').values()
+        data = Student.objects.filter(type='iot').values(*STUDENT_TAB_FIELDS)
     elif tab_name == 'sod':
-        data = Student.objects.filter(type='sod').values()
+        data = Student.objects.filter(type='sod').values(*STUDENT_TAB_FIELDS)
     else:
         data = []
 
     return JsonResponse({'data': list(data)})
 
+SEARCH_PAGE_SIZE = 20
+
 @login_required
 def search(request):
     query = request.GET.get('q', '').strip()
-    students = []
-    employees = []
-    expenses = []
-
-    if query:
-        students = Student.objects.filter(
-            Q(name__icontains=query) |
-            Q(type__icontains=query) |
-            Q(category__icontains=query) |
-            Q(program__icontains=query) |
-            Q(level__icontains=query)
-        )
-        employees = Employee.objects.filter(
-            Q(name__icontains=query) |
-            Q(position__icontains=query) |
-            Q(department__icontains=query)
-        )
-        expenses = Expense.objects.filter(
-            Q(description__icontains=query) |
-            Q(type__icontains=query)
-        )
+    entity_type = request.GET.get('type') or None
+    if entity_type not in search_index.SEARCH_MODELS:
+        entity_type = None
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+
+    hits, has_next = search_index.search(query, entity_type=entity_type, page=page, page_size=SEARCH_PAGE_SIZE)
+    students = [hit.obj for hit in hits if hit.entity_type == SearchDocument.STUDENT]
+    employees = [hit.obj for hit in hits if hit.entity_type == SearchDocument.EMPLOYEE]
+    expenses = [hit.obj for hit in hits if hit.entity_type == SearchDocument.EXPENSE]
+
+    if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+        return JsonResponse({
+            'results': [
+                {'type': hit.entity_type, 'id': hit.entity_id, 'title': hit.title}
+                for hit in hits
+            ],
+            'students': [
+                {'id': s.id, 'name': s.name, 'type': s.get_type_display(), 'program': s.get_program_display(), 'level': s.level}
+                for s in students
+            ],
+            'employees': [
+                {'id': e.id, 'first_name': e.first_name, 'last_name': e.last_name, 'position': e.position, 'department': e.department}
+                for e in employees
+            ],
+            'expenses': [
+                {'id': e.id, 'type': e.get_type_display(), 'description': e.description, 'amount': str(e.amount)}
+                for e in expenses
+            ],
+            'page': page,
+            'has_next': has_next,
+        })
 
     context = {
         'query': query,
         'students': students,
         'employees': employees,
         'expenses': expenses,
+        'page': page,
+        'has_next': has_next,
+        'entity_type': entity_type or '',
     }
     return render(request, 'admin_panel/search_results.html', context)
 
+TYPEAHEAD_LIMIT = 10
+
+@login_required
+def typeahead_view(request):
+    """Top-K student/employee name and ID prefix matches from the in-memory index."""
+    entity_type = request.GET.get('type') or None
+    if entity_type not in ('student', 'employee'):
+        entity_type = None
+    try:
+        limit = min(max(int(request.GET.get('limit', TYPEAHEAD_LIMIT)), 1), 50)
+    except ValueError:
+        limit = TYPEAHEAD_LIMIT
+    suggestions = typeahead.suggest(request.GET.get('q', ''), limit=limit, entity_type=entity_type)
+    return JsonResponse({'results': [suggestion._asdict() for suggestion in suggestions]})
+
 @login_required
 def export_employment_report_pdf(request, employee_id):
     employee = get_object_or_404(Employee, id=employee_id)
-    buffer = io.BytesIO()
-    p = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
-
-    y = height - 50
-    p.setFont("Helvetica-Bold", 16)
-    p.drawString(50, y, f"Employee Report: {employee.name}")
-    y -= 30
-
-    p.setFont("Helvetica", 12)
-    p.drawString(50, y, f"Position: {employee.position}")
-    y -= 20
-    p.drawString(50, y, f"Department: {employee.department}")
-    y -= 20
-    p.drawString(50, y, f"Salary: {employee.salary}")
-    y -= 30
-
-    # Add more fields as needed...
-
-    p.showPage()
-    p.save()
-    buffer.seek(0)
-    response = HttpResponse(buffer, content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="{employee.name}_report.pdf"'
-    return response
+    if _wants_background(request):
+        return _enqueue_job(request, 'employment_report_pdf', employee_id=employee.id)
+    return FileResponse(artifacts.employee_report(employee, artifacts.PDF), as_attachment=True,
+                        filename=f"{employee.name}_report.pdf", content_type=reports.PDF_CONTENT_TYPE)
 
 @login_required
 def export_employment_report_excel(request, employee_id):
     employee = get_object_or_404(Employee, id=employee_id)
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Employee Report"
-
-    ws.append(["Field", "Value"])
-    ws.append(["Name", employee.name])
-    ws.append(["Position", employee.position])
-    ws.append(["Department", employee.department])
-    ws.append(["Salary", str(employee.salary)])
-
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = f'attachment; filename="{employee.name}_report.xlsx"'
-    wb.save(response)
-    return response
+    if _wants_background(request):
+        return _enqueue_job(request, 'employment_report_excel', employee_id=employee.id)
+    return FileResponse(artifacts.employee_report(employee, artifacts.XLSX), as_attachment=True,
+                        filename=f"{employee.name}_report.xlsx", content_type=reports.XLSX_CONTENT_TYPE)
 
 @login_required
 def email_employment_report(request, employee_id):
     employee = get_object_or_404(Employee, id=employee_id)
     if request.method == 'POST':
-        recipient_email = request.POST.get('email')
-        if recipient_email:
-            subject = f"Employee Report: {employee.name}"
-            message = render_to_string('admin_panel/email_employment_report.html', {'employee': employee})
-            email = EmailMessage(subject, message, to=[recipient_email])
-            email.content_subtype = "html"
-            email.send()
-            return JsonResponse({'success': True, 'message': 'Email sent successfully'})
-        return JsonResponse({'success': False, 'message': 'Recipient email is required'})
+        return _queue_report_email(request, outbox.employee_report_email(employee), request.POST.get('email'))
     return JsonResponse({'success': False, 'message': 'Invalid request method'})
 
 @login_required
 def financial_report_detail(request):
-    total_salaries = Employee.objects.aggregate(Sum('salary'))['salary__sum'] or 0
-    transport_expenses = Expense.objects.filter(type=Expense.TRANSPORT).aggregate(Sum('amount'))['amount__sum'] or 0
-    other_expenses = Expense.objects.filter(type=Expense.OTHER).aggregate(Sum('amount'))['amount__sum'] or 0
-    total_expenses = total_salaries + transport_expenses + other_expenses
-    recent_transactions = Transaction.objects.order_by('-date')[:10]
-    context = {
-        'total_salaries': total_salaries,
-        'transport_expenses': transport_expenses,
-        'other_expenses': other_expenses,
-        'total_expenses': total_expenses,
-        'recent_transactions': recent_transactions,
-    }
+    context = cached(
+        'financial_report', [], ('Employee', 'Expense', 'Transaction'),
+        lambda: _financial_report_context(request),
+    )
     return render(request, 'admin_panel/financial_report_detail.html', context)
 
+def _financial_report_context(request):
+    recent_transactions = list(Transaction.objects.order_by('-date')[:10])
+    return dict(get_financial_summary(request).as_dict(), recent_transactions=recent_transactions)
+
+LEDGER_DEFAULT_MONTHS = 12
+
+@login_required
+@condition(etag_func=version_etag(('Transaction', 'Expense')))
+def ledger_rollups(request):
+    """
+    Per-bucket ledger totals for a date range, read from the rollup tables.
+    Defaults to the last twelve months by month.
+    """
+    granularity = request.GET.get('granularity', ledger.MONTH)
+    if granularity not in ledger.ROLLUP_MODELS:
+        return JsonResponse({'success': False, 'error': f'Unknown granularity: {granularity}'}, status=400)
+    try:
+        end = parse_date(request.GET['end']) if request.GET.get('end') else timezone.localdate()
+        start = parse_date(request.GET['start']) if request.GET.get('start') else None
+    except ValueError:
+        end = start = None
+    if end is None or (request.GET.get('start') and start is None):
+        return JsonResponse({'success': False, 'error': 'Dates must be YYYY-MM-DD'}, status=400)
+    if start is None:
+        start = ledger.month_start(end)
+        for _ in range(LEDGER_DEFAULT_MONTHS - 1):
+            start = ledger.month_start(start - datetime.timedelta(days=1))
+    if start > end:
+        return JsonResponse({'success': False, 'error': 'start must not be after end'}, status=400)
+
+    source = request.GET.get('source') or None
+    type_ = request.GET.get('type') or None
+    series = [{
+        'bucket': row['bucket'].isoformat(),
+        'source': row['source'],
+        'type': row['type'],
+        'count': row['count'],
+        'total': str(row['total']),
+    } for row in ledger.series(start, end, granularity, source, type_)]
+    totals = [{
+        'source': row_source,
+        'type': row_type,
+        'count': entry['count'],
+        'total': str(entry['total']),
+    } for (row_source, row_type), entry in sorted(ledger.period_totals(start, end, source, type_).items())]
+    return JsonResponse({
+        'success': True,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'granularity': granularity,
+        'series': series,
+        'totals': totals,
+    })
+
+@login_required
+def cache_stats_view(request):
+    return JsonResponse({'success': True, 'stats': cache_stats()})
+
 @login_required
 def export_financial_report_pdf(request):
-    buffer = io.BytesIO()
-    p = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
-
-    y = height - 50
-    p.setFont("Helvetica-Bold", 16)
-    p.drawString(50, y, "Financial Report")
-    y -= 30
-
-    p.setFont("Helvetica", 12)
-    total_salaries = Employee.objects.aggregate(Sum('salary'))['salary__sum'] or 0
-    transport_expenses = Expense.objects.filter(type=Expense.TRANSPORT).aggregate(Sum('amount'))['amount__sum'] or 0
-    other_expenses = Expense.objects.filter(type=Expense.OTHER).aggregate(Sum('amount'))['amount__sum'] or 0
-    total_expenses = total_salaries + transport_expenses + other_expenses
-    p.drawString(50, y, f"Total Salaries: ${total_salaries}")
-    y -= 20
-    p.drawString(50, y, f"Transport Expenses: ${transport_expenses}")
-    y -= 20
-    p.drawString(50, y, f"Other Expenses: ${other_expenses}")
-    y -= 20
-    p.drawString(50, y, f"Total Expenses: ${total_expenses}")
-    y -= 30
-
-    # Add more fields as needed...
-
-    p.showPage()
-    p.save()
-    buffer.seek(0)
-    response = HttpResponse(buffer, content_type='application/pdf')
-    response['Content-Disposition'] = 'attachment; filename="financial_report.pdf"'
-    return response
+    if _wants_background(request):
+        return _enqueue_job(request, 'financial_report_pdf')
+    return FileResponse(artifacts.financial_report(get_financial_summary(request), artifacts.PDF), as_attachment=True,
+                        filename="financial_report.pdf", content_type=reports.PDF_CONTENT_TYPE)
 
 @login_required
 def export_financial_report_excel(request):
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Financial Report"
-
-    ws.append(["Field", "Value"])
-    total_salaries = Employee.objects.aggregate(Sum('salary'))['salary__sum'] or 0
-    transport_expenses = Expense.objects.filter(type=Expense.TRANSPORT).aggregate(Sum('amount'))['amount__sum'] or 0
-    other_expenses = Expense.objects.filter(type=Expense.OTHER).aggregate(Sum('amount'))['amount__sum'] or 0
-    total_expenses = total_salaries + transport_expenses + other_expenses
-    ws.append(["Total Salaries", str(total_salaries)])
-    ws.append(["Transport Expenses", str(transport_expenses)])
-    ws.append(["Other Expenses", str(other_expenses)])
-    ws.append(["Total Expenses", str(total_expenses)])
-
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename="financial_report.xlsx"'
-    wb.save(response)
-    return response
+    if _wants_background(request):
+        return _enqueue_job(request, 'financial_report_excel')
+    return FileResponse(artifacts.financial_report(get_financial_summary(request), artifacts.XLSX), as_attachment=True,
+                        filename="financial_report.xlsx", content_type=reports.XLSX_CONTENT_TYPE)
+
+@login_required
+def export_table(request, table):
+    """
+    The whole ``table`` (optionally filtered by GET params) as an XLSX workbook:
+    a background job by default, downloaded in the request with ``?sync=1``.
+    """
+    if table not in exports.TABLE_EXPORTS:
+        raise Http404("Unknown export")
+    # Whole-table exports run as a job unless ?sync=1 asks for a direct download
+    if _wants_background(request, default=True):
+        return _enqueue_job(request, 'table_export', table=table, filters=_export_filters(request.GET))
+    file = exports.export_table(table, request.GET)
+    filename = f"{table}_{timezone.localdate():%Y%m%d}.xlsx"
+    return FileResponse(file, as_attachment=True, filename=filename, content_type=reports.XLSX_CONTENT_TYPE)
 
 @login_required
 def email_financial_report(request):
     if request.method == 'POST':
-        recipient_email = request.POST.get('email')
-        if recipient_email:
-            subject = "Financial Report"
-            total_salaries = Employee.objects.aggregate(Sum('salary'))['salary__sum'] or 0
-            transport_expenses = Expense.objects.filter(type=Expense.TRANSPORT).aggregate(Sum('amount'))['amount__sum'] or 0
-            other_expenses = Expense.objects.filter(type=Expense.OTHER).aggregate(Sum('amount'))['amount__sum'] or 0
-            total_expenses = total_salaries + transport_expenses + other_expenses
-            context = {
-                'total_salaries': total_salaries,
-                'transport_expenses': transport_expenses,
-                'other_expenses': other_expenses,
-                'total_expenses': total_expenses,
-            }
-            message = render_to_string('admin_panel/email_financial_report.html', context)
-            email = EmailMessage(subject, message, to=[recipient_email])
-            email.content_subtype = "html"
-            email.send()
-            return JsonResponse({'success': True, 'message': 'Email sent successfully'})
-        return JsonResponse({'success': False, 'message': 'Recipient email is required'})
+        email = outbox.financial_report_email(get_financial_summary(request))
+        return _queue_report_email(request, email, request.POST.get('email'))
     return JsonResponse({'success': False, 'message': 'Invalid request method'})
 
+def _queue_report_email(request, email, recipients):
+    """Queue a rendered (subject, body) for ``recipients`` in the outbox and answer like the email views."""
+    recipients, invalid = outbox.parse_recipients(recipients)
+    if invalid:
+        return JsonResponse({'success': False, 'message': f"Invalid email address: {', '.join(invalid)}"}, status=400)
+    if not recipients:
+        return JsonResponse({'success': False, 'message': 'Recipient email is required'})
+    subject, body = email
+    message = outbox.queue_email(subject, body, recipients, user=request.user)
+    return JsonResponse({
+        'success': True,
+        'message': 'Email queued for delivery',
+        'outbox_id': message.id,
+        'recipients': len(recipients),
+        'status_url': reverse('admin_panel:outbox_status', args=[message.id]),
+    }, status=202)
+
+REPORT_EMAILS = {
+    'student': (Student, outbox.student_report_email),
+    'employee': (Employee, outbox.employee_report_email),
+}
+
+@require_POST
+@login_required
+def email_report_bulk(request):
+    """
+    Email one report to many recipients. Expects JSON
+    ``{"report": "student"|"employee"|"financial", "id": ..., "recipients": [...]}``;
+    the body is rendered once and every address gets its own outbox delivery.
+    """
+    try:
+        data = json.loads(request.body)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return JsonResponse({'success': False, 'error': 'Invalid JSON'}, status=400)
+    report = data.get('report')
+    if report == 'financial':
+        email = outbox.financial_report_email(get_financial_summary(request))
+    elif report in REPORT_EMAILS:
+        model, render = REPORT_EMAILS[report]
+        try:
+            instance = model.objects.get(id=data.get('id'))
+        except (model.DoesNotExist, ValueError, TypeError):
+            return JsonResponse({'success': False, 'error': f'Unknown {report}'}, status=404)
+        email = render(instance)
+    else:
+        return JsonResponse({'success': False, 'error': 'Unknown report'}, status=400)
+    recipients = data.get('recipients')
+    if not isinstance(recipients, (list, str)):
+        return JsonResponse({'success': False, 'error': 'recipients must be a list'}, status=400)
+    return _queue_report_email(request, email, recipients)
+
+@login_required
+def outbox_status(request, message_id):
+    message = get_object_or_404(OutboxMessage, id=message_id, user=request.user)
+    return JsonResponse({'success': True, 'subject': message.subject, 'deliveries': outbox.delivery_counts(message)})
+
+def _wants_background(request, default=False):
+    """``?background=1`` queues a job and ``?sync=1`` renders in the request; otherwise ``default``."""
+    if request.GET.get('sync') == '1':
+        return False
+    if request.GET.get('background') == '1':
+        return True
+    return default
+
+def _export_filters(params):
+    # Plain dict of the filter params so it can be stored in BackgroundJob.params
+    return {name: value for name, value in params.items() if name not in ('background', 'sync', 'csrfmiddlewaretoken')}
+
+def _enqueue_job(request, kind, message=None, **params):
+    job = jobs.enqueue(kind, request.user, **params)
+    payload = {
+        'success': True,
+        'job_id': job.id,
+        'status_url': reverse('admin_panel:job_status', args=[job.id]),
+    }
+    if message:
+        payload['message'] = message
+    return JsonResponse(payload, status=202)
+
+def _job_payload(job):
+    return {
+        'id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'error': job.error,
+        'created_at': job.created_at.isoformat(),
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'download_url': reverse('admin_panel:job_download', args=[job.id]) if job.result else None,
+    }
+
+@login_required
+def job_status(request, job_id):
+    job = get_object_or_404(BackgroundJob, id=job_id, user=request.user)
+    return JsonResponse({'success': True, 'job': _job_payload(job)})
+
+@login_required
+def job_download(request, job_id):
+    job = get_object_or_404(BackgroundJob, id=job_id, user=request.user)
+    if job.status != BackgroundJob.DONE or not job.result:
+        return JsonResponse({'success': False, 'error': 'Job has no result yet'}, status=409)
+    return FileResponse(job.result.open('rb'), as_attachment=True, filename=job.result_name,
+                        content_type=job.content_type or None)
+
 @csrf_exempt
 @require_POST
 @login_required
@@ -902,21 +1149,8 @@ def bulk_delete_employees(request):
             if not employee_ids:
                 return JsonResponse({'success': False, 'error': 'No employee IDs provided'})
 
-            employees = Employee.objects.filter(id__in=employee_ids)
-            deleted_count = 0
-            for employee in employees:
-                # Save to TrashBinEntry before deleting
-                TrashBinEntry.objects.create(
-                    user=request.user,
-                    item_type='Employee',
-                    item_id=employee.id,
-                    item_data=json.loads(serialize('json', [employee]))[0]['fields'],
-                    deleted_at=timezone.now()
-                )
-                deleted_count += 1
-
-            # Bulk delete
-            employees.delete()
+            # Soft-deletes in chunks and records the trash entries, in one transaction
+            deleted_count = trash.move_to_trash(Employee, employee_ids, request.user)
 
             # Create recent activity
             RecentActivity.objects.create(
@@ -932,8 +1166,15 @@ def bulk_delete_employees(request):
 
 @login_required
 def trash_bin(request):
-    trash_entries = TrashBinEntry.objects.filter(user=request.user).order_by('-deleted_at')
+    try:
+        trash_entries, next_cursor = trash.trash_page(
+            request.user, request.GET.get('cursor'), get_page_size(request, trash.TRASH_PAGE_SIZE)
+        )
+    except InvalidCursor as e:
+        return HttpResponseBadRequest(str(e))
     context = {
         'trash_entries': trash_entries,
+        'next_cursor': next_cursor,
+        'is_first_page': not request.GET.get('cursor'),
     }
     return render(request, 'user_auth/trash_bin.html', context)
@@ -89,6 +89,33 @@ DATABASES = {
 }
 
 
+# Cache
+# File-based so every worker process on the host shares entries and version counters.
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache'),
+        'TIMEOUT': 600,
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    }
+}
+
+
+# Trash bin
+# Deleting a student, employee, ledger row or activity stores a serialized copy of
+# it in the trash and hard-deletes the row. Set SOFT_DELETE = True to keep deleted
+# rows in place instead (deleted_at set), so a delete or restore is a single UPDATE
+# and the row keeps its primary key and satellite rows. Trashed rows then still hold
+# their unique values (student_id, employee email, ledger import hash) until purged.
+# See admin_panel/softdelete.py.
+
+SOFT_DELETE = False
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -147,3 +174,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 import os
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Background job results (exports with personal data) live outside MEDIA_ROOT,
+# which is served publicly; only the job_download view hands them out.
+JOB_RESULTS_ROOT = os.path.join(BASE_DIR, 'job_results')
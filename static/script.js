@@ -278,8 +278,10 @@ document.addEventListener("DOMContentLoaded", function () {
     });
   }
 
-  // Function to load recent transactions dynamically
-  function loadRecentTransactions() {
+  const transactionsLoadMore = document.getElementById("transactions-load-more");
+
+  // Function to load recent transactions dynamically; passing a cursor appends the next page
+  function loadRecentTransactions(cursor) {
     const searchInput = document.getElementById("transaction-search");
     const filterTypeSelect = document.getElementById("transaction-filter-type");
     const sortBySelect = document.getElementById("transaction-sort-by");
@@ -292,13 +294,21 @@ document.addEventListener("DOMContentLoaded", function () {
     if (search) params.append("search", search);
     if (filterType) params.append("filter_type", filterType);
     if (sortBy) params.append("sort_by", sortBy);
+    if (typeof cursor === "string" && cursor) params.append("cursor", cursor);
+    const append = params.has("cursor");
 
     fetch(`/recent-transactions/?${params.toString()}`)
       .then((response) => response.json())
       .then((data) => {
         const transactionsTable = document.getElementById("transactions-table");
-        transactionsTable.innerHTML = "";
-        if (data.transactions.length === 0) {
+        if (transactionsLoadMore) {
+          transactionsLoadMore.dataset.nextCursor = data.next_cursor || "";
+          transactionsLoadMore.classList.toggle("hidden", !data.next_cursor);
+        }
+        if (!append) {
+          transactionsTable.innerHTML = "";
+        }
+        if (!append && data.transactions.length === 0) {
           const row = document.createElement("tr");
           row.innerHTML = `<td colspan="5" class="text-center py-4 text-gray-500">No transactions found.</td>`;
           transactionsTable.appendChild(row);
@@ -320,8 +330,9 @@ document.addEventListener("DOMContentLoaded", function () {
           transactionsTable.appendChild(row);
         });
 
-        // Attach delete event listeners
-        document.querySelectorAll(".delete-transaction-btn").forEach((btn) => {
+        // Attach delete event listeners to rows that don't have one yet
+        transactionsTable.querySelectorAll(".delete-transaction-btn:not([data-bound])").forEach((btn) => {
+          btn.dataset.bound = "true";
           btn.addEventListener("click", function () {
             const transactionId = this.getAttribute("data-id");
             if (confirm("Are you sure you want to delete this transaction?")) {
@@ -353,6 +364,12 @@ document.addEventListener("DOMContentLoaded", function () {
       });
   }
 
+  if (transactionsLoadMore) {
+    transactionsLoadMore.addEventListener("click", () => {
+      loadRecentTransactions(transactionsLoadMore.dataset.nextCursor);
+    });
+  }
+
   // Initial load of recent transactions on page load
   loadRecentTransactions();
 
@@ -678,16 +695,20 @@ document.addEventListener("DOMContentLoaded", function () {
   const filterUser = document.getElementById("filter-user");
   const sortBy = document.getElementById("sort-by");
   const clearFilters = document.getElementById("clear-filters");
+  const activitiesLoadMore = document.getElementById("activities-load-more");
 
-  function loadRecentActivities() {
+  // Activities come from the cursor-paginated feed; passing a cursor appends the next page
+  function loadRecentActivities(cursor) {
     const params = new URLSearchParams();
     if (filterAction && filterAction.value)
       params.append("action_search", filterAction.value);
     if (filterUser && filterUser.value) params.append("user", filterUser.value);
     if (sortBy && sortBy.value !== "timestamp_desc")
       params.append("sort_by", sortBy.value);
+    if (typeof cursor === "string" && cursor) params.append("cursor", cursor);
+    const append = params.has("cursor");
 
-    fetch(`/?${params.toString()}`, {
+    fetch(`/api/activities/?${params.toString()}`, {
       headers: {
         "X-Requested-With": "XMLHttpRequest",
       },
@@ -700,6 +721,10 @@ document.addEventListener("DOMContentLoaded", function () {
       })
       .then((data) => {
         const activities = data.activities;
+        if (activitiesLoadMore) {
+          activitiesLoadMore.dataset.nextCursor = data.next_cursor || "";
+          activitiesLoadMore.classList.toggle("hidden", !data.next_cursor);
+        }
         const html = activities
           .map(
             (activity) => `
@@ -715,10 +740,15 @@ document.addEventListener("DOMContentLoaded", function () {
       `
           )
           .join("");
-        document.getElementById("recent-activities").innerHTML =
-          html ||
-          '<div class="text-gray-500">No recent activities found.</div>';
-        attachDeleteListeners();
+        const container = document.getElementById("recent-activities");
+        if (append) {
+          container.insertAdjacentHTML("beforeend", html);
+        } else {
+          container.innerHTML =
+            html ||
+            '<div class="text-gray-500">No recent activities found.</div>';
+        }
+        attachDeleteListeners(container);
       })
       .catch((error) => {
         console.error("Error loading activities:", error);
@@ -727,8 +757,9 @@ document.addEventListener("DOMContentLoaded", function () {
       });
   }
 
-  function attachDeleteListeners() {
-    document.querySelectorAll(".delete-activity-btn").forEach((btn) => {
+  function attachDeleteListeners(container = document) {
+    container.querySelectorAll(".delete-activity-btn:not([data-bound])").forEach((btn) => {
+      btn.dataset.bound = "true";
       btn.addEventListener("click", function () {
         const activityId = this.getAttribute("data-activity-id");
         if (confirm("Are you sure you want to delete this activity?")) {
@@ -754,9 +785,15 @@ document.addEventListener("DOMContentLoaded", function () {
   }
 
   if (filterAction)
-    filterAction.addEventListener("input", loadRecentActivities);
-  if (filterUser) filterUser.addEventListener("change", loadRecentActivities);
-  if (sortBy) sortBy.addEventListener("change", loadRecentActivities);
+    filterAction.addEventListener("input", () => loadRecentActivities());
+  if (filterUser)
+    filterUser.addEventListener("change", () => loadRecentActivities());
+  if (sortBy) sortBy.addEventListener("change", () => loadRecentActivities());
+  if (activitiesLoadMore) {
+    activitiesLoadMore.addEventListener("click", () =>
+      loadRecentActivities(activitiesLoadMore.dataset.nextCursor)
+    );
+  }
   if (clearFilters) {
     clearFilters.addEventListener("click", () => {
       if (filterAction) filterAction.value = "";
@@ -410,73 +410,83 @@ document.addEventListener("DOMContentLoaded", function () {
 
   // Employee Section Enhancements
 
-  // Real-time search with autocomplete for employees
-  const employeeSearchInput = document.getElementById("employee-search");
-  const employeeSearchResults = document.getElementById(
-    "employee-search-results"
-  );
-  let searchTimeout;
-
-  if (employeeSearchInput && employeeSearchResults) {
-    employeeSearchInput.addEventListener("input", function () {
-      clearTimeout(searchTimeout);
+  // Typeahead suggestions for the student and employee search boxes, served
+  // from the in-memory prefix index so each keystroke is cheap
+  function attachTypeahead(input, resultsBox, entityType, onSelect) {
+    if (!input || !resultsBox) return;
+    let typeaheadTimeout;
+
+    input.addEventListener("input", function () {
+      clearTimeout(typeaheadTimeout);
       const query = this.value.trim();
 
-      if (query.length < 2) {
-        employeeSearchResults.classList.add("hidden");
+      if (query.length < 1) {
+        resultsBox.classList.add("hidden");
         return;
       }
 
-      searchTimeout = setTimeout(() => {
-        fetch(
-          `/admin_panel/search/?q=${encodeURIComponent(query)}&type=employee`,
-          {
-            headers: {
-              "X-Requested-With": "XMLHttpRequest",
-            },
-          }
-        )
+      typeaheadTimeout = setTimeout(() => {
+        const params = new URLSearchParams({ q: query, type: entityType });
+        fetch(`/api/typeahead/?${params.toString()}`, {
+          headers: {
+            "X-Requested-With": "XMLHttpRequest",
+          },
+        })
           .then((response) => response.json())
           .then((data) => {
-            employeeSearchResults.innerHTML = "";
-            if (data.employees && data.employees.length > 0) {
-              data.employees.forEach((employee) => {
+            resultsBox.innerHTML = "";
+            if (data.results && data.results.length > 0) {
+              data.results.forEach((suggestion) => {
                 const resultItem = document.createElement("div");
                 resultItem.className = "p-2 hover:bg-gray-100 cursor-pointer";
-                resultItem.textContent = `${employee.first_name} ${employee.last_name} - ${employee.position}`;
+                resultItem.textContent = suggestion.detail
+                  ? `${suggestion.label} - ${suggestion.detail}`
+                  : suggestion.label;
                 resultItem.addEventListener("click", () => {
-                  employeeSearchInput.value = `${employee.first_name} ${employee.last_name}`;
-                  employeeSearchResults.classList.add("hidden");
-                  // Optionally, filter the employee list to show only this employee
-                  filterEmployees({
-                    search: employee.first_name + " " + employee.last_name,
-                  });
+                  input.value = suggestion.label;
+                  resultsBox.classList.add("hidden");
+                  onSelect(suggestion);
                 });
-                employeeSearchResults.appendChild(resultItem);
+                resultsBox.appendChild(resultItem);
               });
-              employeeSearchResults.classList.remove("hidden");
+              resultsBox.classList.remove("hidden");
             } else {
-              employeeSearchResults.classList.add("hidden");
+              resultsBox.classList.add("hidden");
             }
           })
           .catch((error) => {
-            console.error("Error searching employees:", error);
-            employeeSearchResults.classList.add("hidden");
+            console.error(`Error fetching ${entityType} suggestions:`, error);
+            resultsBox.classList.add("hidden");
           });
-      }, 300);
+      }, 150);
     });
 
-    // Hide search results when clicking outside
+    // Hide suggestions when clicking outside
     document.addEventListener("click", (e) => {
-      if (
-        !employeeSearchInput.contains(e.target) &&
-        !employeeSearchResults.contains(e.target)
-      ) {
-        employeeSearchResults.classList.add("hidden");
+      if (!input.contains(e.target) && !resultsBox.contains(e.target)) {
+        resultsBox.classList.add("hidden");
       }
     });
   }
 
+  const employeeSearchInput = document.getElementById("employee-search");
+  attachTypeahead(
+    employeeSearchInput,
+    document.getElementById("employee-search-results"),
+    "employee",
+    (suggestion) => {
+      window.location.href = `/employment-report/${suggestion.entity_id}/`;
+    }
+  );
+  attachTypeahead(
+    document.getElementById("student-search"),
+    document.getElementById("student-search-results"),
+    "student",
+    (suggestion) => {
+      window.location.href = `/student-report/${suggestion.entity_id}/`;
+    }
+  );
+
   // Employee filtering and sorting
   const employeeDepartmentFilter = document.getElementById(
     "employee-department-filter"
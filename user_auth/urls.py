@@ -11,5 +11,6 @@ urlpatterns = [
     path('settings/', views.profile_settings, name='settings'),
     path('trash-bin/', views.trash_bin, name='trash_bin'),
     path('restore-trash-entry/<int:entry_id>/', views.restore_trash_entry, name='restore_trash_entry'),
+    path('restore-trash-entries/', views.restore_trash_entries, name='restore_trash_entries'),
     path('google-login/', include('social_django.urls', namespace='social')),
 ]
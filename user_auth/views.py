@@ -1,13 +1,16 @@
+import json
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import authenticate, login as auth_login, logout as auth_logout
 from django.contrib.auth.models import User
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.hashers import check_password
-from django.http import HttpResponseForbidden, Http404
+from django.http import HttpResponseForbidden, Http404, HttpResponseBadRequest, JsonResponse
 from django.urls import reverse
-from admin_panel.models import TrashBinEntry, RecentActivity, Expense, Transaction
-from admin_panel.models import Student
+from admin_panel import trash
+from admin_panel.pagination import InvalidCursor, get_page_size
+from admin_panel.models import TrashBinEntry
 from django.views.decorators.http import require_POST
 
 # Create your views here.
@@ -110,56 +113,72 @@ def profile_settings(request):
 
 @login_required
 def trash_bin(request):
-    trash_entries = TrashBinEntry.objects.filter(user=request.user).order_by('-deleted_at')
-    return render(request, 'user_auth/trash_bin.html', {'trash_entries': trash_entries})
+    try:
+        trash_entries, next_cursor = trash.trash_page(
+            request.user, request.GET.get('cursor'), get_page_size(request, trash.TRASH_PAGE_SIZE)
+        )
+    except InvalidCursor as e:
+        return HttpResponseBadRequest(str(e))
+    return render(request, 'user_auth/trash_bin.html', {
+        'trash_entries': trash_entries,
+        'next_cursor': next_cursor,
+        'is_first_page': not request.GET.get('cursor'),
+    })
 
 @login_required
 @require_POST
 def restore_trash_entry(request, entry_id):
     entry = get_object_or_404(TrashBinEntry, id=entry_id, user=request.user)
     item_type = entry.item_type
-    item_id = entry.item_id
-    item_data = entry.item_data
 
     try:
-        if item_type == 'RecentActivity':
-            # Restore RecentActivity from item_data
-            RecentActivity.objects.create(
-                user=request.user,
-                action=item_data.get('action', ''),
-                icon_class=item_data.get('icon_class', 'fas fa-info-circle'),
-                timestamp=item_data.get('timestamp')
-            )
-        elif item_type == 'Expense':
-            Expense.objects.create(
-                type=item_data.get('type', ''),
-                description=item_data.get('description', ''),
-                amount=item_data.get('amount', 0),
-                date=item_data.get('date')
-            )
-        elif item_type == 'Transaction':
-            Transaction.objects.create(
-                date=item_data.get('date'),
-                type=item_data.get('type', ''),
-                description=item_data.get('description', ''),
-                amount=item_data.get('amount', 0)
-            )
-        elif item_type == 'Student':
-            Student.objects.create(
-                name=item_data.get('name', ''),
-                type=item_data.get('type', ''),
-                category=item_data.get('category', ''),
-                program=item_data.get('program', ''),
-                level=item_data.get('level', '')
-            )
-        else:
-            messages.error(request, f"Restore not implemented for item type: {item_type}")
-            return redirect('auth:trash_bin')
-
-        # Delete the trash entry after successful restore
-        entry.delete()
+        trash.restore_entry(entry)
         messages.success(request, f"{item_type} restored successfully.")
+    except ValueError as e:
+        messages.error(request, str(e))
     except Exception as e:
         messages.error(request, f"Error restoring {item_type}: {str(e)}")
 
     return redirect('auth:trash_bin')
+
+@login_required
+@require_POST
+def restore_trash_entries(request):
+    """
+    Restore the selected trash entries together, in one transaction. Takes
+    ``entry_ids`` as form fields or, for large selections, as a JSON body.
+    """
+    if request.content_type == 'application/json':
+        try:
+            entry_ids = json.loads(request.body).get('entry_ids', [])
+        except (ValueError, AttributeError):
+            return JsonResponse({'success': False, 'error': 'Invalid JSON body'}, status=400)
+    else:
+        entry_ids = request.POST.getlist('entry_ids')
+    entry_ids = [value for value in entry_ids if str(value).isdigit()]
+    # item_data is only read for the entries that have to be re-created
+    entries = TrashBinEntry.objects.filter(user=request.user, id__in=entry_ids).defer('item_data')
+    is_ajax = request.headers.get('x-requested-with') == 'XMLHttpRequest'
+    try:
+        result = trash.restore_entries(entries)
+    except Exception as e:
+        if is_ajax:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+        messages.error(request, f"Error restoring items: {str(e)}")
+        return redirect('auth:trash_bin')
+
+    unknown = sorted({entry.item_type for entry in result.skipped if entry.item_type not in trash.TRASHABLE_MODELS})
+    unreadable = sum(1 for entry in result.skipped if entry.item_type in trash.TRASHABLE_MODELS)
+    if is_ajax:
+        return JsonResponse({'success': True, 'restored': result.restored, 'skipped': [entry.id for entry in result.skipped]})
+    restored = sum(result.restored.values())
+    if restored:
+        messages.success(request, f"Restored {restored} item{'s' if restored != 1 else ''}.")
+    if unknown:
+        messages.error(request, f"Restore not implemented for item type: {', '.join(unknown)}")
+    if unreadable:
+        messages.error(request, f"{unreadable} item{'s' if unreadable != 1 else ''} could not be restored: "
+                                "the stored copy no longer matches the current fields.")
+    if not restored and not result.skipped:
+        messages.error(request, "No items selected.")
+    return redirect('auth:trash_bin')